@@ -0,0 +1,282 @@
+"""Command latency and import-time regression benchmark.
+
+Seeds flat and nested task directories with scripts/seed_tasks (cached under
+--workdir, so only the first run pays for seeding), then measures:
+
+* import time of priority_manager.main, parsed from ``python -X importtime``;
+* end-to-end wall time of each command in a fresh interpreter, cold (index
+  folder removed) and warm (best of --repeat runs);
+* in-process time of the individual phases behind those commands;
+* with a `serve` daemon running, the end-to-end time of each served command
+  and the round trip of forward() alone (skip with --skip-serve).
+
+Everything runs offline: gantt writes HTML with --no-open and sync is not timed.
+
+    python -m benchmarks.bench_cli --sizes 1000,10000,100000 --save-baseline
+    python -m benchmarks.bench_cli --sizes 1000,10000 --threshold 0.25
+
+With a baseline present the run exits with status 1 if any measurement is more
+than --threshold (relative) and --min-delta-ms (absolute) slower than stored.
+"""
+import io
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date
+import click
+from priority_manager.scripts.seed_tasks import generate_tasks, write_tasks
+
+DEFAULT_WORKDIR = os.path.join(".bench")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+NESTED_FOLDERS = 20
+BASE_DATE = date(2025, 6, 1)
+# Runs one CLI invocation against an arbitrary tasks dir, the way the entry point would
+DRIVER = (
+    "import sys\n"
+    "from priority_manager.utils.config import CONFIG\n"
+    "CONFIG['directories']['tasks_dir'] = sys.argv[1]\n"
+    "CONFIG['directories']['archive_dir'] = sys.argv[2]\n"
+    "from priority_manager.main import cli\n"
+    "cli(sys.argv[3:], prog_name='priority-manager')\n"
+)
+
+
+def commands(workdir):
+    """Command name -> CLI arguments for the end-to-end timings."""
+    return {
+        "help": ["--help"],
+        "ls": ["ls", "--recursive"],
+        "ls_top20": ["ls", "--recursive", "--limit", "20"],
+        "search": ["search", "roadmap"],
+        "filter": ["filter", "--tag", "tag001", "--not-tag", "tag002"],
+        "filter_top5": ["filter", "--tag", "tag001", "--limit", "5"],
+        "export": ["export", "ndjson", "--recursive", "--output", "-"],
+        "gantt": ["gantt", "--no-open", "--output", os.path.join(workdir, "gantt.html")],
+    }
+
+
+def dataset(workdir, count, nested):
+    """Return the tasks dir for a dataset, seeding it unless a matching one is cached."""
+    name = f"{'nested' if nested else 'flat'}_{count}"
+    path = os.path.join(workdir, name, "tasks")
+    marker = os.path.join(workdir, name, "seeded")
+    if not os.path.exists(marker):
+        shutil.rmtree(os.path.join(workdir, name), ignore_errors=True)
+        click.echo(f"Seeding {name} ...", err=True)
+        os.makedirs(path)
+        tasks = generate_tasks(
+            count, random.Random(count), base=BASE_DATE, added_days=180, span_days=90, tag_vocab=40,
+            body_lines=5, folders=NESTED_FOLDERS if nested else 0, prefix="Bench report",
+        )
+        write_tasks(path, tasks)
+        with open(marker, "w") as f:
+            f.write(str(count))
+    return path
+
+
+def run_cli(tasks_dir, archive_dir, args):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", DRIVER, tasks_dir, archive_dir, *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, check=False,
+    )
+    return time.perf_counter() - start
+
+
+def served(tasks_dir, archive_dir, selected, repeat):
+    """Start `serve` on tasks_dir and time each command it answers, end to end and through forward()."""
+    from priority_manager.utils.config import CONFIG
+    from priority_manager.utils.daemon import daemon_running, forward, forwardable, socket_path
+
+    path = socket_path(tasks_dir)
+    proc = subprocess.Popen(
+        [sys.executable, "-c", DRIVER, tasks_dir, archive_dir, "serve"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+    )
+    results = {}
+    try:
+        while not daemon_running(path):
+            if proc.poll() is not None:
+                raise click.ClickException(f"serve exited with status {proc.returncode}")
+            time.sleep(0.05)
+        CONFIG["directories"]["tasks_dir"] = tasks_dir
+        for name, args in selected.items():
+            if not forwardable(args):
+                continue
+            results[f"{name}.e2e"] = min(run_cli(tasks_dir, archive_dir, args) for _ in range(repeat))
+            results[f"{name}.forward"] = timed(lambda: forward(args, io.BytesIO()), repeat)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return results
+
+
+def clear_indexes(tasks_dir):
+    from priority_manager.utils.index import index_dir
+    shutil.rmtree(index_dir(tasks_dir), ignore_errors=True)
+
+
+def import_times(repeat):
+    """Return (best total us for priority_manager.main, {module: cumulative us}) from -X importtime."""
+    best, modules = None, {}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import priority_manager.main"],
+            capture_output=True, text=True, check=True,
+        )
+        run = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            if cumulative.isdigit():
+                run[name] = int(cumulative)
+        total = sum(v for k, v in run.items() if "." not in k)
+        if best is None or total < best:
+            best, modules = total, run
+    return best, modules
+
+
+def timed(fn, repeat=1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def phases(tasks_dir, repeat):
+    """Time the in-process phases behind ls/search/filter/export for one tasks dir."""
+    from priority_manager.utils.config import CONFIG
+    from priority_manager.utils import helpers
+    from priority_manager.utils.exporter import iter_export_records, write_ndjson
+    from priority_manager.utils.scanner import load_tree
+    from priority_manager.utils.search_index import load_search_index, parse_query
+
+    CONFIG["directories"]["tasks_dir"] = tasks_dir
+    index_settings = CONFIG.setdefault("index", {})
+    results = {}
+
+    results["scan"] = timed(lambda: load_tree(tasks_dir, lambda entry: entry.name), repeat)
+    index_settings["enabled"] = False
+    results["parse_all"] = timed(lambda: helpers.files_to_tasks(recursive=True), repeat)
+    index_settings["enabled"] = True
+    clear_indexes(tasks_dir)
+    results["index_build"] = timed(lambda: helpers.files_to_tasks(recursive=True))
+    results["index_load"] = timed(lambda: helpers.files_to_tasks(recursive=True), repeat)
+    tasks = helpers.files_to_tasks(recursive=True)
+    results["sort"] = timed(lambda: sorted(tasks, key=helpers.priority_sort_key), repeat)
+    results["top20_heap"] = timed(lambda: helpers.select_top(tasks, 20), repeat)
+    results["top20_ordered_index"] = timed(lambda: helpers.load_top_tasks(20, recursive=True), repeat)
+    with redirect_stdout(io.StringIO()):
+        results["render"] = timed(lambda: helpers.show_tasks(list(tasks), presorted=True), repeat)
+    results["search_index_build"] = timed(lambda: load_search_index(tasks_dir))
+    index = load_search_index(tasks_dir)
+    results["search_index_load"] = timed(lambda: load_search_index(tasks_dir), repeat)
+    results["search_query"] = timed(lambda: index.search(parse_query(["roadmap"])), repeat)
+    results["tag_index"] = timed(lambda: helpers.tasks_with_tag_index(recursive=True), repeat)
+    results["export_ndjson"] = timed(lambda: write_ndjson(iter_export_records(tasks_dir, recursive=True), io.StringIO()), repeat)
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Return [(key, baseline ms, current ms)] for measurements that regressed."""
+    regressions = []
+    for key, value in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        if value > old * (1 + threshold) and (value - old) * 1000 > min_delta_ms:
+            regressions.append((key, old * 1000, value * 1000))
+    return regressions
+
+
+@click.command()
+@click.option("--sizes", default="1000,10000,100000", show_default=True, help="Comma separated task counts.")
+@click.option("--layouts", default="flat,nested", show_default=True, help="Comma separated layouts (flat, nested).")
+@click.option("--repeat", type=int, default=3, show_default=True, help="Runs per warm measurement (best is kept).")
+@click.option("--workdir", default=DEFAULT_WORKDIR, show_default=True, help="Where seeded datasets are cached.")
+@click.option("--only", default=None, help="Comma separated subset of commands to time end to end.")
+@click.option("--skip-e2e", is_flag=True, help="Only measure import time and in-process phases.")
+@click.option("--skip-serve", is_flag=True, help="Do not time commands forwarded to a serve daemon.")
+@click.option("--baseline", "baseline_path", default=DEFAULT_BASELINE, show_default=True, help="Baseline JSON file.")
+@click.option("--save-baseline", is_flag=True, help="Store this run as the new baseline.")
+@click.option("--threshold", type=float, default=0.25, show_default=True, help="Allowed relative slowdown before failing.")
+@click.option("--min-delta-ms", type=float, default=5.0, show_default=True, help="Ignore slowdowns smaller than this.")
+@click.option("--json-out", default=None, help="Also write the results to this JSON file.")
+def main(sizes, layouts, repeat, workdir, only, skip_e2e, skip_serve, baseline_path, save_baseline, threshold, min_delta_ms,
+         json_out):
+    """Benchmark import time and command latency, and check them against a baseline."""
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+    archive_dir = os.path.join(workdir, "archive")
+    results = {}
+
+    total_us, modules = import_times(max(repeat, 3))
+    results["import.priority_manager.main"] = modules.get("priority_manager.main", total_us) / 1e6
+    click.echo(f"import priority_manager.main: {modules.get('priority_manager.main', 0) / 1000:.1f} ms "
+               f"(all imports {total_us / 1000:.1f} ms)")
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:8]:
+        click.echo(f"    {us / 1000:8.1f} ms  {name}")
+
+    selected = commands(workdir)
+    if only:
+        selected = {name: args for name, args in selected.items() if name in only.split(",")}
+    for count in (int(s) for s in sizes.split(",")):
+        for layout in layouts.split(","):
+            tasks_dir = dataset(workdir, count, layout == "nested")
+            label = f"{layout}_{count}"
+            click.echo(f"\n{label}")
+            if not skip_e2e:
+                for name, args in selected.items():
+                    clear_indexes(tasks_dir)
+                    cold = run_cli(tasks_dir, archive_dir, args)
+                    warm = min(run_cli(tasks_dir, archive_dir, args) for _ in range(repeat))
+                    results[f"e2e.{label}.{name}.cold"] = cold
+                    results[f"e2e.{label}.{name}.warm"] = warm
+                    click.echo(f"  {name:<22} cold {cold * 1000:9.1f} ms   warm {warm * 1000:9.1f} ms")
+            for phase, elapsed in phases(tasks_dir, repeat).items():
+                results[f"phase.{label}.{phase}"] = elapsed
+                click.echo(f"  phase {phase:<20} {elapsed * 1000:9.2f} ms")
+            if not skip_serve and hasattr(socket, "AF_UNIX"):
+                for key, elapsed in served(tasks_dir, archive_dir, selected, repeat).items():
+                    results[f"serve.{label}.{key}"] = elapsed
+                    click.echo(f"  serve {key:<20} {elapsed * 1000:9.2f} ms")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if save_baseline:
+        baseline = {}
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        click.echo(f"\nBaseline written to {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        click.echo("\nNo baseline found; run with --save-baseline to create one.")
+        return
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, threshold, min_delta_ms)
+    if regressions:
+        click.secho(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}:", fg="red")
+        for key, old, new in regressions:
+            click.echo(f"  {key}: {old:.1f} ms -> {new:.1f} ms")
+        sys.exit(1)
+    click.secho(f"\nNo regressions beyond {threshold:.0%} against {baseline_path}", fg="green")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Memory benchmark: per-task details dicts vs. slotted Task records.
+
+Values are decoded from bytes for every task, the way the parser produces them,
+so repeated statuses, tags and dates are distinct string objects unless interned.
+
+    python -m benchmarks.bench_memory --count 100000
+"""
+import gc
+import tracemalloc
+import click
+from priority_manager.utils.task import Task
+
+STATUSES = [b"To Do", b"In Progress", b"Blocked", b"Complete"]
+TAGS = [b"work", b"home, errands", b"work, urgent", b""]
+
+
+def raw_fields(i):
+    """Return freshly decoded field values for the i-th synthetic task."""
+    return (
+        f"Task {i}",
+        i % 25,
+        f"2025-01-01T00-00-00_{i}",
+        b"2025-01-01".decode(),
+        b"2025-02-%02d" % (i % 28 + 1),
+        STATUSES[i % len(STATUSES)],
+        f"Description for task {i}",
+        TAGS[i % len(TAGS)],
+        b"2025-01-01T09:00:00".decode(),
+        b"".decode(),
+    )
+
+
+def build_dicts(count):
+    tasks = []
+    for i in range(count):
+        name, priority, file_name, start, due, status, description, tags, added, list_name = raw_fields(i)
+        tasks.append({
+            "Task Name": name,
+            "Priority Score": priority,
+            "File Name": file_name,
+            "Start Date": start,
+            "Due Date": due.decode(),
+            "Status": status.decode(),
+            "Description": description,
+            "Tags": tags.decode(),
+            "Date Added": added,
+            "List": list_name,
+        })
+    return tasks
+
+
+def build_records(count):
+    tasks = []
+    for i in range(count):
+        name, priority, file_name, start, due, status, description, tags, added, list_name = raw_fields(i)
+        tasks.append(Task(name, priority, file_name, start, due.decode(), status.decode(),
+                          description, tags.decode(), added, list_name))
+    return tasks
+
+
+def measure(builder, count):
+    """Return bytes still allocated after building `count` tasks with builder."""
+    gc.collect()
+    tracemalloc.start()
+    tasks = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return current
+
+
+@click.command()
+@click.option("--count", type=int, default=100000, show_default=True, help="Number of tasks to hold in memory.")
+def main(count):
+    """Compare resident memory of dict-based and slotted task records."""
+    as_dicts = measure(build_dicts, count)
+    as_records = measure(build_records, count)
+    click.echo(f"{'layout':>8} | {'total MiB':>9} | {'bytes/task':>10}")
+    for label, size in (("dict", as_dicts), ("Task", as_records)):
+        click.echo(f"{label:>8} | {size / 2**20:>9.1f} | {size / count:>10.0f}")
+    click.echo(f"saving: {(1 - as_records / as_dicts) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
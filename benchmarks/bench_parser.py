@@ -0,0 +1,106 @@
+"""Micro-benchmark: header-only task parser vs. the original line-by-line parser.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parser --repeat 200
+"""
+import os
+import re
+import tempfile
+import timeit
+import click
+from priority_manager.utils.parser import parse_task_file
+
+HEADER = (
+    "**Name:** Benchmark task\n\n"
+    "**Description:** Measure parser throughput\n\n"
+    "**Priority Score:** 12\n\n"
+    "**Due Date:** 2025-03-01\n\n"
+    "**Tags:** bench, parser\n\n"
+    "**Date Added:** 2025-01-01T09:00:00\n\n"
+    "**Status:** In Progress\n\n"
+)
+BODY_LINE = "Notes line describing the task in some more detail, kept below the header.\n"
+
+
+def legacy_get_task_details(filepath):
+    """The pre-parser implementation of helpers.get_task_details, kept for comparison."""
+    priority = -999
+    task_status = "No status"
+    description = "No description"
+    tags = "No tags"
+    list_name = ""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    due_date = "No due date"
+    date_added = None
+    file_name = os.path.splitext(os.path.basename(filepath))[0]
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("**Name:**"):
+                name = line.strip().split("**Name:**")[1].strip()
+            elif line.startswith("**List:**"):
+                list_name = line.strip().split("**List:**")[1].strip()
+            elif line.startswith("**Priority Score:**"):
+                try:
+                    priority = int(line.strip().split("**Priority Score:**")[1].strip())
+                except ValueError:
+                    pass
+            elif line.startswith("**Status:**"):
+                task_status = line.strip().split("**Status:**")[1].strip()
+            elif line.startswith("**Description:**"):
+                description = line.strip().split("**Description:**")[1].strip()
+            elif line.startswith("**Tags:**"):
+                tags = line.strip().split("**Tags:**")[1].strip()
+            elif line.startswith("**Due Date:**"):
+                due_date = line.strip().split("**Due Date:**")[1].strip() or "No due date"
+            elif line.startswith("**Date Added:**"):
+                date_added = line.strip().split("**Date Added:**")[1].strip()
+
+    match = re.search(r"\d{4}-\d{2}-\d{2}", file_name)
+    if match:
+        start_date = match.group()
+    else:
+        if date_added and len(date_added) >= 10:
+            start_date = date_added[:10]
+        else:
+            start_date = "N/A"
+    return {
+        "Task Name": name,
+        "Priority Score": priority,
+        "File Name": file_name,
+        "Start Date": start_date,
+        "Due Date": due_date,
+        "Status": task_status,
+        "Description": description,
+        "Tags": tags,
+        "Date Added": date_added or "",
+        "List": list_name,
+    }
+
+
+def write_task(directory, size):
+    """Write a task file of roughly `size` bytes (header plus body) and return its path."""
+    body_lines = max(0, (size - len(HEADER)) // len(BODY_LINE))
+    path = os.path.join(directory, f"2025-01-01_{size}.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER + BODY_LINE * body_lines)
+    return path
+
+
+@click.command()
+@click.option("--repeat", type=int, default=200, show_default=True, help="Parses per measurement.")
+@click.option("--sizes", default="1024,102400", show_default=True, help="Comma separated file sizes in bytes.")
+def main(repeat, sizes):
+    """Compare legacy and header-only parsers on files of the given sizes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        click.echo(f"{'size':>10} | {'legacy us':>10} | {'parser us':>10} | {'speedup':>7}")
+        for size in (int(s) for s in sizes.split(",")):
+            path = write_task(tmp, size)
+            assert legacy_get_task_details(path) == parse_task_file(path)
+            legacy = min(timeit.repeat(lambda: legacy_get_task_details(path), number=repeat, repeat=3)) / repeat
+            fast = min(timeit.repeat(lambda: parse_task_file(path), number=repeat, repeat=3)) / repeat
+            click.echo(f"{os.path.getsize(path):>10} | {legacy * 1e6:>10.1f} | {fast * 1e6:>10.1f} | {legacy / fast:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,238 @@ import os
 from datetime import datetime
 import re
 import click
-from ..utils.helpers import ensure_dirs, calculate_priority
-from ..utils.logger import log_action
+from ..utils.helpers import ensure_dirs, calculate_priority, refresh_index_entries
+from ..utils.logger import log_event, timed
 from ..utils.config import CONFIG
 
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
 STATUSES = CONFIG["statuses"]
 DEFAULTS = CONFIG["defaults"]
 
+# Accepted spellings of each field in --from-file records (matched case-insensitively)
+RECORD_FIELDS = {
+    "name": ("name", "task name", "title"),
+    "description": ("description",),
+    "priority": ("priority", "priority score"),
+    "due_date": ("due_date", "due date", "due"),
+    "tags": ("tags",),
+    "status": ("status",),
+    "folder": ("folder", "list"),
+}
+
+
+def split_task_path(task_name):
+    """Split "Area/Sub/Title" path syntax into (folder or None, title)."""
+    if os.sep in task_name or '/' in task_name:
+        parts = task_name.replace('\t',' ').replace('\n',' ').replace('\r',' ').replace('\\','/').split('/')
+        # Last segment is actual task title
+        clean_parts = [p for p in (s.strip() for s in parts) if p]
+        if len(clean_parts) > 1:
+            return os.path.join(*clean_parts[:-1]), clean_parts[-1]
+    return None, task_name
+
+
+def slugify(task_name):
+    """Keep alphanumerics, replace spaces with underscore, strip others (ascii fallback)."""
+    slug_base = re.sub(r"[^A-Za-z0-9 _-]+", "", task_name).strip().replace(" ", "_")
+    return slug_base[:30] if slug_base else "task"
+
+
+def safe_folder_parts(target_subdir):
+    """Sanitize a folder path: remove leading ../, collapse, allow alnum, space, _ -"""
+    safe_parts = []
+    for seg in target_subdir.replace('\\','/').split('/'):
+        seg = seg.strip()
+        if not seg:
+            continue
+        seg_clean = re.sub(r"[^A-Za-z0-9 _-]+", "", seg).strip()
+        if seg_clean and seg_clean not in ('.','..'):
+            safe_parts.append(seg_clean[:40])
+    return safe_parts
+
+
+def unique_task_path(base_dir, now, slug, taken=None):
+    """Return a free path for a task file named from timestamp and slug.
+
+    If a file with the same second exists, microseconds are appended; bulk adds
+    (which pass the set of paths already claimed) fall back to a counter.
+    """
+    timestamp = now.strftime("%Y-%m-%dT%H-%M-%S")
+    filepath = os.path.join(base_dir, f"{timestamp}_{slug}.md")
+    if not os.path.exists(filepath) and (taken is None or filepath not in taken):
+        return filepath
+    stem = f"{timestamp}-{now.strftime('%f')}_{slug}"
+    filepath = os.path.join(base_dir, f"{stem}.md")
+    counter = 1
+    while taken is not None and (filepath in taken or os.path.exists(filepath)):
+        filepath = os.path.join(base_dir, f"{stem}-{counter}.md")
+        counter += 1
+    return filepath
+
+
+def render_task(task_name, description, priority, due_date, tags, date_added, status):
+    return (
+        f"**Name:** {task_name}\n\n"
+        f"**Description:** {description}\n\n"
+        f"**Priority Score:** {priority}\n\n"
+        f"**Due Date:** {due_date}\n\n"
+        f"**Tags:** {tags}\n\n"
+        f"**Date Added:** {date_added}\n\n"
+        f"**Status:** {status}\n"
+    )
+
+
+def target_dir(tasks_dir, target_subdir):
+    """Return the (created) directory for target_subdir under tasks_dir."""
+    if target_subdir:
+        safe_parts = safe_folder_parts(target_subdir)
+        if safe_parts:
+            base_dir = os.path.join(tasks_dir, *safe_parts)
+            os.makedirs(base_dir, exist_ok=True)
+            return base_dir
+    return tasks_dir
+
+
+def read_records(stream, fmt):
+    """Yield raw records from a CSV, JSONL or YAML stream, one at a time.
+
+    JSONL lines are yielded undecoded so a malformed line only fails its own record
+    (see parse_record). A CSV or YAML stream that cannot be read past some point
+    raises ValueError.
+    """
+    if fmt == "csv":
+        import csv
+        try:
+            yield from csv.DictReader(stream)
+        except csv.Error as e:
+            raise ValueError(f"invalid CSV: {e}") from e
+    elif fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield line
+    else:
+        import yaml
+        # Multi-document streams are read document by document; a document may also be a list
+        try:
+            for doc in yaml.safe_load_all(stream):
+                if isinstance(doc, list):
+                    yield from doc
+                elif doc is not None:
+                    yield doc
+        except yaml.YAMLError as e:
+            raise ValueError(f"invalid YAML: {e}") from e
+
+
+def parse_record(raw, fmt):
+    """Return the normalized record for one item of read_records. Raises ValueError if invalid."""
+    if fmt == "jsonl":
+        import json
+        try:
+            raw = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON: {e}") from e
+    return normalize_record(raw)
+
+
+def normalize_record(raw):
+    """Map a raw record onto add's fields, falling back to DEFAULTS. Raises ValueError if invalid."""
+    if not isinstance(raw, dict):
+        raise ValueError("record is not a mapping")
+    lowered = {str(k).strip().lower(): v for k, v in raw.items() if v is not None and v != ""}
+    record = {}
+    for field, keys in RECORD_FIELDS.items():
+        record[field] = next((lowered[k] for k in keys if k in lowered), None)
+    if not record["name"]:
+        raise ValueError("missing task name")
+    tags = record["tags"]
+    if isinstance(tags, (list, tuple)):
+        tags = ", ".join(str(t) for t in tags)
+    status = record["status"] or DEFAULTS["status"]
+    if status not in STATUSES:
+        raise ValueError(f"unknown status {status!r}")
+    priority = record["priority"]
+    try:
+        priority = int(priority) if priority is not None else DEFAULTS["priority"]
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid priority {priority!r}")
+    return {
+        "name": str(record["name"]),
+        "description": record["description"] or DEFAULTS["description"],
+        "priority": priority,
+        "due_date": str(record["due_date"] or DEFAULTS["due_date"]),
+        "tags": tags if tags is not None else DEFAULTS["tags"],
+        "status": status,
+        "folder": record["folder"],
+    }
+
+
+def add_from_file(source, fmt):
+    """Create one task per record in source; index and log are updated once at the end.
+
+    Invalid records are skipped. When the rest of a CSV or YAML stream cannot be read,
+    the tasks added so far are kept (and indexed) and the command fails.
+    """
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
+    taken = set()
+    created = []
+    skipped = 0
+    number = 0
+    error = None
+    with timed("add-from-file", source=source) as summary, click.open_file(source, "r", encoding="utf-8") as stream:
+        records = read_records(stream, fmt)
+        try:
+            for number, raw in enumerate(records, 1):
+                try:
+                    record = parse_record(raw, fmt)
+                except ValueError as e:
+                    skipped += 1
+                    click.secho(f"Skipped record {number}: {e}", fg="yellow", err=True)
+                    continue
+                inferred_folder, task_name = split_task_path(record["name"])
+                base_dir = target_dir(tasks_dir, record["folder"] or inferred_folder)
+                now = datetime.now()
+                filepath = unique_task_path(base_dir, now, slugify(task_name), taken)
+                taken.add(filepath)
+                with open(filepath, "w", encoding="utf-8") as f:
+                    f.write(render_task(task_name, record["description"], record["priority"], record["due_date"],
+                                        record["tags"], now.isoformat(), record["status"]))
+                created.append(os.path.relpath(filepath, tasks_dir))
+                log_event("add", path=created[-1].replace(os.sep, "/"),
+                          new={"name": task_name, "priority": record["priority"], "status": record["status"]})
+        except ValueError as e:
+            # Raised by read_records itself: nothing after this point can be read
+            error = e
+        finally:
+            # Files already written are indexed even when the loop stops early
+            refresh_index_entries(created)
+            summary.update(count=len(created), skipped=skipped)
+    click.echo(f"Added {len(created)} task(s) from {'stdin' if source == '-' else source}."
+               + (f" Skipped {skipped} invalid record(s)." if skipped else ""))
+    if error is not None:
+        raise click.ClickException(f"Stopped reading after record {number}: {error}")
+
+
 @click.command('add', help="Add a new task with calculated priority. Supports subfolders via --folder or path in name (e.g. 'Area/Task').")
-@click.argument("task_name")
+@click.argument("task_name", required=False)
 @click.option("--yes", "-y", is_flag=True, help="Skip prompts and use default values.")
 @click.option("--folder", type=str, help="Optional subfolder under tasks directory.")
-def add(task_name, yes, folder):
+@click.option("--from-file", "from_file", type=str, default=None, help="Bulk-add tasks from a CSV, JSONL or YAML file ('-' for stdin).")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl", "yaml"]), default=None, help="Record format for --from-file (default: from the file extension, jsonl for stdin).")
+def add(task_name, yes, folder, from_file, fmt):
     ensure_dirs()
     global TASKS_DIR
     TASKS_DIR = CONFIG["directories"]["tasks_dir"]
+    if from_file:
+        if task_name:
+            raise click.UsageError("TASK_NAME cannot be combined with --from-file.")
+        if fmt is None:
+            ext = os.path.splitext(from_file)[1].lower().lstrip(".")
+            fmt = {"csv": "csv", "yaml": "yaml", "yml": "yaml"}.get(ext, "jsonl")
+        add_from_file(from_file, fmt)
+        return
+    if not task_name:
+        raise click.UsageError("Missing argument 'TASK_NAME' (or use --from-file).")
+
     date_added = datetime.now().isoformat()
     if yes:
         priority = DEFAULTS["priority"]
@@ -31,56 +247,21 @@ def add(task_name, yes, folder):
         due_date = click.prompt("Enter due date (YYYY-MM-DD)", default="No due date")
         tags = click.prompt("Enter tags (comma-separated)", default="")
         status = click.prompt(f"Enter task status", default="To Do", type=click.Choice(STATUSES))
-    
+
     # Allow path syntax in task_name (e.g., "Work/Refactor login") or explicit --folder
-    inferred_folder = None
-    if os.sep in task_name or '/' in task_name:
-        parts = task_name.replace('\t',' ').replace('\n',' ').replace('\r',' ').replace('\\','/').split('/')
-        # Last segment is actual task title
-        clean_parts = [p for p in (s.strip() for s in parts) if p]
-        if len(clean_parts) > 1:
-            inferred_folder = os.path.join(*clean_parts[:-1])
-            task_name = clean_parts[-1]
+    inferred_folder, task_name = split_task_path(task_name)
     target_subdir = folder or inferred_folder
 
     # Create a filename using timestamp + a slugified portion of the task name (ascii fallback)
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%dT%H-%M-%S")
-    # Slugify: keep alphanumerics, replace spaces with underscore, strip others
-    slug_base = re.sub(r"[^A-Za-z0-9 _-]+", "", task_name).strip().replace(" ", "_")
-    slug = slug_base[:30] if slug_base else "task"
-    base_filename = f"{timestamp}_{slug}.md"
-    base_dir = TASKS_DIR
-    if target_subdir:
-        # Sanitize folder path: remove leading ../, collapse, allow alnum, space, _ -
-        safe_parts = []
-        for seg in target_subdir.replace('\\','/').split('/'):
-            seg = seg.strip()
-            if not seg:
-                continue
-            seg_clean = re.sub(r"[^A-Za-z0-9 _-]+", "", seg).strip()
-            if seg_clean and seg_clean not in ('.','..'):
-                safe_parts.append(seg_clean[:40])
-        if safe_parts:
-            base_dir = os.path.join(TASKS_DIR, *safe_parts)
-            os.makedirs(base_dir, exist_ok=True)
-    filepath = os.path.join(base_dir, base_filename)
-    # If a file with same second exists, append microseconds to ensure uniqueness
-    if os.path.exists(filepath):
-        filename = f"{timestamp}-{now.strftime('%f')}_{slug}.md"
-        filepath = os.path.join(base_dir, filename)
-    
+    base_dir = target_dir(TASKS_DIR, target_subdir)
+    filepath = unique_task_path(base_dir, datetime.now(), slugify(task_name))
+
     # Write task details to the file with the task name as a property
     with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"**Name:** {task_name}\n\n")
-        f.write(f"**Description:** {description}\n\n")
-        f.write(f"**Priority Score:** {priority}\n\n")
-        f.write(f"**Due Date:** {due_date}\n\n")
-        f.write(f"**Tags:** {tags}\n\n")
-        f.write(f"**Date Added:** {date_added}\n\n")
-        f.write(f"**Status:** {status}\n")
-    
-    log_action(f"Added task: {task_name} with priority {priority} and status {status}")
+        f.write(render_task(task_name, description, priority, due_date, tags, date_added, status))
+
+    log_event("add", path=os.path.relpath(filepath, TASKS_DIR).replace(os.sep, "/"),
+              new={"name": task_name, "priority": priority, "status": status})
     click.echo(f"Task added successfully with priority score: {priority} and status: {status}. File: {filepath}")
     if target_subdir:
         click.echo(f"(Stored under subfolder: {target_subdir})")
@@ -1,36 +1,99 @@
-import os
+import re
+from datetime import datetime, timedelta
 import click
-from ..utils.helpers import ensure_dirs
-from ..utils.logger import log_action
-import shutil
+from ..utils.helpers import ensure_dirs, load_sorted_tasks, move_to_archive, archive_paths, files_to_tasks
+from ..utils.logger import log_event, timed
+from ..utils.query import parse_where
+from ..utils.tags import tags_match
+from ..utils.task import NO_START_DATE
+from ..utils.config import CONFIG
+
+_AGE_RE = re.compile(r"^(\d+)\s*([dw])$")
+
+
+def parse_older_than(value):
+    """Return the cutoff date (YYYY-MM-DD) for '30d', '2w' or an ISO date."""
+    match = _AGE_RE.match(value.strip().lower())
+    if match:
+        days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+        return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise click.BadParameter("use a number of days/weeks (e.g. 30d, 2w) or a date (YYYY-MM-DD)", param_hint="--older-than")
+
+
+def _added_on(task):
+    """Date the task was added: the Date Added header, else the date in its file name."""
+    added = task["Date Added"][:10]
+    if added:
+        return added
+    start = task["Start Date"]
+    return start if start != NO_START_DATE else None
+
+
+def select_for_archive(status, older_than, tags, where):
+    """Return the tasks (recursively) matching every given criterion, in path order."""
+    try:
+        predicate = parse_where(where)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--where")
+    wanted_status = status.lower() if status else None
+    cutoff = parse_older_than(older_than) if older_than else None
+
+    def matches(task):
+        if wanted_status and task["Status"].lower() != wanted_status:
+            return False
+        if cutoff:
+            added = _added_on(task)
+            if not added or added >= cutoff:
+                return False
+        if tags and not tags_match(task["Tags"], tags):
+            return False
+        return predicate(task)
+
+    return [t for t in files_to_tasks(recursive=True, suppress_empty_message=True) if matches(t)]
+
 
-TASKS_DIR = "tasks"
-ARCHIVE_DIR = "archive"
 # Archive a task
-@click.command('archive', help="Move a task to the archive.")
-def archive():
+@click.command('archive', help="Move a task to the archive. With --status/--older-than/--tag/--where, archive every matching task.")
+@click.option("--status", type=click.Choice(CONFIG["statuses"], case_sensitive=False), default=None, help="Archive tasks with this status.")
+@click.option("--older-than", default=None, help="Archive tasks added before this age (e.g. 30d, 2w) or date (YYYY-MM-DD).")
+@click.option("--tag", "tags", multiple=True, help="Archive tasks carrying this tag (repeatable; all must match).")
+@click.option("--where", "where", multiple=True, help="Extra condition, as for edit --where (repeatable).")
+@click.option("--dry-run", is_flag=True, help="List the tasks that would be archived without moving them.")
+def archive(status, older_than, tags, where, dry_run):
     ensure_dirs()
-    files = os.listdir(TASKS_DIR)
-    if not files:
+    if status or older_than or tags or where:
+        selected = select_for_archive(status, older_than, tags, where)
+        if not selected:
+            click.echo("No tasks match the given criteria.")
+            return
+        rel_paths = [t["Path"] for t in selected]
+        if dry_run:
+            for rel_path in rel_paths:
+                click.echo(f"Would archive: {rel_path}")
+            click.echo(f"Would archive {len(rel_paths)} task(s).")
+            return
+        with timed("bulk-archive", count=len(rel_paths)):
+            archived = archive_paths(rel_paths)
+        for rel_path, dest in zip(rel_paths, archived):
+            log_event("archive", path=rel_path, new=dest)
+        click.echo(f"Archived {len(archived)} task(s).")
+        return
+
+    tasks = load_sorted_tasks()
+    if not tasks:
         click.echo("No tasks found.")
         return
-    
-    for idx, file in enumerate(files, 1):
-        task_name = file
-        with open(os.path.join(TASKS_DIR, file), "r") as f:
-            for line in f:
-                if line.startswith("**Name:**"):
-                    task_name = line.split("**Name:**")[1].strip()
-                    break
-                
-        click.echo(f"{idx}. {task_name}")
-    
+
+    for idx, task in enumerate(tasks, 1):
+        click.echo(f"{idx}. {task['Task Name']}")
+
     choice = click.prompt("Enter the number of the task you want to archive", type=int)
-    if 1 <= choice <= len(files):
-        src = os.path.join(TASKS_DIR, files[choice - 1])
-        dest = os.path.join(ARCHIVE_DIR, files[choice - 1])
-        shutil.move(src, dest)
-        log_action(f"Archived task: {files[choice - 1]}")
-        click.echo(f"Task archived: {files[choice - 1]}")
+    if 1 <= choice <= len(tasks):
+        archived = move_to_archive(tasks, choice)
+        log_event("archive", path=tasks[choice - 1]["Path"], new=archived)
+        click.echo(f"Task archived: {archived}")
     else:
-        click.echo("Invalid choice. Please try again.")
\ No newline at end of file
+        click.echo("Invalid choice. Please try again.")
@@ -1,11 +1,14 @@
 import os
 import click
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tabulate import tabulate
-from rich.pretty import pprint
-from ..utils.helpers import ensure_dirs, calculate_priority, show_tasks, files_to_tasks, get_sorted_files
-from ..utils.logger import log_action
+from ..utils.helpers import ensure_dirs, calculate_priority, show_tasks, load_top_tasks, refresh_index_entries, files_to_tasks, get_task_details
+from ..utils.header_patch import patch_header
+from ..utils.logger import log_event, timed
+from ..utils.query import parse_where
+from ..utils.scanner import scan_workers
+from ..utils.task import NO_TAGS
 from ..utils.config import CONFIG
 
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
@@ -13,7 +16,112 @@ ARCHIVE_DIR = CONFIG["directories"]["archive_dir"]
 STATUSES = CONFIG["statuses"]
 TABLE_CONFIG = CONFIG["table"]["columns"]
 
-@click.command('edit', help="List all tasks and suggest which one to edit.")
+# --set field -> header label
+SET_FIELDS = {
+    "name": "Name",
+    "description": "Description",
+    "priority": "Priority Score",
+    "due": "Due Date",
+    "due_date": "Due Date",
+    "tags": "Tags",
+    "status": "Status",
+    "list": "List",
+}
+_SET_RE = re.compile(r"^\s*([A-Za-z_]+)\s*(\+=|-=|=)(.*)$")
+
+
+def _split_tags(raw):
+    if not raw or raw == NO_TAGS:
+        return []
+    return [t.strip() for t in raw.split(",") if t.strip()]
+
+
+def _add_tags(extra):
+    def apply(old):
+        tags = _split_tags(old)
+        seen = {t.lower() for t in tags}
+        tags += [t for t in extra if t.lower() not in seen]
+        return ", ".join(tags)
+    return apply
+
+
+def _remove_tags(unwanted):
+    drop = {t.lower() for t in unwanted}
+    return lambda old: ", ".join(t for t in _split_tags(old) if t.lower() not in drop)
+
+
+def parse_assignments(assignments):
+    """Turn --set expressions into {header label: value or callable(old value)}."""
+    updates = {}
+    for text in assignments:
+        match = _SET_RE.match(text)
+        if not match:
+            raise click.BadParameter(f"cannot parse {text!r} (expected field=value)", param_hint="--set")
+        field, op, value = match.group(1).lower(), match.group(2), match.group(3).strip()
+        label = SET_FIELDS.get(field)
+        if label is None:
+            raise click.BadParameter(f"unknown field {field!r}; choose from {', '.join(sorted(SET_FIELDS))}", param_hint="--set")
+        if op != "=":
+            if label != "Tags":
+                raise click.BadParameter(f"{op} is only supported for tags", param_hint="--set")
+            tags = _split_tags(value)
+            updates[label] = _add_tags(tags) if op == "+=" else _remove_tags(tags)
+            continue
+        if label == "Priority Score":
+            try:
+                value = str(int(value))
+            except ValueError:
+                raise click.BadParameter(f"priority must be an integer, got {value!r}", param_hint="--set")
+        elif label == "Status":
+            canonical = {s.lower(): s for s in STATUSES}.get(value.lower())
+            if canonical is None:
+                raise click.BadParameter(f"unknown status {value!r}; choose from {', '.join(STATUSES)}", param_hint="--set")
+            value = canonical
+        updates[label] = value
+    return updates
+
+
+def bulk_edit(where, assignments, dry_run):
+    """Patch the header lines named by --set in every task matching --where."""
+    try:
+        predicate = parse_where(where)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--where")
+    updates = parse_assignments(assignments)
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
+    matching = [t["Path"] for t in files_to_tasks(recursive=True, suppress_empty_message=True) if predicate(t)]
+    if not matching:
+        click.echo("No tasks match the given conditions.")
+        return
+
+    stamp = datetime.now().isoformat()
+
+    def patch(rel_path):
+        return rel_path, patch_header(os.path.join(tasks_dir, rel_path), updates, dry_run=dry_run, edited=stamp)
+
+    def patch_all():
+        with ThreadPoolExecutor(max_workers=min(scan_workers(), len(matching))) as pool:
+            return [(rel, changes) for rel, changes in pool.map(patch, matching) if changes]
+
+    if dry_run:
+        results = patch_all()
+        for rel_path, changes in results:
+            summary = "; ".join(f"{label}: {old!r} -> {new!r}" for label, (old, new) in changes.items())
+            click.echo(f"Would update {rel_path}: {summary}")
+        click.echo(f"Would update {len(results)} of {len(matching)} matching task(s).")
+        return
+    with timed("bulk-edit", where=list(where)) as summary:
+        results = patch_all()
+        summary["count"] = len(results)
+        if results:
+            refresh_index_entries([rel for rel, _ in results])
+    click.echo(f"Updated {len(results)} of {len(matching)} matching task(s).")
+    for rel_path, changes in results:
+        log_event("edit", path=rel_path, old={label: old for label, (old, _) in changes.items()},
+                  new={label: new for label, (_, new) in changes.items()})
+
+
+@click.command('edit', help="List all tasks and suggest which one to edit. With --where/--set, edit matching tasks without prompting.")
 @click.option("--status", is_flag=True, help="Filter tasks by status interactively.")
 @click.option("--priority", is_flag=True, help="Filter tasks by priority interactively.")
 @click.option("--due-date", is_flag=True, help="Filter tasks by due date interactively.")
@@ -27,63 +135,61 @@ TABLE_CONFIG = CONFIG["table"]["columns"]
 @click.option("--done", is_flag=True, help="Filter tasks by done status.")
 @click.option("--archived", is_flag=True, help="Filter tasks by archived status.")
 @click.option("--priority-score", is_flag=True, help="Filter tasks by priority score.")
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Only offer the N highest-priority tasks.")
+@click.option("--offset", type=click.IntRange(min=0), default=0, help="Skip the first N tasks (use with --limit to page).")
+@click.option("--where", "where", multiple=True, help="Condition selecting tasks for a bulk edit, e.g. 'status=To Do' or 'tag=work' (repeatable; all must hold).")
+@click.option("--set", "assignments", multiple=True, help="Field to change in every match: field=value, or tags+=x / tags-=x (repeatable).")
+@click.option("--dry-run", is_flag=True, help="With --where/--set, report what would change without writing.")
 
 
-def edit(status, priority, due_date, tags, name, description, date_created, date_edited, open_task, in_progress, done, archived, priority_score):
+def edit(status, priority, due_date, tags, name, description, date_created, date_edited, open_task, in_progress, done, archived, priority_score, limit, offset, where, assignments, dry_run):
     """Edit an existing task."""
     ensure_dirs()
-    files = get_sorted_files(TASKS_DIR)
-    # pprint(files_to_tasks(files))   
-    if not files:
+    if where or assignments:
+        if not where or not assignments:
+            raise click.UsageError("Bulk edit needs both --where and --set.")
+        bulk_edit(where, assignments, dry_run)
+        return
+    tasks = load_top_tasks(limit, offset)
+    if not tasks:
         click.echo("No tasks found.")
         return
 
-    show_tasks(files_to_tasks(files))
+    # Rows keep their overall rank, so the numbers match an unpaged listing
+    show_tasks(tasks, presorted=True, start=offset + 1)
 
     choice = click.prompt("Enter the number of the task you want to edit", type=int)
-    if choice < 1 or choice > len(files):
+    if choice <= offset or choice > offset + len(tasks):
         click.secho("Invalid choice. Please select a valid task number.", fg="red")
         return
-    while files[choice-1] not in files:
-        click.secho("Invalid choice. Please select a valid task number.", fg="red")
-        # pprint(files)
-        choice = click.prompt("Enter the number of the task you want to edit", type=int)
-
-    filepath = os.path.join(TASKS_DIR, files[choice-1])
-    # pprint({"filePath":filepath, "sorted": files, "Choice":choice})
-
-    task_data = {}
-    with open(filepath, "r") as f:
-        for line in f:
-            if line.startswith("**Name:**"):
-                task_data["Name"] = line.split("**Name:**")[1].strip()
-            elif line.startswith("**Description:**"):
-                task_data["Description"] = line.split("**Description:**")[1].strip()
-            elif line.startswith("**Priority Score:**"):
-                task_data["Priority Score"] = line.split("**Priority Score:**")[1].strip()
-            elif line.startswith("**Due Date:**"):
-                task_data["Due Date"] = line.split("**Due Date:**")[1].strip()
-            elif line.startswith("**Tags:**"):
-                task_data["Tags"] = line.split("**Tags:**")[1].strip()
-            elif line.startswith("**Status:**"):
-                task_data["Status"] = line.split("**Status:**")[1].strip()
-
-    new_task_name = click.prompt("Enter new task name", default=task_data.get("Name", os.path.splitext(files[choice-1])[0]))
-    new_description = click.prompt("Enter new description", default=task_data.get("Description", "No description"))
-    new_due_date = click.prompt("Enter new due date (YYYY-MM-DD)", default=task_data.get("Due Date", "No due date"))
-    new_tags = click.prompt("Enter new tags (comma-separated)", default=task_data.get("Tags", ""))
-    new_status = click.prompt(f"Enter new status", default=task_data.get("Status", "To Do"), type=click.Choice(STATUSES))
+
+    rel_path = tasks[choice - 1 - offset]["Path"]
+    filepath = os.path.join(CONFIG["directories"]["tasks_dir"], rel_path)
+
+    current = get_task_details(filepath)
+    default_status = current["Status"] if current["Status"] in STATUSES else "To Do"
+    default_tags = "" if current["Tags"] == NO_TAGS else current["Tags"]
+
+    new_task_name = click.prompt("Enter new task name", default=current["Task Name"])
+    new_description = click.prompt("Enter new description", default=current["Description"])
+    new_due_date = click.prompt("Enter new due date (YYYY-MM-DD)", default=current["Due Date"])
+    new_tags = click.prompt("Enter new tags (comma-separated)", default=default_tags)
+    new_status = click.prompt(f"Enter new status", default=default_status, type=click.Choice(STATUSES))
     update_priority = click.confirm("Do you want to update the priority score?", default=False)
-    new_priority = calculate_priority() if update_priority else task_data.get("Priority Score", "0")
-
-    with open(filepath, "w") as f:
-        f.write(f"**Name:** {new_task_name}\n\n")
-        f.write(f"**Description:** {new_description}\n\n")
-        f.write(f"**Priority Score:** {new_priority}\n\n")
-        f.write(f"**Due Date:** {new_due_date}\n\n")
-        f.write(f"**Tags:** {new_tags}\n\n")
-        f.write(f"**Date Edited:** {datetime.now().isoformat()}\n\n")
-        f.write(f"**Status:** {new_status}\n")
-
-    log_action(f"Edited task: {new_task_name} with status {new_status}")
-    click.echo(f"Task edited successfully. New status: {new_status}")
\ No newline at end of file
+
+    # Patch only the header lines; Date Added, List and the body are kept as they are
+    updates = {
+        "Name": new_task_name,
+        "Description": new_description,
+        "Due Date": new_due_date,
+        "Tags": new_tags,
+        "Status": new_status,
+    }
+    if update_priority:
+        updates["Priority Score"] = str(calculate_priority())
+    changes = patch_header(filepath, updates, edited=datetime.now().isoformat())
+    refresh_index_entries([rel_path])
+
+    log_event("edit", path=rel_path, old={label: old for label, (old, _) in changes.items()},
+              new={label: new for label, (_, new) in changes.items()})
+    click.echo(f"Task edited successfully. New status: {new_status}")
@@ -1,11 +1,8 @@
 import os
 import click
-from tabulate import tabulate
-import plotly.figure_factory as ff
-from rich.pretty import pprint
 from datetime import datetime
 import re
-from ..utils.helpers import ensure_dirs, files_to_tasks
+from ..utils.helpers import ensure_dirs, files_to_tasks, list_task_files
 from ..utils.config import CONFIG
 
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
@@ -19,7 +16,7 @@ GANTT_HEIGHT = CONFIG["gantt"]["height"]
 def gantt(wait, output, no_open):
     """Generate a Gantt chart for tasks."""
     ensure_dirs()
-    files = os.listdir(TASKS_DIR)
+    files = list_task_files(TASKS_DIR)
     if not files:
         click.secho("No tasks found.", fg="yellow")
         return
@@ -58,6 +55,8 @@ def gantt(wait, output, no_open):
     if not data:
         click.secho("No tasks with valid dates to build Gantt chart.", fg="yellow")
         return
+    import plotly.figure_factory as ff  # heavy; only needed once there is a chart to draw
+
     fig = ff.create_gantt(
         data, 
         index_col="Resource", 
@@ -1,6 +1,7 @@
-import os
 import click
-from ..utils.helpers import ensure_dirs, show_tasks, get_task_details, files_to_tasks
+from ..utils.helpers import ensure_dirs, show_tasks, get_task_details, files_to_tasks, load_top_tasks, format_tasks, select_top
+from ..utils.scanner import probe_dir
+from ..utils.watch import TaskWatcher, watch
 from ..utils.config import CONFIG
 
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
@@ -10,7 +11,11 @@ TABLE_CONFIG = CONFIG["table"]["columns"]
 @click.command(name="ls", help="List all tasks or filter by status. Supports nested folders from sync --folders.")
 @click.option("--status", is_flag=True, help="Filter tasks by status interactively.")
 @click.option("--recursive", is_flag=True, help="Recurse into subdirectories (auto if top-level empty).")
-def list_tasks(status, recursive):
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Show only the N highest-priority tasks.")
+@click.option("--offset", type=click.IntRange(min=0), default=0, help="Skip the first N tasks (use with --limit to page).")
+@click.option("--watch", "watch_mode", is_flag=True, help="Keep running and redraw the table whenever tasks change (Ctrl+C to stop).")
+@click.option("--interval", type=click.FloatRange(min=0.1), default=2.0, show_default=True, help="Seconds between checks in --watch mode.")
+def list_tasks(status, recursive, limit, offset, watch_mode, interval):
     """List tasks sorted by priority, optionally filtered by status interactively.
 
     If tasks dir contains only subdirectories (from sync --folders), recurse automatically unless disabled.
@@ -18,20 +23,13 @@ def list_tasks(status, recursive):
     ensure_dirs()
     global TASKS_DIR
     TASKS_DIR = CONFIG["directories"]["tasks_dir"]
-    try:
-        entries = os.listdir(TASKS_DIR)
-    except FileNotFoundError:
-        entries = []
-
-    # If every entry is a directory, treat as auto-recursive.
-    # Determine if there are any top-level files
-    top_level_files = [e for e in entries if os.path.isfile(os.path.join(TASKS_DIR, e))]
-    if not entries:
+    # Stops at the first top-level task file, so probing stays cheap on large folders
+    has_files, has_subdirs = probe_dir(TASKS_DIR)
+    if not has_files and not has_subdirs and not watch_mode:
         click.secho("No tasks found.", fg="yellow")
         return
-    has_subdirs = any(os.path.isdir(os.path.join(TASKS_DIR, e)) for e in entries)
     # Auto recursive if user asked OR no top-level files but subdirectories present
-    use_recursive = recursive or (has_subdirs and not top_level_files)
+    use_recursive = recursive or not has_files
 
     # When auto_recursive is true but there are only subdirs (no direct files), we should proceed
     # even if there are no direct Markdown files at top level. Avoid premature 'No tasks found.'
@@ -49,7 +47,25 @@ def list_tasks(status, recursive):
         else:
             click.secho("Invalid choice. No status filter applied.", fg="red")
 
-    if use_recursive:
+    if watch_mode:
+        wanted = selected_status.lower() if selected_status else None
+
+        def render(tasks):
+            if wanted:
+                tasks = [t for t in tasks if t["Status"].lower() == wanted]
+            top = select_top(tasks, limit, offset)
+            return format_tasks(top, start=offset + 1) if top else "No tasks found."
+
+        watch(TaskWatcher(TASKS_DIR, recursive=use_recursive), render, interval)
+        return
+
+    if limit is not None or offset:
+        tasks = load_top_tasks(limit, offset, selected_status=selected_status, recursive=use_recursive)
+        if not tasks:
+            click.secho("No tasks found.", fg="yellow")
+            return
+        show_tasks(tasks, presorted=True, start=offset + 1)
+    elif use_recursive:
         tasks = files_to_tasks(recursive=True, selected_status=selected_status, suppress_empty_message=True)
         if not tasks:
             # Attempt one more scan without suppression just in case
@@ -59,4 +75,4 @@ def list_tasks(status, recursive):
             return
         show_tasks(tasks)
     else:
-        show_tasks(files_to_tasks(top_level_files, selected_status))
+        show_tasks(files_to_tasks(selected_status=selected_status))
@@ -0,0 +1,17 @@
+import click
+from ..utils.helpers import ensure_dirs, rebuild_index
+from ..utils.index import index_path
+from ..utils.search_index import load_search_index, remove_search_index
+from ..utils.config import CONFIG
+
+
+@click.command(name="reindex", help="Rebuild the task metadata and search indexes from a full scan of the tasks directory.")
+def reindex():
+    """Force a full rebuild of the metadata and search indexes."""
+    ensure_dirs()
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
+    count = rebuild_index(tasks_dir)
+    click.echo(f"Indexed {count} task(s) into {index_path(tasks_dir)}")
+    remove_search_index(tasks_dir)
+    search_index = load_search_index(tasks_dir)
+    click.echo(f"Search index rebuilt with {len(search_index)} task(s).")
@@ -0,0 +1,89 @@
+import os
+from datetime import datetime
+import click
+from ..utils.helpers import ensure_dirs, refresh_index_entries
+from ..utils.logger import log_event
+from ..utils.pack import PackArchive, pack_path, INDEX_SUFFIX
+from ..utils.scanner import walk_files
+from ..utils.config import CONFIG
+
+
+def _free_path(path):
+    stem, ext = os.path.splitext(path)
+    counter = 1
+    while os.path.exists(path):
+        path = f"{stem}-{counter}{ext}"
+        counter += 1
+    return path
+
+
+@click.command('restore', help="Restore tasks from the packed archive by id. Use --list to see the archived ids.")
+@click.argument("task_ids", nargs=-1, type=int)
+@click.option("--list", "list_ids", is_flag=True, help="List the tasks held in the packed archive.")
+@click.option("--show", "show_id", type=int, default=None, help="Print an archived task without restoring it.")
+def restore(task_ids, list_ids, show_id):
+    ensure_dirs()
+    pack = PackArchive.open(CONFIG["directories"]["archive_dir"])
+    if list_ids:
+        if not pack.entries:
+            click.echo("The packed archive is empty.")
+        for task_id, entry in sorted(pack.entries.items()):
+            click.echo(f"{task_id}\t{entry['archived']}\t{entry['path']}")
+        return
+    if show_id is not None:
+        try:
+            click.echo(pack.read(show_id).decode("utf-8"), nl=False)
+        except KeyError:
+            raise click.BadParameter(f"no archived task with id {show_id}", param_hint="--show")
+        return
+    if not task_ids:
+        raise click.UsageError("Give the id(s) to restore (see restore --list).")
+    missing = [str(i) for i in task_ids if i not in pack.entries]
+    if missing:
+        raise click.BadParameter(f"no archived task with id {', '.join(missing)}", param_hint="TASK_IDS")
+
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
+    restored = []
+    for task_id in dict.fromkeys(task_ids):
+        dest = _free_path(os.path.join(tasks_dir, *pack.entries[task_id]["path"].split("/")))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "wb") as f:
+            f.write(pack.read(task_id))
+        restored.append(os.path.relpath(dest, tasks_dir))
+        log_event("restore", path=restored[-1].replace(os.sep, "/"), id=task_id)
+    pack.remove(list(dict.fromkeys(task_ids)))
+    refresh_index_entries(restored)
+    for rel in restored:
+        click.echo(f"Task restored: {rel}")
+
+
+@click.command('compact', help="Move loose archived task files into the packed archive and drop restored tasks from it.")
+@click.option("--dry-run", is_flag=True, help="Only report what would be packed.")
+def compact(dry_run):
+    ensure_dirs()
+    archive_dir = CONFIG["directories"]["archive_dir"]
+    path = pack_path(archive_dir)
+    own_files = {name + suffix for name in (path, path + ".tmp") for suffix in ("", INDEX_SUFFIX)}
+    loose = [entry.path for entry in walk_files(archive_dir) if entry.path not in own_files]
+    if dry_run:
+        click.echo(f"Would pack {len(loose)} loose file(s).")
+        return
+    pack = PackArchive.open(archive_dir)
+    if loose:
+        pack.add_files([(os.path.relpath(p, archive_dir), p) for p in loose], datetime.now().isoformat(timespec="seconds"))
+        for p in loose:
+            os.remove(p)
+        # Drop the folders the loose files leave empty (the archive root stays)
+        folders = sorted({os.path.dirname(p) for p in loose}, key=len, reverse=True)
+        for folder in folders:
+            while os.path.abspath(folder) != os.path.abspath(archive_dir):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break
+                folder = os.path.dirname(folder)
+    reclaimed = pack.compact()
+    for p in loose:
+        log_event("pack", path=os.path.relpath(p, archive_dir).replace(os.sep, "/"))
+    click.echo(f"Packed {len(loose)} loose file(s) into {path}."
+               + (f" Reclaimed {reclaimed} bytes from restored tasks." if reclaimed else ""))
@@ -1,84 +1,90 @@
 import os
 import click
-from ..utils.helpers import ensure_dirs
+from ..utils.helpers import ensure_dirs, load_top_tasks, select_top, tasks_with_tag_index
+from ..utils.tags import select_by_tags, tags_match
+from ..utils.search_index import load_search_index, parse_query
+from ..utils.watch import TaskWatcher, watch
+from ..utils.config import CONFIG
 
 TASKS_DIR = "tasks"
 
 # Search for tasks by keyword or tag
-@click.command(name="search", help="Search for tasks containing a specific keyword or tag.")
-@click.argument("keyword", type=str, required=True)
+@click.command(name="search", help="Search tasks by keyword(s) using the full-text index. Terms are ANDed; put OR between terms (or use --any) to match either.")
+@click.argument("keywords", nargs=-1, required=True)
 @click.option("--tag", is_flag=True, help="Search within tags only.")
-def search(keyword, tag):
-    """Search for tasks containing a specific keyword or tag."""
+@click.option("--field", "fields", multiple=True, type=click.Choice(["name", "description", "tags"]), help="Restrict the search to a field (repeatable).")
+@click.option("--any", "match_any", is_flag=True, help="Match tasks containing any of the terms.")
+def search(keywords, tag, fields, match_any):
+    """Search for tasks containing the given keywords, optionally scoped to fields."""
     ensure_dirs()
-    files = os.listdir(TASKS_DIR)
-    if not files:
+    global TASKS_DIR
+    TASKS_DIR = CONFIG["directories"]["tasks_dir"]
+    index = load_search_index(TASKS_DIR)
+    if not len(index):
         click.echo("No tasks found.")
         return
 
-    found = False
-    for file in files:
-        filepath = os.path.join(TASKS_DIR, file)
-        with open(filepath, "r") as f:
-            content = f.read()
-            if tag:
-                for line in content.splitlines():
-                    if line.startswith("**Tags:**") and keyword.lower() in line.lower():
-                        click.echo(f"Found in: {file}")
-                        found = True
-                        break
-            else:
-                if keyword.lower() in content.lower():
-                    click.echo(f"Found in: {file}")
-                    found = True
+    scope = set(fields)
+    if tag:
+        scope.add("tags")
+    matches = index.search(parse_query(keywords, match_any), sorted(scope) or None)
+    for path in matches:
+        click.echo(f"Found in: {path}")
 
-    if not found:
-        click.echo(f"No tasks found containing the keyword or tag: {keyword}")
+    if not matches:
+        click.echo(f"No tasks found containing the keyword or tag: {' '.join(keywords)}")
 
 # Filter tasks by priority range and/or tags
-@click.command(name="filter", help="Filter tasks within a specified priority range and/or by tag.")
+@click.command(name="filter", help="Filter tasks within a specified priority range and/or by exact tags.")
 @click.option("--min-priority", type=int, default=-999, help="Minimum priority score.")
 @click.option("--max-priority", type=int, default=999, help="Maximum priority score.")
-@click.option("--tag", default=None, help="Filter by tag.")
-def filter_tasks(min_priority, max_priority, tag):
-    """Filter tasks within a specified priority range and/or by tag."""
+@click.option("--tag", "tags", multiple=True, help="Require this tag (repeatable; all must match).")
+@click.option("--any-tag", "any_tags", multiple=True, help="Require at least one of these tags (repeatable).")
+@click.option("--not-tag", "not_tags", multiple=True, help="Exclude tasks carrying this tag (repeatable).")
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Show only the N highest-priority matches.")
+@click.option("--offset", type=click.IntRange(min=0), default=0, help="Skip the first N matches.")
+@click.option("--watch", "watch_mode", is_flag=True, help="Keep running and reprint the matches whenever tasks change (Ctrl+C to stop).")
+@click.option("--interval", type=click.FloatRange(min=0.1), default=2.0, show_default=True, help="Seconds between checks in --watch mode.")
+def filter_tasks(min_priority, max_priority, tags, any_tags, not_tags, limit, offset, watch_mode, interval):
+    """Filter tasks within a specified priority range and/or by tag set queries."""
     ensure_dirs()
-    files = os.listdir(TASKS_DIR)
-    if not files:
-        click.echo("No tasks found.")
-        return
 
-    def get_task_details(filepath):
-        details = {"priority": None, "tags": ""}
-        with open(filepath, "r") as f:
-            for line in f:
-                if line.startswith("**Priority Score:**"):
-                    try:
-                        details["priority"] = int(line.strip().split("**Priority Score:**")[1].strip())
-                    except ValueError:
-                        details["priority"] = None
-                elif line.startswith("**Tags:**"):
-                    details["tags"] = line.split("**Tags:**")[1].strip()
-        return details
+    def matches(t):
+        return (t["Priority Score"] != -999 and min_priority <= t["Priority Score"] <= max_priority
+                and tags_match(t["Tags"], tags, any_tags, not_tags))
 
-    filtered = []
-    for file in files:
-        filepath = os.path.join(TASKS_DIR, file)
-        details = get_task_details(filepath)
-        priority = details["priority"]
-        tags = details["tags"]
+    if watch_mode:
+        def render(tasks):
+            filtered = select_top([t for t in tasks if matches(t)], limit, offset)
+            return format_matches(filtered, offset) if filtered else "No tasks found matching the specified criteria."
+
+        watch(TaskWatcher(CONFIG["directories"]["tasks_dir"], recursive=True), render, interval)
+        return
 
-        if priority is not None and min_priority <= priority <= max_priority:
-            if tag:
-                if tag.lower() in tags.lower():
-                    filtered.append((file, priority, tags))
-            else:
-                filtered.append((file, priority, tags))
+    if limit is not None:
+        # Evaluate the query per task so the ordered index can stop after limit matches
+        filtered = load_top_tasks(limit, offset, recursive=True, predicate=matches)
+    else:
+        tasks, tag_index = tasks_with_tag_index(recursive=True)
+        if not tasks:
+            click.echo("No tasks found.")
+            return
+
+        selected = select_by_tags(tag_index, (t["Path"] for t in tasks), tags, any_tags, not_tags)
+        filtered = select_top([
+            t for t in tasks
+            if t["Path"] in selected and t["Priority Score"] != -999 and min_priority <= t["Priority Score"] <= max_priority
+        ], offset=offset)
 
     if not filtered:
         click.echo("No tasks found matching the specified criteria.")
         return
 
-    filtered.sort(key=lambda x: x[1], reverse=True)
-    for idx, (file, priority, tags) in enumerate(filtered, 1):
-        click.echo(f"{idx}. {file} - Priority Score: {priority} - Tags: {tags}")
+    click.echo(format_matches(filtered, offset))
+
+
+def format_matches(tasks, offset=0):
+    return "\n".join(
+        f"{idx}. {task['Path']} - Priority Score: {task['Priority Score']} - Tags: {task['Tags']}"
+        for idx, task in enumerate(tasks, offset + 1)
+    )
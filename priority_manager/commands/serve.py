@@ -0,0 +1,34 @@
+import os
+import signal
+import socket
+import sys
+import click
+from ..utils.helpers import ensure_dirs
+from ..utils.daemon import TaskDaemon, daemon_running, socket_path
+from ..utils.config import CONFIG
+
+
+@click.command('serve', help="Keep tasks in memory and answer ls, search, filter and export over a Unix socket. Other invocations forward to it automatically.")
+def serve():
+    if not hasattr(socket, "AF_UNIX"):
+        raise click.ClickException("serve needs Unix domain sockets, which this platform does not provide.")
+    ensure_dirs()
+    # Requests may come from any working directory, so pin the configured folders
+    for key in ("tasks_dir", "archive_dir"):
+        CONFIG["directories"][key] = os.path.abspath(CONFIG["directories"][key])
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
+    path = socket_path(tasks_dir)
+    if os.path.exists(path):
+        if daemon_running(path):
+            raise click.ClickException(f"A daemon is already serving {tasks_dir} ({path}).")
+        os.remove(path)  # left behind by a daemon that did not shut down cleanly
+
+    daemon = TaskDaemon(tasks_dir)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    click.echo(f"Serving {len(daemon.watcher.files)} task(s) from {tasks_dir} on {path} (Ctrl+C to stop).")
+    try:
+        daemon.serve(path)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
@@ -0,0 +1,21 @@
+import click
+from ..utils.helpers import ensure_dirs, tasks_with_tag_index
+
+
+@click.command(name="tags", help="List tags with the number of tasks carrying each one.")
+@click.option("--sort", "sort_by", type=click.Choice(["count", "name"]), default="count", show_default=True, help="Order tags by task count or by name.")
+def list_tags(sort_by):
+    """List tag counts straight from the metadata index."""
+    ensure_dirs()
+    _, tag_index = tasks_with_tag_index(recursive=True)
+    if not tag_index:
+        click.echo("No tags found.")
+        return
+    counts = [(tag, len(paths)) for tag, paths in tag_index.items()]
+    if sort_by == "count":
+        counts.sort(key=lambda item: (-item[1], item[0]))
+    else:
+        counts.sort()
+    from tabulate import tabulate
+
+    click.echo(tabulate(counts, headers=["Tag", "Tasks"], tablefmt="github"))
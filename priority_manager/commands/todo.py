@@ -1,12 +1,18 @@
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import click
 import requests
-from ..utils.helpers import ensure_dirs, files_to_tasks
-from ..utils.ms_todo import get_token, get_or_create_list, get_tasks, create_task, get_lists, get_access_token
+from requests.adapters import HTTPAdapter
+from ..utils.helpers import ensure_dirs, files_to_tasks, refresh_index_entries
+from ..utils.header_patch import patch_header
+from ..utils.logger import log_event
+from ..utils import graph_http
+from ..utils.ms_todo import get_token, get_or_create_list, get_task_delta, create_task, create_tasks_batch, create_list, get_lists, get_access_token
 from ..utils.config import CONFIG
+from ..utils.sync_state import ListMirror, load_state, save_state, unchanged
 
 # Use dynamic access inside the command so tests altering CONFIG take effect.
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
@@ -20,13 +26,20 @@ TASKS_DIR = CONFIG["directories"]["tasks_dir"]
 @click.option("--list", "list_name", type=str, help="Target a specific list name instead of default.")
 @click.option("--all-lists", is_flag=True, help="Pull tasks from ALL lists (push still targets chosen/default list).")
 @click.option("--folders", is_flag=True, help="Organize pulled tasks into subfolders named by list. Push will recurse.")
-def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list_name, all_lists, folders):
+@click.option("--concurrency", type=click.IntRange(min=1), default=8, show_default=True, help="Lists fetched in parallel with --all-lists.")
+@click.option("--full", is_flag=True, help="Ignore saved delta links and fetch every remote task again.")
+def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list_name, all_lists, folders, concurrency, full):
     """Synchronize local tasks with Microsoft To Do list.
 
     Modes:
       --push  : local -> remote only
       --pull  : remote -> local only
       --both  : bidirectional (default)
+
+    Remote tasks are read with Graph delta queries: after the first run only
+    tasks changed since the saved delta link are downloaded (--full resets).
+    A ledger in the same state file pairs remote task ids with local files, so
+    remote renames update the existing file instead of adding a duplicate.
     """
     # Refresh tasks dir in case CONFIG changed (e.g., tests)
     global TASKS_DIR
@@ -82,14 +95,19 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
             f.write(f"**Status:** To Do\n")
         return path
 
+    graph_http.STATS.reset()
     with requests.Session() as session:
+        # Let every fetch worker keep its own pooled connection
+        adapter = HTTPAdapter(pool_maxsize=max(concurrency, 10))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         target_list_name = list_name or "Priority Manager"
 
         # If pulling all lists we fetch them first; push list is still resolved separately.
         all_remote_lists = []
         if all_lists:
             try:
-                all_remote_lists = get_lists(session, token)
+                all_remote_lists = list(get_lists(session, token))
             except requests.HTTPError as e:
                 click.secho(f"Failed to retrieve lists: {e}", fg='red')
                 return
@@ -97,7 +115,7 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
             # For interactive selection (only if not specifying list & not all-lists & interactive tty)
             if list_name is None:
                 try:
-                    lists_preview = get_lists(session, token)
+                    lists_preview = list(get_lists(session, token))
                     # Only prompt if interactive and more than 1 list and default not present
                     if sys.stdin.isatty() and len(lists_preview) > 1 and not any(l.get('displayName') == target_list_name for l in lists_preview):
                         click.echo("Select a list (no default found):")
@@ -113,16 +131,12 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
             if list_name and not all_lists:
                 # If explicit list requested, we need to create if missing. get_or_create_list uses constant name so implement inline.
                 # Simpler: temporarily adjust constant behavior by creating if missing manually.
-                remote_lists_for_target = get_lists(session, token)
+                remote_lists_for_target = list(get_lists(session, token))
                 match = next((l for l in remote_lists_for_target if l.get('displayName') == target_list_name), None)
                 if match:
                     list_id = match.get('id')
                 else:
-                    # create
-                    url = f"https://graph.microsoft.com/v1.0/me/todo/lists"
-                    resp = session.post(url, headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}, json={"displayName": target_list_name})
-                    resp.raise_for_status()
-                    list_id = resp.json().get('id')
+                    list_id = create_list(session, token, target_list_name)
             else:
                 # default existing logic (constant name) still works
                 list_id = get_or_create_list(session, token)
@@ -142,12 +156,25 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
                 if verbose:
                     click.echo(body[:800])
                 return
-        # Remote tasks for primary list (used for push and default pull)
-        remote_tasks = get_tasks(session, token, list_id)
-        remote_titles = {t.get("title") for t in remote_tasks}
+        # Changed remote tasks per list id as (task, ledger entry before this run) pairs
+        state = load_state()
+        mirrors = {}
+
+        def changes(lid):
+            mirror = mirrors[lid] = ListMirror(state.get(lid), full=full)
+            return mirror.apply(get_task_delta(session, token, lid, mirror.delta_link,
+                                               on_delta=mirror.set_link, on_reset=mirror.reset))
+
+        # Primary list (used for push and default pull). Pulling a single list consumes
+        # the pages as they arrive; push needs every remote title up front.
+        remote_tasks = changes(list_id)
+        if mode != "pull" or all_lists:
+            remote_tasks = list(remote_tasks)
 
         pushed = 0
         pulled = 0
+        updated = 0
+        failed = 0
 
         # Push
         if mode in ("push", "both"):
@@ -159,25 +186,72 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
                     local_tasks = files_to_tasks(local_files)
             except FileNotFoundError:
                 local_tasks = []
+            # Files paired in the ledger are known remotely even if renamed since;
+            # titles catch tasks that were never paired
+            mirror = mirrors[list_id]
+            linked, remote_titles = mirror.paths(), mirror.titles()
+            missing = []
+            missing_paths = []
             for task in local_tasks:
                 name = task["Task Name"]
-                if name not in remote_titles:
+                if task.get("Path") not in linked and name not in remote_titles:
                     due_date = task.get("Due Date")
-                    due = None if due_date == "No due date" else due_date
-                    create_task(session, token, list_id, name, due)
-                    pushed += 1
+                    missing.append((name, None if due_date == "No due date" else due_date))
+                    missing_paths.append(task.get("Path"))
+            if missing:
+                def progress(done, total):
+                    click.echo(f"Pushing tasks: {done}/{total}")
+
+                try:
+                    results = create_tasks_batch(session, token, list_id, missing, on_progress=progress)
+                except requests.HTTPError:
+                    click.secho("Unauthorized (401) while pushing. Run: priority-manager auth", fg='red')
+                    return
+                for (name, _), rel_path, (body, error) in zip(missing, missing_paths, results):
+                    if error is None:
+                        pushed += 1
+                        if isinstance(body, dict) and body.get("id"):
+                            mirror.record(body, rel_path)
+                    else:
+                        failed += 1
+                        click.secho(f"Failed to push '{name}': {error}", fg='yellow')
 
         # Pull logic
         if mode in ("pull", "both"):
-            def pull_from_list(tasks_list, list_display):
-                nonlocal pulled
-                try:
-                    local_files_now = os.listdir(TASKS_DIR) if not folders else []
-                except FileNotFoundError:
-                    local_files_now = []
-                local_tasks_parsed = files_to_tasks(local_files_now, recursive=folders) if (local_files_now or folders) else []
-                local_title_pairs = {(t.get('Task Name'), t.get('List','')) for t in local_tasks_parsed}
-                for r in tasks_list:
+            # Remote tasks are paired with local files by id through the ledger. Only a full
+            # round (first run, --full, expired delta link) falls back to matching titles,
+            # so only then are the local files scanned, once for every list.
+            local_title_pairs = None
+
+            def local_match(title, list_display):
+                nonlocal local_title_pairs
+                if local_title_pairs is None:
+                    try:
+                        local_files_now = os.listdir(TASKS_DIR) if not folders else []
+                    except FileNotFoundError:
+                        local_files_now = []
+                    # With --folders the whole tree is scanned (files=None), not an empty file list
+                    local_tasks_parsed = (files_to_tasks(None if folders else local_files_now, recursive=folders, suppress_empty_message=True)
+                                          if (local_files_now or folders) else [])
+                    local_title_pairs = {(t.get('Task Name'), t.get('List','')): t.get('Path') for t in local_tasks_parsed}
+                return local_title_pairs.get((title, list_display), False)
+
+            def update_local(rel_path, title, due):
+                path = os.path.join(TASKS_DIR, rel_path)
+                if not os.path.exists(path):
+                    return False  # deleted or archived locally: left alone until a full round
+                changes_made = patch_header(path, {"Name": title, "Due Date": due or "No due date"},
+                                            edited=datetime.now().isoformat())
+                if changes_made:
+                    refresh_index_entries([rel_path])
+                    log_event("sync-update", path=rel_path, old={label: old for label, (old, _) in changes_made.items()},
+                              new={label: new for label, (_, new) in changes_made.items()})
+                return bool(changes_made)
+
+            def pull_from_list(tasks_list, list_display, mirror):
+                nonlocal pulled, updated
+                new_pairs = {}
+                for r, previous in tasks_list:
                     title = r.get("title")
                     if not title:
                         continue
@@ -185,8 +259,18 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
                     due_dt = r.get("dueDateTime") if isinstance(r, dict) else None
                     if isinstance(due_dt, dict):
                         due = due_dt.get("dateTime")
-                    if (title, list_display) in local_title_pairs:
+                    task_id = r.get("id")
+                    # A full round also brings back tasks whose paired file is gone
+                    if previous and previous.get("path") and not (
+                            mirror.full_round and not os.path.exists(os.path.join(TASKS_DIR, previous["path"]))):
+                        if not unchanged(r, previous) and update_local(previous["path"], title, due):
+                            updated += 1
                         continue
+                    if mirror.full_round or task_id is None:
+                        match = local_match(title, list_display)
+                        if match is not False:
+                            mirror.link(task_id, match)
+                            continue
                     # Custom filename includes list slug for uniqueness
                     now = datetime.now()
                     timestamp = now.strftime("%Y-%m-%dT%H-%M-%S")
@@ -205,6 +289,8 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
                     with open(path, 'w', encoding='utf-8') as f:
                         f.write(f"**Name:** {title}\n\n")
                         f.write(f"**List:** {list_display}\n\n")
+                        if task_id:
+                            f.write(f"**Remote ID:** {task_id}\n\n")
                         f.write(f"**Description:** Pulled from Microsoft To Do\n\n")
                         f.write(f"**Priority Score:** 0\n\n")
                         f.write(f"**Due Date:** {due or 'No due date'}\n\n")
@@ -212,19 +298,48 @@ def sync_tasks(open_instructions, verbose, sync_push, sync_pull, sync_both, list
                         f.write(f"**Date Added:** {datetime.now().isoformat()}\n\n")
                         f.write(f"**Status:** To Do\n")
                     pulled += 1
+                    rel_path = os.path.relpath(path, TASKS_DIR).replace(os.sep, "/")
+                    mirror.link(task_id, rel_path)
+                    new_pairs[(title, list_display)] = rel_path
+                if local_title_pairs is not None:
+                    local_title_pairs.update(new_pairs)
 
             if all_lists:
-                for lst in all_remote_lists:
-                    lid = lst.get('id')
-                    lname = lst.get('displayName')
+                def fetch(lst):
+                    # The primary list was already read above
+                    if lst.get('id') == list_id:
+                        return remote_tasks, None
                     try:
-                        tasks_list = get_tasks(session, token, lid)
+                        return list(changes(lst.get('id'))), None
                     except Exception as e:
+                        return None, e
+
+                # Lists are fetched concurrently; results are merged in list order
+                workers = max(1, min(concurrency, len(all_remote_lists)))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    fetched = list(pool.map(fetch, all_remote_lists))
+                for lst, (tasks_list, error) in zip(all_remote_lists, fetched):
+                    lname = lst.get('displayName')
+                    if error is not None:
                         if verbose:
-                            click.echo(f"Skipping list {lname}: {e}")
+                            click.echo(f"Skipping list {lname}: {error}")
                         continue
-                    pull_from_list(tasks_list, lname)
+                    pull_from_list(tasks_list, lname, mirrors[lst.get('id')])
             else:
-                pull_from_list(remote_tasks, target_list_name)
+                pull_from_list(remote_tasks, target_list_name, mirrors[list_id])
 
-        click.echo(f"Sync complete. Mode={mode}. List={'ALL' if all_lists else target_list_name}. Pushed: {pushed}, Pulled: {pulled}, Remote existing: {len(remote_titles) - pushed}")
+        # Only a run that pulled may move the delta links on; otherwise the next pull would miss
+        # these changes. A push-only run just adds the tasks it created to the ledger.
+        for lid, mirror in mirrors.items():
+            state[lid] = mirror.to_json(advance=mode in ("pull", "both"))
+        save_state(state)
+        removed = sum(m.removed for m in mirrors.values())
+        click.echo(f"Sync complete. Mode={mode}. List={'ALL' if all_lists else target_list_name}. Pushed: {pushed}, Pulled: {pulled}, Remote existing: {len(mirrors[list_id].tasks) - pushed}"
+                   + (f", Updated: {updated}" if updated else "")
+                   + (f", Removed remotely: {removed}" if removed else "")
+                   + (f", Failed: {failed}" if failed else ""))
+        stats = graph_http.STATS.snapshot()
+        log_event("sync", mode=mode, pushed=pushed, pulled=pulled, updated=updated, failed=failed, graph=stats)
+        if verbose:
+            click.echo(f"Graph requests: {stats['requests']}, retries: {stats['retries']}, "
+                       f"throttled: {stats['throttled']}, waited: {stats['wait_seconds']:.1f}s")
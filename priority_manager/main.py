@@ -1,30 +1,90 @@
+import importlib
+import sys
 import click
-from .commands.add import add
-from .commands.edit import edit
-from .commands.ls import list_tasks
-from .commands.archive import archive
-from .commands.export import export_tasks
-from .commands.todo import sync_tasks
-from .commands.search_filter import search, filter_tasks
-from .commands.gantt import gantt
-from .commands.conf import conf
-from .commands.auth import auth_command
-
-@click.group()
+from click.utils import make_default_short_help
+
+# Command name -> ("module:attribute", short help shown by --help).
+# Modules are imported only when their command is resolved, so `priority-manager add`
+# never pays for plotly, requests or the sync machinery. Keep the help text in step
+# with the first sentence of each command's own help (tests/test_lazy_cli.py checks).
+LAZY_COMMANDS = {
+    "add": (".commands.add:add", "Add a new task with calculated priority."),
+    "archive": (".commands.archive:archive", "Move a task to the archive."),
+    "auth": (".commands.auth:auth_command", "Authenticate with Microsoft To Do via device code (MSAL)."),
+    "cnf": (".commands.conf:conf", "Edit configurations."),
+    "compact": (".commands.restore:compact", "Move loose archived task files into the packed archive and drop restored tasks from it."),
+    "edit": (".commands.edit:edit", "List all tasks and suggest which one to edit."),
+    "export": (".commands.export:export_tasks", "Export tasks to CSV, NDJSON, JSON, or YAML file."),
+    "filter": (".commands.search_filter:filter_tasks", "Filter tasks within a specified priority range and/or by exact tags."),
+    "gantt": (".commands.gantt:gantt", "Generate a Gantt chart for tasks."),
+    "ls": (".commands.ls:list_tasks", "List all tasks or filter by status."),
+    "reindex": (".commands.reindex:reindex", "Rebuild the task metadata and search indexes from a full scan of the tasks directory."),
+    "restore": (".commands.restore:restore", "Restore tasks from the packed archive by id."),
+    "search": (".commands.search_filter:search", "Search tasks by keyword(s) using the full-text index."),
+    "serve": (".commands.serve:serve", "Keep tasks in memory and answer ls, search, filter and export over a Unix socket."),
+    "sync": (".commands.todo:sync_tasks", "Synchronize tasks with Microsoft To Do (push local, pull remote, or both)."),
+    "tags": (".commands.tags:list_tags", "List tags with the number of tasks carrying each one."),
+}
+
+
+class LazyGroup(click.Group):
+    """click.Group that imports a subcommand's module only when it is invoked."""
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_commands:
+            command = self._load(cmd_name)
+        return command
+
+    def _load(self, cmd_name):
+        target, _ = self.lazy_commands[cmd_name]
+        module_name, attr = target.split(":")
+        command = getattr(importlib.import_module(module_name, __package__), attr)
+        self.add_command(command, cmd_name)
+        return command
+
+    def main(self, args=None, **extra):
+        """Hand read-only commands to a running `serve` daemon; run locally otherwise."""
+        argv = sys.argv[1:] if args is None else list(args)
+        if argv and argv[0] in self.lazy_commands:
+            from .utils.daemon import forward
+
+            code = forward(argv, click.get_binary_stream("stdout"))
+            if code is not None:
+                if extra.get("standalone_mode", True):
+                    sys.exit(code)
+                return code
+        return super().main(args, **extra)
+
+    def format_commands(self, ctx, formatter):
+        """List every command from the registry without importing the unloaded ones."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            command = self.commands.get(name)
+            if command is not None:
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+            else:
+                rows.append((name, make_default_short_help(self.lazy_commands[name][1], limit)))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 def cli():
     pass
 
-cli.add_command(add)
-cli.add_command(edit)
-cli.add_command(list_tasks)
-cli.add_command(archive)
-cli.add_command(export_tasks)
-cli.add_command(search)
-cli.add_command(filter_tasks)
-cli.add_command(gantt)
-cli.add_command(conf)
-cli.add_command(sync_tasks)
-cli.add_command(auth_command)
-
 if __name__ == "__main__":
     cli()
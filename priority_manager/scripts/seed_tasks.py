@@ -1,21 +1,142 @@
 import click
 import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import accumulate
 import os
 from priority_manager.utils.config import CONFIG
 from priority_manager.utils.helpers import ensure_dirs
 
-TASKS_DIR = CONFIG["directories"]["tasks_dir"]
 STATUSES = CONFIG["statuses"]
 
 TEMPLATE = """**Name:** {name}\n\n**Description:** {description}\n\n**Priority Score:** {priority}\n\n**Due Date:** {due}\n\n**Tags:** {tags}\n\n**Date Added:** {date_added}\n\n**Status:** {status}\n"""
+LIST_TEMPLATE = """**Name:** {name}\n\n**List:** {list_name}\n\n**Description:** {description}\n\n**Priority Score:** {priority}\n\n**Due Date:** {due}\n\n**Tags:** {tags}\n\n**Date Added:** {date_added}\n\n**Status:** {status}\n"""
+
+WORDS = (
+    "review draft plan call email report budget update fix test deploy design meeting "
+    "follow up invoice schedule research write read order clean prepare sync check "
+    "client team project quarterly weekly roadmap notes backlog release onboarding"
+).split()
+BATCH_SIZE = 1000
+
+
+def zipf_weights(size, exponent):
+    """Cumulative Zipf weights for ranks 1..size (rank r has weight 1 / r**exponent)."""
+    return list(accumulate(1.0 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def generate_tasks(count, rng, base=None, span_days=30, added_days=0, tags="demo,seed", tag_vocab=0,
+                   zipf_s=1.1, max_tags=3, desc_words=(3, 12), body_lines=0, folders=0, prefix="Seed Task",
+                   random_priority=True, status="To Do", due_prob=0.9):
+    """Yield (relative path, content) for count synthetic tasks drawn from rng.
+
+    Dates are derived from base (a date, default today): Date Added falls within
+    added_days before it and due dates within span_days after Date Added. With
+    tag_vocab > 0 tags are drawn from a Zipf-distributed vocabulary instead of the
+    fixed tags string; with folders > 0 tasks are spread over per-list subfolders
+    named the way ``sync --folders`` names them.
+    """
+    base = base or datetime.now().date()
+    # Every date a task can use, as strings, so the loop never touches datetime
+    first_day = base - timedelta(days=added_days)
+    days = [(first_day + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(added_days + span_days + 1)]
+    vocab = [f"tag{rank:03d}" for rank in range(1, tag_vocab + 1)]
+    cum_weights = zipf_weights(tag_vocab, zipf_s) if vocab else None
+    lists = [(f"Seed List {k:02d}", f"Seed_List_{k:02d}") for k in range(1, folders + 1)]
+    # Descriptions are windows of one long random word stream; notes are drawn from a line pool
+    words = rng.choices(WORDS, k=4096)
+    min_words, max_words = desc_words
+    notes = [" ".join(rng.choices(WORDS, k=10)) + "\n" for _ in range(256)] if body_lines else None
+    randint, randrange, random_ = rng.randint, rng.randrange, rng.random
+    for i in range(1, count + 1):
+        day = randint(0, added_days)
+        secs = randrange(86400)
+        clock = f"{secs // 3600:02d}:{secs // 60 % 60:02d}:{secs % 60:02d}"
+        priority = randint(1, 25) if random_priority else 10
+        due = days[day + randint(1, span_days)] if random_() < due_prob else "No due date"
+        if vocab:
+            picked = rng.choices(vocab, cum_weights=cum_weights, k=randint(0, max_tags))
+            task_tags = ", ".join(dict.fromkeys(picked))
+        else:
+            task_tags = tags
+        start = randrange(len(words) - max_words)
+        description = " ".join(words[start:start + randint(min_words, max_words)]).capitalize() + "."
+        fields = dict(
+            name=f"{prefix} {i}",
+            description=description,
+            priority=priority,
+            due=due,
+            tags=task_tags,
+            date_added=f"{days[day]}T{clock}",
+            status=status,
+        )
+        filename = f"{days[day]}T{clock.replace(':', '-')}_{i}.md"
+        if lists:
+            list_name, folder = lists[i % len(lists)]
+            content = LIST_TEMPLATE.format(list_name=list_name, **fields)
+            rel_path = os.path.join(folder, filename)
+        else:
+            content = TEMPLATE.format(**fields)
+            rel_path = filename
+        if body_lines:
+            content += "\n" + "".join(rng.choices(notes, k=randint(0, body_lines)))
+        yield rel_path, content
+
+
+def _write_batch(base_dir, batch):
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    for rel_path, content in batch:
+        fd = os.open(os.path.join(base_dir, rel_path), flags, 0o644)
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+    return len(batch)
+
+
+def write_tasks(base_dir, tasks, workers=8):
+    """Write (relative path, content) pairs under base_dir in batches on a thread pool.
+
+    Generation stays on the caller's thread (so a seeded rng stays deterministic);
+    only the file writes, which release the GIL, run in parallel.
+    """
+    written = 0
+    made = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        batch = []
+        for rel_path, content in tasks:
+            folder = os.path.dirname(rel_path)
+            if folder not in made:
+                os.makedirs(os.path.join(base_dir, folder), exist_ok=True)
+                made.add(folder)
+            batch.append((rel_path, content))
+            if len(batch) == BATCH_SIZE:
+                pending.append(pool.submit(_write_batch, base_dir, batch))
+                batch = []
+        if batch:
+            pending.append(pool.submit(_write_batch, base_dir, batch))
+        for future in pending:
+            written += future.result()
+    return written
+
 
 @click.command()
 @click.option("--count", "count", type=int, default=5, show_default=True, help="Number of tasks to generate.")
 @click.option("--clean/--no-clean", default=False, show_default=True, help="Clean tasks directory before seeding.")
 @click.option("--start-date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Base start date (defaults to today).")
 @click.option("--span-days", type=int, default=30, show_default=True, help="Span of days forward for random due dates.")
+@click.option("--added-days", type=int, default=0, show_default=True, help="Spread Date Added over this many days before the start date.")
 @click.option("--tags", type=str, default="demo,seed", show_default=True, help="Comma separated default tags.")
+@click.option("--tag-vocab", type=int, default=0, show_default=True, help="Draw tags from a Zipf-distributed vocabulary of this size (0 = use --tags).")
+@click.option("--zipf-s", type=float, default=1.1, show_default=True, help="Zipf exponent for the tag vocabulary.")
+@click.option("--max-tags", type=int, default=3, show_default=True, help="Maximum tags per task with --tag-vocab.")
+@click.option("--desc-words", type=(int, int), default=(3, 12), show_default=True, help="Min and max words per description.")
+@click.option("--body-lines", type=int, default=0, show_default=True, help="Add up to this many lines of notes below the header.")
+@click.option("--folders", type=int, default=0, show_default=True, help="Spread tasks over N per-list subfolders (as sync --folders does).")
+@click.option("--seed", type=int, default=None, help="Random seed; with --start-date the output is reproducible.")
+@click.option("--workers", type=int, default=8, show_default=True, help="Threads used to write files.")
 @click.option("--prefix", type=str, default="Seed Task", show_default=True, help="Name prefix for tasks.")
 @click.option("--random-priority/--fixed-priority", default=True, show_default=True, help="Randomize priority scores (else fixed at 10).")
 @click.option("--status", type=click.Choice(STATUSES), default="To Do", show_default=True, help="Default status to assign.")
@@ -23,54 +144,55 @@ TEMPLATE = """**Name:** {name}\n\n**Description:** {description}\n\n**Priority S
 @click.option("--gantt-wait", is_flag=True, help="With --open, keep process alive waiting for Enter.")
 @click.option("--due-prob", type=float, default=0.9, show_default=True, help="Probability a task has a due date.")
 @click.option("--dry-run", is_flag=True, help="Show what would be created without writing files.")
-def seed_tasks(count, clean, start_date, span_days, tags, prefix, random_priority, status, open_chart, gantt_wait, due_prob, dry_run):
+def seed_tasks(count, clean, start_date, span_days, added_days, tags, tag_vocab, zipf_s, max_tags, desc_words, body_lines,
+               folders, seed, workers, prefix, random_priority, status, open_chart, gantt_wait, due_prob, dry_run):
     """Seed the tasks directory with sample tasks for testing/demo."""
     ensure_dirs()
+    tasks_dir = CONFIG["directories"]["tasks_dir"]
     if clean:
-        for f in os.listdir(TASKS_DIR):
-            os.remove(os.path.join(TASKS_DIR, f))
+        for entry in os.scandir(tasks_dir):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
         click.echo("Cleaned existing tasks.")
 
-    base = start_date.date() if start_date else datetime.now().date()
-    created = []
-    for i in range(1, count + 1):
-        name = f"{prefix} {i}"
-        priority = random.randint(1, 25) if random_priority else 10
-        if random.random() < due_prob:
-            due = (base + timedelta(days=random.randint(1, span_days))).strftime("%Y-%m-%d")
-        else:
-            due = "No due date"
-        date_added = datetime.now().isoformat()
-        description = f"Autogenerated seed task {i}."
-        filename = f"{datetime.now().strftime('%Y-%m-%dT%H-%M-%S')}_{i}.md"
-        content = TEMPLATE.format(
-            name=name,
-            description=description,
-            priority=priority,
-            due=due,
-            tags=tags,
-            date_added=date_added,
-            status=status,
-        )
-        if dry_run:
-            click.echo(f"[DRY] Would create {filename}: {name} (priority {priority})")
-        else:
-            with open(os.path.join(TASKS_DIR, filename), "w", encoding="utf-8") as f:
-                f.write(content)
-            created.append(filename)
-    if not dry_run:
-        click.echo(f"Created {len(created)} task file(s).")
-        if open_chart and created:
-            try:
-                from priority_manager.commands.gantt import gantt as gantt_cmd
-                from click.testing import CliRunner
-                runner = CliRunner()
-                args = ["--no-open"]
-                if gantt_wait:
-                    args.append("--wait")
-                runner.invoke(gantt_cmd, args)
-            except Exception as e:
-                click.secho(f"Failed to open gantt: {e}", fg="red")
+    tasks = generate_tasks(
+        count,
+        random.Random(seed),
+        base=start_date.date() if start_date else None,
+        span_days=span_days,
+        added_days=added_days,
+        tags=tags,
+        tag_vocab=tag_vocab,
+        zipf_s=zipf_s,
+        max_tags=max_tags,
+        desc_words=desc_words,
+        body_lines=body_lines,
+        folders=folders,
+        prefix=prefix,
+        random_priority=random_priority,
+        status=status,
+        due_prob=due_prob,
+    )
+    if dry_run:
+        for rel_path, content in tasks:
+            click.echo(f"[DRY] Would create {rel_path}: {content.splitlines()[0][len('**Name:** '):]}")
+        return
+
+    created = write_tasks(tasks_dir, tasks, workers=workers)
+    click.echo(f"Created {created} task file(s).")
+    if open_chart and created:
+        try:
+            from priority_manager.commands.gantt import gantt as gantt_cmd
+            from click.testing import CliRunner
+            runner = CliRunner()
+            args = ["--no-open"]
+            if gantt_wait:
+                args.append("--wait")
+            runner.invoke(gantt_cmd, args)
+        except Exception as e:
+            click.secho(f"Failed to open gantt: {e}", fg="red")
 
 if __name__ == "__main__":
     seed_tasks()
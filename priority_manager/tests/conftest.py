@@ -15,6 +15,69 @@ def reset_config_dirs():
     CONFIG['directories']['archive_dir'] = ORIGINAL_ARCHIVE_DIR
     yield
 
+@pytest.fixture(autouse=True)
+def isolate_action_log(tmp_path, monkeypatch):
+    # Keep the action log (and token cache) of each test out of the package folder
+    monkeypatch.setenv('PRIORITY_MANAGER_HOME', str(tmp_path / 'home'))
+    yield
+    from priority_manager.utils.logger import flush_log
+    flush_log()
+
+# Header lines write_task knows, in the order add writes them
+TASK_FIELDS = {
+    'name': 'Name',
+    'list': 'List',
+    'description': 'Description',
+    'priority': 'Priority Score',
+    'due': 'Due Date',
+    'tags': 'Tags',
+    'added': 'Date Added',
+    'status': 'Status',
+}
+
+def task_text(name='Task', priority=1, status='To Do', body=None, **fields):
+    """Markdown for a task file; optional header fields are only written when given."""
+    values = dict(fields, name=name, priority=priority, status=status)
+    unknown = set(values) - set(TASK_FIELDS)
+    if unknown:
+        raise TypeError(f"unknown task fields: {sorted(unknown)}")
+    lines = [f"**{label}:** {values[key]}" for key, label in TASK_FIELDS.items() if key in values]
+    if body is not None:
+        lines.append(body)
+    return "\n\n".join(lines) + "\n"
+
+@pytest.fixture
+def write_task():
+    """write_task(path, **fields): write a task file (creating its folder) and return the text."""
+    def write(path, **fields):
+        text = task_text(**fields)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        return text
+    return write
+
+@pytest.fixture
+def tasks_root(tmp_path):
+    """An empty tasks dir under tmp_path, with CONFIG pointed at it (archive dir next to it)."""
+    root = tmp_path / 'tasks'
+    root.mkdir()
+    CONFIG['directories']['tasks_dir'] = str(root)
+    CONFIG['directories']['archive_dir'] = str(tmp_path / 'archive')
+    return root
+
+@pytest.fixture
+def graph(monkeypatch):
+    """A running local mock Graph server with ms_todo pointed at it and a dummy token configured."""
+    from priority_manager.utils import graph_http, ms_todo
+    from .mock_graph import MockGraph
+    graph_http.reset()
+    server = MockGraph().start()
+    monkeypatch.setattr(ms_todo, "GRAPH_API_BASE", server.base_url)
+    monkeypatch.delenv("MS_TODO_TOKEN", raising=False)
+    monkeypatch.setitem(CONFIG.setdefault("ms_todo", {}), "token", "TEST_TOKEN")
+    yield server
+    server.stop()
+
 @pytest.fixture(scope="function")
 def setup_dirs():
     """Set up clean tasks and archive directories for each test."""
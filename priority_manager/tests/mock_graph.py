@@ -0,0 +1,228 @@
+"""Minimal local stand-in for the Microsoft Graph To Do endpoints used by sync.
+
+Serves real HTTP on 127.0.0.1 so the requests-based client code runs unchanged
+(point ms_todo.GRAPH_API_BASE at MockGraph.base_url). State is plain Python:
+``lists`` and ``tasks`` (list id -> task dicts); every request is appended to
+``calls`` as (method, path). ``changes`` (list id -> task ids in the order they
+were touched) backs the delta queries: a delta token is a position in it.
+``throttle()`` and ``throttle_items()`` make the next requests (or batch
+sub-requests) answer 429 with a Retry-After header.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+BATCH_LIMIT = 20
+
+
+class MockGraph:
+    def __init__(self):
+        self.lists = []
+        self.tasks = {}
+        self.changes = {}
+        self.expired_before = 0  # delta tokens below this answer 410 Gone
+        self._throttled = []  # (status, retry_after) answers queued for the next requests
+        self._throttled_items = []  # same for batch sub-requests
+        self.calls = []
+        self.fail_titles = set()  # creating a task with one of these titles answers 400
+        self.delay = 0.0  # seconds each HTTP request takes
+        self.page_size = 100  # server-side cap on $top; longer collections get @odata.nextLink
+        self.in_flight = self.max_in_flight = 0
+        self._ids = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    # -- state helpers -----------------------------------------------------
+    def _new_id(self, prefix):
+        self._ids += 1
+        return f"{prefix}{self._ids}"
+
+    def add_list(self, name):
+        lst = {"id": self._new_id("L"), "displayName": name}
+        self.lists.append(lst)
+        self.tasks[lst["id"]] = []
+        self.changes[lst["id"]] = []
+        return lst["id"]
+
+    def _touch(self, list_id, task):
+        self.changes[list_id].append(task["id"])
+        version = len(self.changes[list_id])
+        task["lastModifiedDateTime"] = f"2025-01-01T00:00:{version % 60:02d}.{version:07d}Z"
+        task["@odata.etag"] = f'W/"{task["id"]}-{version}"'
+
+    def add_task(self, list_id, title, **fields):
+        task = {"id": self._new_id("T"), "title": title, **fields}
+        self.tasks[list_id].append(task)
+        self._touch(list_id, task)
+        return task
+
+    def update_task(self, list_id, task_id, **fields):
+        task = next(t for t in self.tasks[list_id] if t["id"] == task_id)
+        task.update(fields)
+        self._touch(list_id, task)
+        return task
+
+    def remove_task(self, list_id, task_id):
+        self.tasks[list_id] = [t for t in self.tasks[list_id] if t["id"] != task_id]
+        self.changes[list_id].append(task_id)
+
+    def throttle(self, count, retry_after="1", status=429):
+        """Answer the next count requests with status and a Retry-After header (None for none)."""
+        with self._lock:
+            self._throttled.extend([(status, retry_after)] * count)
+
+    def throttle_items(self, count, retry_after="1", status=429):
+        """Like throttle() for the next count sub-requests inside $batch requests."""
+        with self._lock:
+            self._throttled_items.extend([(status, retry_after)] * count)
+
+    @staticmethod
+    def _throttle_answer(status, retry_after):
+        headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+        return status, {"error": {"code": "TooManyRequests", "message": "Throttled"}}, headers
+
+    # -- request handling --------------------------------------------------
+    def handle(self, method, url, body=None):
+        """Return (status, JSON body, headers) for one Graph request (url relative to /v1.0)."""
+        with self._lock:
+            self.calls.append((method, urlsplit(url).path))
+            throttled = self._throttled.pop(0) if self._throttled else None
+        if throttled is not None:
+            return self._throttle_answer(*throttled)
+        return (*self._dispatch(method, url, body), {})
+
+    def _dispatch(self, method, url, body):
+        path = urlsplit(url).path
+        if method == "POST" and path == "/$batch":
+            return self._batch(body or {})
+        if path == "/me/todo/lists":
+            if method == "GET":
+                return 200, self._page(self.lists, url)
+            if method == "POST":
+                with self._lock:
+                    list_id = self.add_list(body["displayName"])
+                return 201, {"id": list_id, "displayName": body["displayName"]}
+        match = re.fullmatch(r"/me/todo/lists/([^/]+)/tasks/delta", path)
+        if match and match.group(1) in self.tasks and method == "GET":
+            return self._delta(match.group(1), url)
+        match = re.fullmatch(r"/me/todo/lists/([^/]+)/tasks", path)
+        if match and match.group(1) in self.tasks:
+            list_id = match.group(1)
+            if method == "GET":
+                return 200, self._page(self.tasks[list_id], url)
+            if method == "POST":
+                if body.get("title") in self.fail_titles:
+                    return 400, {"error": {"code": "invalidRequest", "message": "Invalid title"}}
+                with self._lock:
+                    task = self.add_task(list_id, **body)
+                return 201, task
+        return 404, {"error": {"code": "itemNotFound", "message": f"{method} {path}"}}
+
+    def _delta(self, list_id, url):
+        """Tasks touched since $deltatoken (all tasks without one); removed ones as @removed stubs."""
+        query = parse_qs(urlsplit(url).query)
+        with self._lock:
+            changes = list(self.changes[list_id])
+            current = {t["id"]: t for t in self.tasks[list_id]}
+        if "$deltatoken" not in query:
+            return 200, self._page(list(current.values()), url, delta_token=len(changes))
+        since = int(query["$deltatoken"][0])
+        if since < self.expired_before:
+            return 410, {"error": {"code": "syncStateNotFound", "message": "Delta token expired"}}
+        # Remember the query of the first page: later pages must see the same change set
+        if "$skiptoken" in query:
+            changes = changes[:int(query["$until"][0])]
+        touched = list(dict.fromkeys(changes[since:]))
+        items = [current.get(tid, {"id": tid, "@removed": {"reason": "deleted"}}) for tid in touched]
+        return 200, self._page(items, url, delta_token=len(changes), extra={"$until": len(changes)})
+
+    def _page(self, items, url, delta_token=None, extra=None):
+        """One page of a collection, honouring $top, $select and the $skiptoken of nextLink.
+
+        With delta_token the last page carries @odata.deltaLink instead of ending silently.
+        """
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        top = min(int(query.get("$top", [self.page_size])[0]), self.page_size)
+        skip = int(query.get("$skiptoken", [0])[0])
+        page = items[skip:skip + top]
+        if "$select" in query:
+            fields = query["$select"][0].split(",")
+            page = [{k: item[k] for k in fields + ["@removed", "@odata.etag"] if k in item} for item in page]
+        else:
+            page = [dict(item) for item in page]
+        body = {"value": page}
+        if skip + top < len(items):
+            params = {k: v[0] for k, v in query.items()}
+            params.update(extra or {})
+            params.update({"$top": top, "$skiptoken": skip + top})
+            body["@odata.nextLink"] = f"{self.base_url}{parts.path}?{urlencode(params)}"
+        elif delta_token is not None:
+            body["@odata.deltaLink"] = f"{self.base_url}{parts.path}?{urlencode({'$deltatoken': delta_token})}"
+        return body
+
+    def _batch(self, body):
+        requests = body.get("requests", [])
+        if len(requests) > BATCH_LIMIT:
+            return 400, {"error": {"code": "BadRequest", "message": "Too many requests in batch"}}
+        responses = []
+        for request in requests:
+            with self._lock:
+                throttled = self._throttled_items.pop(0) if self._throttled_items else None
+            if throttled is not None:
+                status, payload, headers = self._throttle_answer(*throttled)
+                responses.append({"id": request["id"], "status": status, "headers": headers, "body": payload})
+                continue
+            status, payload = self._dispatch(request["method"], request["url"], request.get("body"))
+            responses.append({"id": request["id"], "status": status, "body": payload})
+        # Graph does not promise any order
+        return 200, {"responses": responses[::-1]}
+
+    # -- server ------------------------------------------------------------
+    def start(self):
+        graph = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                path = self.path[len("/v1.0"):] if self.path.startswith("/v1.0") else self.path
+                with graph._lock:
+                    graph.in_flight += 1
+                    graph.max_in_flight = max(graph.max_in_flight, graph.in_flight)
+                try:
+                    time.sleep(graph.delay)
+                    status, payload, headers = graph.handle(self.command, path, body)
+                finally:
+                    with graph._lock:
+                        graph.in_flight -= 1
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1.0"
@@ -0,0 +1,90 @@
+import json
+from click.testing import CliRunner
+from priority_manager.utils.logger import flush_log
+from priority_manager.commands.add import add
+from priority_manager.utils import helpers
+from priority_manager.utils.config import CONFIG
+from priority_manager.utils.index import TaskIndex
+
+
+def _tasks():
+    return {t['Task Name']: t for t in helpers.files_to_tasks(recursive=True)}
+
+
+def test_add_from_jsonl_stdin_with_folders_and_collisions(tasks_root, tmp_path, monkeypatch):
+    root = tasks_root
+    monkeypatch.chdir(tmp_path)
+    records = [
+        {"name": "Same title", "priority": 5, "tags": ["a", "b"]},
+        {"name": "Same title", "status": "In Progress"},
+        {"title": "Work/../Deploy v2!", "due": "2025-01-31"},
+        {"name": "Filed", "folder": "Ops/Night shift"},
+        {"description": "no name"},
+        {"name": "Bad status", "status": "Someday"},
+    ]
+    data = "\n".join(json.dumps(r) for r in records) + "\n"
+    result = CliRunner().invoke(add, ['--from-file', '-'], input=data)
+    assert result.exit_code == 0, result.output
+    assert 'Added 4 task(s) from stdin. Skipped 2 invalid record(s).' in result.output
+
+    tasks = _tasks()
+    assert len(list((root).glob('*Same_title*.md'))) == 2
+    assert tasks['Deploy v2!']['Path'].startswith('Work/')
+    assert tasks['Deploy v2!']['Due Date'] == '2025-01-31'
+    assert tasks['Filed']['Path'].startswith('Ops/Night shift/')
+    assert {t['Tags'] for n, t in tasks.items() if n == 'Same title'} <= {'a, b', ''}
+    flush_log()
+    with open(tmp_path / 'home' / 'actions.jsonl', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert sum(r['action'] == 'add' for r in records) == 4
+    assert records[-1]['action'] == 'add-from-file' and records[-1]['count'] == 4
+
+
+def test_add_from_csv_and_yaml_update_index_in_one_batch(tasks_root, tmp_path, monkeypatch):
+    root = tasks_root
+    monkeypatch.chdir(tmp_path)
+    (root / 'existing.md').write_text('**Name:** Existing\n\n**Priority Score:** 1\n\n**Status:** To Do\n', encoding='utf-8')
+    helpers.files_to_tasks()  # build the index so the batch update has one to refresh
+    (tmp_path / 'in.csv').write_text('name,priority,tags,status\nCSV one,3,"x, y",To Do\nCSV two,7,,Blocked\n', encoding='utf-8')
+    (tmp_path / 'in.yaml').write_text('- name: YAML one\n  priority: 9\n---\nname: YAML two\n', encoding='utf-8')
+
+    saves = []
+    original = TaskIndex.save
+    monkeypatch.setattr(TaskIndex, 'save', lambda self: (saves.append(1), original(self)))
+    runner = CliRunner()
+    assert 'Added 2 task(s)' in runner.invoke(add, ['--from-file', str(tmp_path / 'in.csv')]).output
+    assert 'Added 2 task(s)' in runner.invoke(add, ['--from-file', str(tmp_path / 'in.yaml')]).output
+    assert len(saves) == 2
+
+    index = TaskIndex.load(str(root))
+    assert len(index.entries) == 5
+    tasks = _tasks()
+    assert tasks['CSV two']['Status'] == 'Blocked'
+    assert tasks['YAML one']['Priority Score'] == 9
+    assert tasks['YAML two']['Priority Score'] == CONFIG['defaults']['priority']
+
+
+def test_add_requires_name_or_file(tasks_root):
+    result = CliRunner().invoke(add, [])
+    assert result.exit_code != 0
+    assert 'TASK_NAME' in result.output
+
+
+def test_malformed_records_do_not_abort_the_batch(tasks_root, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    helpers.files_to_tasks()  # build the index the batch refreshes
+    (tmp_path / 'in.jsonl').write_text('{"name": "First"}\n{"name": oops}\n{"name": "Third"}\n', encoding='utf-8')
+    result = CliRunner().invoke(add, ['--from-file', str(tmp_path / 'in.jsonl')])
+    assert result.exit_code == 0, result.output
+    assert 'Skipped record 2: invalid JSON' in result.output
+    assert 'Added 2 task(s)' in result.output
+    assert sorted(_tasks()) == ['First', 'Third']
+
+    # A YAML stream that breaks off keeps (and indexes) the tasks read before it
+    (tmp_path / 'in.yaml').write_text('name: Fourth\n---\nname: [unclosed\n', encoding='utf-8')
+    result = CliRunner().invoke(add, ['--from-file', str(tmp_path / 'in.yaml')])
+    assert result.exit_code == 1
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+    assert 'Added 1 task(s)' in result.output
+    assert 'Stopped reading after record 1: invalid YAML' in result.output
+    assert len(TaskIndex.load(str(tasks_root)).entries) == 3
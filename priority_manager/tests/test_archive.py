@@ -11,7 +11,8 @@ def test_archive_task(setup_dirs, sample_task_file):
     result = runner.invoke(archive, input="1\n")
     assert result.exit_code == 0
     assert "Task archived:" in result.output
-    assert os.listdir(TASKS_DIR) == []
+    # Only hidden sidecars (metadata index) may remain
+    assert [f for f in os.listdir(TASKS_DIR) if not f.startswith('.')] == []
     archived_files = os.listdir(ARCHIVE_DIR)
     assert len(archived_files) == 1
     assert archived_files[0].endswith('.md')
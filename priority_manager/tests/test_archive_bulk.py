@@ -0,0 +1,55 @@
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.archive import archive
+from priority_manager.utils import helpers
+from priority_manager.utils.index import TaskIndex
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    files = {
+        'done.md': ('Done top', 'home', '2020-01-01T00:00:00', 'Complete'),
+        'Work/Q1/shipped.md': ('Shipped', 'work', '2020-02-01T00:00:00', 'Complete'),
+        'Work/recent.md': ('Recent', 'work', '2999-01-01T00:00:00', 'Complete'),
+        'Work/open.md': ('Open', 'work', '2020-01-01T00:00:00', 'To Do'),
+    }
+    for rel, (name, tags, added, status) in files.items():
+        write_task(tasks_root / rel, name=name, tags=tags, added=added, status=status)
+    return tasks_root
+
+
+def test_archive_by_status_and_age_preserves_layout(root, tmp_path, monkeypatch):
+    archive_root = tmp_path / 'archive'
+    monkeypatch.chdir(tmp_path)
+    helpers.files_to_tasks(recursive=True)  # build the index
+    runner = CliRunner()
+
+    result = runner.invoke(archive, ['--status', 'complete', '--older-than', '30d', '--dry-run'])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        'Would archive: done.md', 'Would archive: Work/Q1/shipped.md', 'Would archive 2 task(s).']
+    assert (root / 'done.md').exists()
+
+    result = runner.invoke(archive, ['--status', 'Complete', '--older-than', '2021-01-01'])
+    assert result.exit_code == 0, result.output
+    assert 'Archived 2 task(s).' in result.output
+    assert (archive_root / 'done.md').exists()
+    assert (archive_root / 'Work' / 'Q1' / 'shipped.md').exists()
+    assert not (root / 'Work' / 'Q1' / 'shipped.md').exists()
+    assert (root / 'Work' / 'recent.md').exists() and (root / 'Work' / 'open.md').exists()
+    assert sorted(TaskIndex.load(str(root)).entries) == ['Work/open.md', 'Work/recent.md']
+
+
+def test_archive_by_tag_and_where_does_not_overwrite(root, tmp_path):
+    archive_root = tmp_path / 'archive'
+    (archive_root / 'Work').mkdir(parents=True)
+    (archive_root / 'Work' / 'open.md').write_text('older copy', encoding='utf-8')
+    result = CliRunner().invoke(archive, ['--tag', 'work', '--where', 'status!=Complete'])
+    assert result.exit_code == 0, result.output
+    assert 'Archived 1 task(s).' in result.output
+    assert (archive_root / 'Work' / 'open.md').read_text(encoding='utf-8') == 'older copy'
+    assert 'Open' in (archive_root / 'Work' / 'open-1.md').read_text(encoding='utf-8')
+
+
+def test_archive_bad_age(root):
+    assert CliRunner().invoke(archive, ['--older-than', 'soon']).exit_code != 0
@@ -0,0 +1,94 @@
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.edit import edit
+from priority_manager.utils import helpers
+from priority_manager.utils.header_patch import patch_header
+from priority_manager.utils.query import parse_where
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    def write(rel, name, priority, day, tags, status='To Do'):
+        write_task(tasks_root / rel, name=name, list='Inbox', description='Something', priority=priority,
+                   due=f'2025-01-{day:02d}', tags=tags, added='2024-12-01T09:00:00', status=status,
+                   body='Body line that must survive.')
+    write('a.md', 'Alpha', 3, 5, 'work')
+    write('Work/b.md', 'Beta', 12, 20, 'work, urgent')
+    write('c.md', 'Gamma', 8, 9, 'home', status='Blocked')
+    return tasks_root
+
+
+def test_parse_where_conditions(root):
+    tasks = {t['Task Name']: t for t in helpers.files_to_tasks(recursive=True)}
+
+    def names(*conditions):
+        predicate = parse_where(conditions)
+        return sorted(n for n, t in tasks.items() if predicate(t))
+
+    assert names('tag=work') == ['Alpha', 'Beta']
+    assert names('tag=work', 'tag!=urgent') == ['Alpha']
+    assert names('priority>=8') == ['Beta', 'Gamma']
+    assert names('status=blocked') == ['Gamma']
+    assert names('due<2025-01-10') == ['Alpha', 'Gamma']
+    assert names('path=work/*') == ['Beta']
+    assert names('name~alp') == ['Alpha']
+
+
+def test_bulk_edit_patches_only_header_lines(root, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    before = {p: p.read_text(encoding='utf-8') for p in root.rglob('*.md')}
+    runner = CliRunner()
+
+    result = runner.invoke(edit, ['--where', 'tag=work', '--set', 'status=complete', '--set', 'tags+=done', '--dry-run'])
+    assert result.exit_code == 0, result.output
+    assert "Would update Work/b.md: Status: 'To Do' -> 'Complete'; Tags: 'work, urgent' -> 'work, urgent, done'" in result.output
+    assert 'Would update 2 of 2 matching task(s).' in result.output
+    assert {p: p.read_text(encoding='utf-8') for p in root.rglob('*.md')} == before
+
+    result = runner.invoke(edit, ['--where', 'tag=work', '--set', 'status=complete', '--set', 'tags+=done'])
+    assert result.exit_code == 0, result.output
+    assert 'Updated 2 of 2 matching task(s).' in result.output
+    after = (root / 'Work' / 'b.md').read_text(encoding='utf-8')
+    assert '**Status:** Complete' in after
+    assert '**Tags:** work, urgent, done' in after
+    assert '**List:** Inbox' in after and '**Date Added:** 2024-12-01T09:00:00' in after
+    assert '**Date Edited:** ' in after
+    assert after.endswith('Body line that must survive.\n')
+    assert (root / 'c.md').read_text(encoding='utf-8') == before[root / 'c.md']
+    # Only the changed lines (plus the inserted Date Edited line) differ
+    old_lines, new_lines = before[root / 'Work' / 'b.md'].splitlines(), after.splitlines()
+    assert [l for l in new_lines if l not in old_lines and not l.startswith('**Date Edited:**')] == [
+        '**Tags:** work, urgent, done', '**Status:** Complete']
+
+    tasks = {t['Task Name']: t for t in helpers.files_to_tasks(recursive=True)}
+    assert tasks['Alpha']['Status'] == 'Complete'
+
+
+def test_bulk_edit_rejects_bad_input(root):
+    runner = CliRunner()
+    assert runner.invoke(edit, ['--where', 'tag=work']).exit_code != 0
+    assert runner.invoke(edit, ['--where', 'colour=red', '--set', 'status=Complete']).exit_code != 0
+    assert runner.invoke(edit, ['--where', 'tag=work', '--set', 'status=Someday']).exit_code != 0
+    assert runner.invoke(edit, ['--where', 'tag=work', '--set', 'priority+=1']).exit_code != 0
+
+
+def test_patch_header_inserts_missing_fields_and_keeps_crlf(tmp_path):
+    path = tmp_path / 't.md'
+    path.write_bytes(b"# Heading\r\n\r\n**Priority Score:** 1\r\n\r\n**Status:** To Do\r\n\r\nNotes\r\n")
+    changes = patch_header(str(path), {'Name': 'Named', 'Tags': 'x'}, edited='2025-01-01T00:00:00')
+    assert changes == {'Name': (None, 'Named'), 'Tags': (None, 'x')}
+    assert path.read_bytes() == (
+        b"# Heading\r\n\r\n**Name:** Named\r\n\r\n**Priority Score:** 1\r\n\r\n**Tags:** x\r\n\r\n"
+        b"**Date Edited:** 2025-01-01T00:00:00\r\n\r\n**Status:** To Do\r\n\r\nNotes\r\n"
+    )
+
+
+def test_interactive_edit_keeps_list_date_added_and_body(root):
+    # Interactive edit lists top-level tasks only, so row 1 is Gamma (priority 8)
+    result = CliRunner().invoke(edit, input="1\nGamma renamed\n\n\n\nIn Progress\nn\n")
+    assert result.exit_code == 0, result.output
+    content = (root / 'c.md').read_text(encoding='utf-8')
+    assert '**Name:** Gamma renamed' in content
+    assert '**Status:** In Progress' in content
+    assert '**List:** Inbox' in content and '**Date Added:** 2024-12-01T09:00:00' in content
+    assert content.endswith('Body line that must survive.\n')
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+import pytest
+import yaml
+from click.testing import CliRunner
+from priority_manager.commands.export import export_tasks
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    for rel, name, priority in [('top.md', 'Top task', 5), ('Inbox/nested.md', 'Nested task', 3)]:
+        write_task(tasks_root / rel, name=name, list='Work', priority=priority, tags='a, b', body='Body text')
+    return tasks_root
+
+
+def test_export_ndjson_to_stdout_recursive(root):
+    result = CliRunner().invoke(export_tasks, ['ndjson', '--output', '-', '--recursive'])
+    assert result.exit_code == 0
+    records = sorted((json.loads(line) for line in result.output.splitlines()), key=lambda r: r['Path'])
+    assert [r['Path'] for r in records] == ['Inbox/nested.md', 'top.md']
+    assert records[1]['Task Name'] == 'Top task'
+    assert records[1]['Priority Score'] == 5
+    assert records[1]['List'] == 'Work'
+
+
+def test_export_csv_top_level_only(root):
+    result = CliRunner().invoke(export_tasks, ['csv', '--output', '-'])
+    assert result.exit_code == 0
+    rows = list(csv.DictReader(io.StringIO(result.output)))
+    assert [r['Task Name'] for r in rows] == ['Top task']
+
+
+def test_export_json_and_yaml_files(root, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    assert runner.invoke(export_tasks, ['json', '--recursive']).exit_code == 0
+    assert runner.invoke(export_tasks, ['yaml', '--recursive']).exit_code == 0
+    with open(tmp_path / 'tasks_export.json', encoding='utf-8') as f:
+        from_json = json.load(f)
+    with open(tmp_path / 'tasks_export.yaml', encoding='utf-8') as f:
+        from_yaml = yaml.safe_load(f)
+    assert len(from_json) == 2
+    assert from_json == from_yaml
+
+
+def test_export_empty(tasks_root):
+    result = CliRunner().invoke(export_tasks, ['json', '--output', '-'])
+    assert 'No tasks found to export.' in result.output
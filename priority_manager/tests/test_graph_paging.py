@@ -0,0 +1,44 @@
+import time
+import requests
+from click.testing import CliRunner
+from priority_manager.commands.todo import sync_tasks
+from priority_manager.utils import ms_todo
+
+
+def test_get_tasks_follows_next_link_with_select(graph):
+    list_id = graph.add_list('Big')
+    for n in range(250):
+        graph.add_task(list_id, f'Task {n}', body={'content': 'x' * 500}, importance='normal')
+    graph.page_size = 100
+    with requests.Session() as session:
+        tasks = list(ms_todo.get_tasks(session, 'TOKEN', list_id))
+    assert [t['title'] for t in tasks] == [f'Task {n}' for n in range(250)]
+    assert all(set(t) - {'@odata.etag'} <= set(ms_todo.TASK_FIELDS.split(',')) for t in tasks)
+    assert graph.calls == [('GET', f'/me/todo/lists/{list_id}/tasks')] * 3
+
+
+def test_next_page_is_prefetched_while_the_first_is_processed(graph):
+    list_id = graph.add_list('Big')
+    for n in range(30):
+        graph.add_task(list_id, f'Task {n}')
+    graph.page_size = 10
+    with requests.Session() as session:
+        tasks = ms_todo.get_tasks(session, 'TOKEN', list_id)
+        first = next(tasks)
+        deadline = time.time() + 2
+        while len(graph.calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert first['title'] == 'Task 0'
+        assert len(graph.calls) == 2  # page two requested before page one was consumed
+        assert len(list(tasks)) == 29
+
+
+def test_pull_is_not_truncated_at_the_first_page(graph, tasks_root):
+    list_id = graph.add_list('Priority Manager')
+    for n in range(25):
+        graph.add_task(list_id, f'Remote {n}')
+    graph.page_size = 10
+    result = CliRunner().invoke(sync_tasks, ['--pull'])
+    assert result.exit_code == 0, result.output
+    assert 'Pulled: 25' in result.output
+    assert len([f for f in tasks_root.iterdir() if f.suffix == '.md']) == 25
@@ -0,0 +1,83 @@
+import email.utils
+import time
+import pytest
+import requests
+from click.testing import CliRunner
+from priority_manager.commands.todo import sync_tasks
+from priority_manager.utils import graph_http, ms_todo
+from priority_manager.utils.config import CONFIG
+from priority_manager.utils.graph_http import TokenBucket, retry_after
+
+
+@pytest.fixture
+def waits(monkeypatch):
+    """Record every wait instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(graph_http, '_sleep', recorded.append)
+    return recorded
+
+
+def test_throttled_requests_are_retried_after_retry_after(graph, waits):
+    list_id = graph.add_list('Storm')
+    graph.add_task(list_id, 'Survivor')
+    graph.throttle(3, retry_after='2')
+    with requests.Session() as session:
+        tasks = list(ms_todo.get_tasks(session, 'TOKEN', list_id))
+    assert [t['title'] for t in tasks] == ['Survivor']
+    assert graph.calls.count(('GET', f'/me/todo/lists/{list_id}/tasks')) == 4
+    stats = graph_http.STATS.snapshot()
+    assert stats['retries'] == 3 and stats['throttled'] == 3
+    assert sum(1 for w in waits if w >= 2) >= 3
+    assert stats['wait_seconds'] == pytest.approx(sum(waits))
+
+
+def test_retries_stop_after_the_configured_attempts(graph, waits, monkeypatch):
+    monkeypatch.setitem(CONFIG['ms_todo'], 'http', {'attempts': 3})
+    graph.throttle(10, retry_after=None, status=503)
+    with requests.Session() as session, pytest.raises(requests.HTTPError) as err:
+        list(ms_todo.get_lists(session, 'TOKEN'))
+    assert err.value.response.status_code == 503
+    assert len(graph.calls) == 3
+    # Without Retry-After the waits grow exponentially
+    assert waits[0] < waits[1]
+
+
+def test_push_survives_a_throttling_storm(graph, waits, tasks_root):
+    for n in range(45):
+        (tasks_root / f'task_{n:02d}.md').write_text(f'**Name:** Local {n}\n\n**Status:** To Do\n', encoding='utf-8')
+    graph.throttle(2, retry_after='1')
+    graph.throttle_items(25, retry_after='3')
+    res = CliRunner().invoke(sync_tasks, ['--push', '--verbose'])
+    assert res.exit_code == 0, res.output
+    assert 'Pushed: 45' in res.output
+    assert 'Failed' not in res.output
+    [list_id] = graph.tasks
+    titles = [t['title'] for t in graph.tasks[list_id]]
+    assert sorted(titles) == sorted(f'Local {n}' for n in range(45))
+    assert 'Pushing tasks: 45/45' in res.output
+    assert 'retries: 27' in res.output
+    assert max(waits) >= 3
+
+
+def test_token_bucket_slows_down_on_throttling_and_recovers(waits):
+    bucket = TokenBucket(rate=10, burst=2, min_rate=1)
+    assert bucket.acquire() == 0 and bucket.acquire() == 0
+    assert bucket.acquire() > 0  # burst spent: wait for the next token
+    bucket.throttled()
+    bucket.throttled()
+    assert bucket.rate == 2.5
+    for _ in range(3):
+        bucket.throttled()
+    assert bucket.rate == 1
+    for _ in range(100):
+        bucket.succeeded()
+    assert bucket.rate == 10
+    bucket.throttled(delay=5)
+    assert bucket.acquire() >= 4.9
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after({'Retry-After': '7'}) == 7
+    assert retry_after({}) is None
+    later = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= retry_after({'Retry-After': later}) <= 31
@@ -0,0 +1,66 @@
+import os
+import sys
+import threading
+from click.testing import CliRunner
+from priority_manager.commands.reindex import reindex
+from priority_manager.utils import helpers
+from priority_manager.utils.index import TaskIndex, index_path
+from priority_manager.utils.task import Task
+
+
+def test_index_serves_unchanged_files(tasks_root, write_task, monkeypatch):
+    write_task(tasks_root / 'a.md', name='Alpha', priority=3)
+    write_task(tasks_root / 'Sub' / 'b.md', name='Beta', priority=5)
+    first = helpers.files_to_tasks(recursive=True)
+    assert os.path.exists(index_path(str(tasks_root)))
+    assert set(TaskIndex.load(str(tasks_root)).entries) == {'a.md', 'Sub/b.md'}
+
+    def boom(path):
+        raise AssertionError(f"unexpected re-parse of {path}")
+    monkeypatch.setattr(helpers, 'get_task_details', boom)
+    second = helpers.files_to_tasks(recursive=True)
+    assert sorted(t['Task Name'] for t in second) == sorted(t['Task Name'] for t in first)
+
+
+def test_index_reparses_changed_and_drops_deleted(tasks_root, write_task):
+    write_task(tasks_root / 'a.md', name='Alpha', priority=3)
+    write_task(tasks_root / 'b.md', name='Beta', priority=5)
+    helpers.files_to_tasks()
+    write_task(tasks_root / 'a.md', name='Alpha Renamed', priority=30)
+    (tasks_root / 'b.md').unlink()
+    tasks = helpers.files_to_tasks()
+    assert [t['Task Name'] for t in tasks] == ['Alpha Renamed']
+    assert list(TaskIndex.load(str(tasks_root)).entries) == ['a.md']
+
+
+def test_reindex_command(tasks_root, write_task):
+    write_task(tasks_root / 'a.md', name='Alpha', priority=3)
+    write_task(tasks_root / 'Sub' / 'b.md', name='Beta', priority=5)
+    res = CliRunner().invoke(reindex)
+    assert res.exit_code == 0
+    assert 'Indexed 2 task(s)' in res.output
+    assert set(TaskIndex.load(str(tasks_root)).entries) == {'a.md', 'Sub/b.md'}
+
+
+def test_tag_map_stays_consistent_under_concurrent_stores(tmp_path):
+    index = TaskIndex(str(tmp_path))
+    st = os.stat(tmp_path)
+    keys = [f'k{n}.md' for n in range(4)]
+
+    def churn(offset):
+        # Retagging empties and recreates the same tags from every thread
+        key = keys[offset]
+        for round_ in range(2000):
+            tags = 'shared, a' if round_ % 2 else 'shared, b'
+            index.store(key, st, Task('T', 1, key, '', '', 'To Do', '', tags, '', ''))
+    threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert index.tags == {'shared': set(keys), 'a': set(keys)}
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+import click
+from click.utils import make_default_short_help
+from priority_manager.main import LAZY_COMMANDS, cli
+
+
+def test_help_lists_commands_without_importing_them():
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from priority_manager.main import cli\n"
+        "out = CliRunner().invoke(cli, ['--help']).output\n"
+        "assert all(name in out for name in %r), out\n"
+        "heavy = [m for m in ('plotly', 'requests', 'rich', 'tabulate', 'priority_manager.commands.todo') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    ) % (sorted(LAZY_COMMANDS),)
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_registry_help_matches_commands():
+    ctx = click.Context(cli)
+    for name, (_, short_help) in LAZY_COMMANDS.items():
+        command = cli.get_command(ctx, name)
+        assert command.name == name
+        assert make_default_short_help(short_help, 200) == command.get_short_help_str(200)
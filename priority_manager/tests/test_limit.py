@@ -0,0 +1,83 @@
+import os
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.ls import list_tasks
+from priority_manager.commands.search_filter import filter_tasks
+from priority_manager.utils import helpers, index
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    for i in range(12):
+        folder = tasks_root / 'Inbox' if i % 3 == 0 else tasks_root
+        write_task(folder / f't{i:02d}.md', name=f'Task {i}', priority=i, tags='work' if i % 2 == 0 else 'home')
+    return tasks_root
+
+
+def test_select_top_matches_full_sort(root):
+    tasks = helpers.files_to_tasks(recursive=True)
+    ranked = sorted(tasks, key=helpers.priority_sort_key)
+    assert helpers.select_top(tasks, 3) == ranked[:3]
+    assert helpers.select_top(tasks, 3, offset=4) == ranked[4:7]
+    assert helpers.select_top(tasks, offset=10) == ranked[10:]
+
+
+def test_read_top_uses_ordered_index_until_a_folder_changes(root, write_task, monkeypatch):
+    helpers.files_to_tasks(recursive=True)
+
+    top = index.read_top(str(root), 3, recursive=True)
+    assert [t['Priority Score'] for t in top] == [11, 10, 9]
+    assert top[0]['Path'] == 't11.md'
+
+    # The fast path must not touch the task files beyond the requested rows
+    monkeypatch.setattr(helpers, 'get_task_details', lambda path: (_ for _ in ()).throw(AssertionError(path)))
+    assert [t['Task Name'] for t in helpers.load_top_tasks(2, offset=1, recursive=True)] == ['Task 10', 'Task 9']
+    monkeypatch.undo()
+
+    # Adding a task changes the folder mtime, so the ordered copy is no longer trusted
+    new = root / 'Inbox' / 'urgent.md'
+    write_task(new, name='Urgent', priority=50, tags='work')
+    os.utime(root / 'Inbox', ns=(1, 1))
+    assert index.read_top(str(root), 3, recursive=True) is None
+    assert helpers.load_top_tasks(1, recursive=True)[0]['Task Name'] == 'Urgent'
+    # The fallback full scan refreshed the snapshot
+    assert index.read_top(str(root), 1, recursive=True)[0]['Path'] == 'Inbox/urgent.md'
+
+
+def test_read_top_detects_edited_file(root, write_task):
+    helpers.files_to_tasks(recursive=True)
+    write_task(root / 't11.md', name='Task 11', priority=0, tags='work', body='more')
+    assert index.read_top(str(root), 1, recursive=True) is None
+
+
+def test_ls_and_filter_limit_offset(root):
+    runner = CliRunner()
+    result = runner.invoke(list_tasks, ['--limit', '2', '--offset', '1'])
+    assert result.exit_code == 0
+    # Top-level files exist, so ls stays non-recursive and Inbox/t09.md is skipped
+    assert 'Task 10' in result.output and 'Task 8' in result.output
+    assert 'Task 11' not in result.output and 'Task 9' not in result.output
+
+    result = runner.invoke(filter_tasks, ['--tag', 'work', '--limit', '2', '--offset', '1'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        '2. t08.md - Priority Score: 8 - Tags: work',
+        '3. Inbox/t06.md - Priority Score: 6 - Tags: work',
+    ]
+
+
+def test_limit_sees_in_place_edit_of_a_low_ranked_task(tasks_root, write_task):
+    for i in range(5):
+        write_task(tasks_root / f't{i}.md', name=f'Task {i}', priority=i)
+    runner = CliRunner()
+    assert runner.invoke(list_tasks, []).exit_code == 0
+    folder_mtime = os.stat(tasks_root).st_mtime_ns
+    write_task(tasks_root / 't0.md', name='Task 0', priority=99)
+    assert os.stat(tasks_root).st_mtime_ns == folder_mtime  # only the file changed
+    assert index.changed_keys(str(tasks_root), recursive=False) == ['t0.md']
+
+    result = runner.invoke(list_tasks, ['--limit', '2'])
+    assert result.exit_code == 0, result.output
+    assert 'Task 0' in result.output and 'Task 4' in result.output
+    assert 'Task 3' not in result.output
+    assert index.changed_keys(str(tasks_root), recursive=False) == []
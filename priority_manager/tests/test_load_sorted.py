@@ -0,0 +1,44 @@
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.archive import archive
+from priority_manager.commands.edit import edit
+from priority_manager.utils import helpers
+from priority_manager.utils.config import CONFIG
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    write_task(tasks_root / 'a.md', name='Low', priority=1)
+    write_task(tasks_root / 'b.md', name='High', priority=20)
+    write_task(tasks_root / 'c.md', name='Mid', priority=7)
+    return tasks_root
+
+
+def test_load_sorted_tasks_parses_each_file_once(root, monkeypatch):
+    monkeypatch.setitem(CONFIG['index'], 'enabled', False)
+    calls = []
+    original = helpers.get_task_details
+
+    def counting(path):
+        calls.append(path)
+        return original(path)
+    monkeypatch.setattr(helpers, 'get_task_details', counting)
+    tasks = helpers.load_sorted_tasks()
+    assert [t['Task Name'] for t in tasks] == ['High', 'Mid', 'Low']
+    assert [t['Path'] for t in tasks] == ['b.md', 'c.md', 'a.md']
+    assert len(calls) == 3
+
+
+def test_edit_number_maps_to_displayed_row(root):
+    runner = CliRunner()
+    res = runner.invoke(edit, input="2\nMid Edited\n\n\n\nTo Do\nn\n")
+    assert res.exit_code == 0, res.output
+    assert 'Mid Edited' in (root / 'c.md').read_text(encoding='utf-8')
+
+
+def test_archive_number_maps_to_displayed_row(root, tmp_path):
+    res = CliRunner().invoke(archive, input="1\n")
+    assert res.exit_code == 0, res.output
+    assert 'Task archived: b.md' in res.output
+    assert not (root / 'b.md').exists()
+    assert (tmp_path / 'archive' / 'b.md').exists()
@@ -0,0 +1,55 @@
+import json
+import time
+from priority_manager.utils import logger
+from priority_manager.utils.config import CONFIG
+
+
+def _records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_buffered_structured_and_rotated(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, 'logging', {'dir': str(tmp_path / 'logs'), 'file': 'actions.jsonl', 'max_bytes': 400,
+                                            'backups': 2, 'buffer_records': 3, 'flush_seconds': 3600})
+    path = tmp_path / 'logs' / 'actions.jsonl'
+
+    logger.log_event('edit', path='Work/a.md', old={'Status': 'To Do'}, new={'Status': 'Complete'})
+    logger.log_action('Added task: legacy call')
+    assert not path.exists()  # still buffered
+    with logger.timed('bulk-edit', where=['tag=work']) as summary:
+        summary['count'] = 1
+    records = _records(path)
+    assert [r['action'] for r in records] == ['edit', 'message', 'bulk-edit']
+    assert records[0]['path'] == 'Work/a.md' and records[0]['new'] == {'Status': 'Complete'}
+    assert records[1]['message'] == 'Added task: legacy call'
+    assert records[2]['count'] == 1 and 'duration_ms' in records[2]
+
+    for n in range(12):
+        logger.log_event('add', path=f'task-{n}.md')
+    logger.flush_log()
+    assert (tmp_path / 'logs' / 'actions.jsonl.1').exists()
+    assert (tmp_path / 'logs' / 'actions.jsonl.2').exists()
+    assert not (tmp_path / 'logs' / 'actions.jsonl.3').exists()
+    assert path.stat().st_size <= 400
+    assert _records(path)[-1]['path'] == 'task-11.md'
+
+
+def test_default_location_is_app_storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('PRIORITY_MANAGER_HOME', str(tmp_path / 'home'))
+    monkeypatch.delitem(CONFIG, 'logging', raising=False)
+    logger.log_action('one')
+    logger.log_action('two')
+    logger.flush_log()
+    assert [r['message'] for r in _records(tmp_path / 'home' / 'actions.jsonl')] == ['one', 'two']
+
+
+def test_quiet_process_is_flushed_by_the_timer(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, 'logging', {'dir': str(tmp_path / 'logs'), 'buffer_records': 100, 'flush_seconds': 0.05})
+    path = tmp_path / 'logs' / 'actions.jsonl'
+    logger.log_event('add', path='a.md')
+    for _ in range(200):
+        if path.exists():
+            break
+        time.sleep(0.01)
+    assert [r['path'] for r in _records(path)] == ['a.md']
@@ -0,0 +1,122 @@
+import os
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.archive import archive
+from priority_manager.commands.restore import restore, compact
+from priority_manager.utils import helpers
+from priority_manager.utils.config import CONFIG
+from priority_manager.utils.index import TaskIndex
+from priority_manager.utils.pack import PackArchive
+
+
+def _use_archive(monkeypatch, tmp_path, packed=True):
+    monkeypatch.setitem(CONFIG, 'archive', {'format': 'packed' if packed else 'files', 'pack_name': 'archive.pack'})
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'archive'
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    write_task(tasks_root / 'done.md', name='Done', status='Complete')
+    write_task(tasks_root / 'Work' / 'shipped.md', name='Shipped', status='Complete')
+    write_task(tasks_root / 'Work' / 'open.md', name='Open')
+    return tasks_root
+
+
+def test_archive_appends_to_pack_and_restore_by_id(root, tmp_path, monkeypatch):
+    archive_root = _use_archive(monkeypatch, tmp_path)
+    shipped = (root / 'Work' / 'shipped.md').read_text(encoding='utf-8')
+    helpers.files_to_tasks(recursive=True)  # build the index
+    runner = CliRunner()
+
+    result = runner.invoke(archive, ['--status', 'Complete'])
+    assert result.exit_code == 0, result.output
+    assert 'Archived 2 task(s).' in result.output
+    assert not (root / 'done.md').exists() and not (root / 'Work' / 'shipped.md').exists()
+    assert sorted(os.listdir(archive_root)) == ['archive.pack', 'archive.pack.idx']
+    assert sorted(TaskIndex.load(str(root)).entries) == ['Work/open.md']
+
+    result = runner.invoke(restore, ['--list'])
+    assert result.output.splitlines()[1].endswith('\tWork/shipped.md')
+    result = runner.invoke(restore, ['--show', '2'])
+    assert result.output == shipped
+
+    result = runner.invoke(restore, ['2'])
+    assert result.exit_code == 0, result.output
+    assert 'Task restored: Work/shipped.md' in result.output
+    assert (root / 'Work' / 'shipped.md').read_text(encoding='utf-8') == shipped
+    assert sorted(TaskIndex.load(str(root)).entries) == ['Work/open.md', 'Work/shipped.md']
+    assert sorted(PackArchive.open(str(archive_root)).entries) == [1]
+
+    result = runner.invoke(restore, ['2'])
+    assert result.exit_code != 0 and 'no archived task with id 2' in result.output
+
+
+def test_pack_index_is_recovered_from_frames(root, tmp_path, monkeypatch):
+    archive_root = _use_archive(monkeypatch, tmp_path)
+    CliRunner().invoke(archive, ['--status', 'Complete'])
+    os.remove(archive_root / 'archive.pack.idx')
+    pack = PackArchive.open(str(archive_root))
+    assert {e['path'] for e in pack.entries.values()} == {'done.md', 'Work/shipped.md'}
+    assert pack.read(1).startswith(b'**Name:** Done')
+    assert (archive_root / 'archive.pack.idx').exists()
+
+
+def test_compact_migrates_loose_files_and_drops_restored(root, tmp_path, monkeypatch):
+    archive_root = _use_archive(monkeypatch, tmp_path, packed=False)
+    runner = CliRunner()
+    runner.invoke(archive, ['--status', 'Complete'])
+    assert (archive_root / 'Work' / 'shipped.md').exists()
+
+    result = runner.invoke(compact, [])
+    assert result.exit_code == 0, result.output
+    assert 'Packed 2 loose file(s)' in result.output
+    assert sorted(os.listdir(archive_root)) == ['archive.pack', 'archive.pack.idx']
+
+    runner.invoke(restore, ['1'])
+    size = os.path.getsize(archive_root / 'archive.pack')
+    result = runner.invoke(compact, [])
+    assert 'Reclaimed' in result.output
+    assert os.path.getsize(archive_root / 'archive.pack') < size
+    pack = PackArchive.open(str(archive_root))
+    assert [e['path'] for e in pack.entries.values()] == ['Work/shipped.md']
+    assert pack.read(2).startswith(b'**Name:** Shipped')
+    assert (root / 'done.md').exists()
+
+
+@pytest.mark.parametrize('crash_at', ['archive.pack', 'archive.pack.idx'])
+def test_compact_survives_a_crash_between_the_swaps(root, tmp_path, monkeypatch, crash_at):
+    archive_root = _use_archive(monkeypatch, tmp_path)
+    runner = CliRunner()
+    runner.invoke(archive, ['--status', 'Complete'])
+    runner.invoke(restore, ['1'])
+    real_replace = os.replace
+
+    def crash(src, dst):
+        if os.path.basename(dst) == crash_at:
+            raise OSError('simulated crash')
+        real_replace(src, dst)
+    monkeypatch.setattr(os, 'replace', crash)
+    with pytest.raises(OSError):
+        PackArchive.open(str(archive_root)).compact()
+    monkeypatch.setattr(os, 'replace', real_replace)
+    pack = PackArchive.open(str(archive_root))
+    assert sorted(pack.entries) == [2]
+    assert pack.read(2).startswith(b'**Name:** Shipped')
+
+
+def test_compact_never_hands_out_a_restored_id_again(root, tmp_path, monkeypatch, write_task):
+    archive_root = _use_archive(monkeypatch, tmp_path)
+    runner = CliRunner()
+    runner.invoke(archive, ['--status', 'Complete'])
+    runner.invoke(restore, ['2'])  # the newest id
+    (root / 'Work' / 'shipped.md').unlink()
+    assert 'Reclaimed' in runner.invoke(compact, []).output
+
+    write_task(root / 'late.md', name='Late', status='Complete')
+    result = runner.invoke(archive, ['--status', 'Complete'])
+    assert result.exit_code == 0, result.output
+    pack = PackArchive.open(str(archive_root))
+    assert sorted(pack.entries) == [1, 3]
+    assert pack.read(3).startswith(b'**Name:** Late')
+    assert runner.invoke(restore, ['2']).exit_code != 0
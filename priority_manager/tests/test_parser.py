@@ -0,0 +1,62 @@
+from priority_manager.utils.parser import parse_task_file
+
+FULL = (
+    "**Name:** Parsed Task\n\n"
+    "**List:** Inbox\n\n"
+    "**Description:** Header parser test\n\n"
+    "**Priority Score:** 12\n\n"
+    "**Due Date:** 2025-03-01\n\n"
+    "**Tags:** alpha, beta\n\n"
+    "**Date Added:** 2025-01-01T09:00:00\n\n"
+    "**Status:** In Progress\n"
+)
+
+
+def test_parse_full_header(tmp_path):
+    path = tmp_path / 'plain.md'
+    path.write_text(FULL, encoding='utf-8')
+    details = parse_task_file(str(path))
+    assert details == {
+        "Task Name": "Parsed Task",
+        "Priority Score": 12,
+        "File Name": "plain",
+        "Start Date": "2025-01-01",
+        "Due Date": "2025-03-01",
+        "Status": "In Progress",
+        "Description": "Header parser test",
+        "Tags": "alpha, beta",
+        "Date Added": "2025-01-01T09:00:00",
+        "List": "Inbox",
+    }
+
+
+def test_parse_defaults_and_crlf(tmp_path):
+    path = tmp_path / '2024-05-06_task.md'
+    path.write_bytes(b"# Heading\r\n\r\n**Priority Score:** oops\r\n\r\n**Due Date:** \r\n\r\n**Status:** To Do\r\n")
+    details = parse_task_file(str(path))
+    assert details["Task Name"] == "2024-05-06_task"
+    assert details["Priority Score"] == -999
+    assert details["Due Date"] == "No due date"
+    assert details["Status"] == "To Do"
+    assert details["Tags"] == "No tags"
+    assert details["Start Date"] == "2024-05-06"
+
+
+def test_parse_stops_at_body(tmp_path):
+    # Header fields mentioned inside the body must not override the header
+    path = tmp_path / 'body.md'
+    path.write_text(
+        "**Name:** Head\n\n**Priority Score:** 4\n\n**Status:** To Do\n\nSome notes\n\n**Tags:** not-a-tag\n",
+        encoding='utf-8',
+    )
+    details = parse_task_file(str(path))
+    assert details["Task Name"] == "Head"
+    assert details["Tags"] == "No tags"
+
+
+def test_parse_bounded_prefix(tmp_path):
+    path = tmp_path / 'long.md'
+    path.write_text("**Name:** Prefix\n\n" + "x" * 10000 + "\n**Status:** Late\n", encoding='utf-8')
+    assert parse_task_file(str(path), max_bytes=64)["Status"] == "No status"
+    assert parse_task_file(str(path))["Status"] == "Late"
+    assert parse_task_file(str(path), max_bytes=64)["Task Name"] == "Prefix"
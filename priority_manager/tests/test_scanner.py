@@ -0,0 +1,49 @@
+import os
+import pytest
+from priority_manager.utils import helpers
+from priority_manager.utils.scanner import load_tree, scan_dir
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    for rel in ['z.md', 'a.md', 'List_B/b2.md', 'List_B/b1.md', 'List_A/a1.md', 'List_A/Nested/n1.md', '.hidden/h.md']:
+        write_task(tasks_root / rel, name=rel)
+    (tasks_root / '.pm_index').mkdir()
+    (tasks_root / '.pm_index' / 'metadata.json').write_text('{}', encoding='utf-8')
+    return tasks_root
+
+
+EXPECTED = ['a.md', 'z.md', 'List_A/a1.md', 'List_A/Nested/n1.md', 'List_B/b1.md', 'List_B/b2.md']
+
+
+def test_scan_dir_skips_hidden_entries(root):
+    files, dirs = scan_dir(str(root))
+    assert [e.name for e in files] == ['a.md', 'z.md']
+    assert [e.name for e in dirs] == ['List_A', 'List_B']
+
+
+def test_load_tree_order_is_deterministic(root):
+    base = str(root)
+
+    def rel(entry):
+        return entry.path[len(base) + 1:].replace('\\', '/')
+    sequential = load_tree(base, rel, max_workers=1)
+    parallel = load_tree(base, rel, max_workers=4)
+    assert sequential == parallel == EXPECTED
+    assert load_tree(base, rel, recursive=False) == ['a.md', 'z.md']
+
+
+def test_files_to_tasks_recursive_uses_scanner(root):
+    tasks = helpers.files_to_tasks(recursive=True)
+    assert [t['Path'] for t in tasks] == EXPECTED
+    assert [t['Task Name'] for t in tasks] == EXPECTED
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason='needs symlinks')
+def test_symlinked_folders_are_not_followed(root):
+    os.symlink('..', root / 'List_A' / 'loop', target_is_directory=True)
+    os.symlink(root / 'List_B', root / 'List_C', target_is_directory=True)
+    tasks = helpers.files_to_tasks(recursive=True)
+    assert [t['Path'] for t in tasks] == EXPECTED
+    files, dirs = scan_dir(str(root))
+    assert [e.name for e in dirs] == ['List_A', 'List_B']
@@ -0,0 +1,65 @@
+import os
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.search_filter import search
+from priority_manager.utils import helpers
+from priority_manager.utils import search_index as search_index_module
+from priority_manager.utils.config import CONFIG
+from priority_manager.utils.search_index import SearchIndex, load_search_index, parse_query, search_index_path
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    write_task(tasks_root / 'report.md', name='Quarterly report', description='Draft numbers', tags='work, finance')
+    write_task(tasks_root / 'Inbox' / 'chores.md', name='Weekend chores', description='Buy report folders', tags='homework')
+    return tasks_root
+
+
+def test_search_and_or_and_fields(root):
+    index = load_search_index()
+    assert index.search(parse_query(['report'])) == ['Inbox/chores.md', 'report.md']
+    assert index.search(parse_query(['report', 'draft'])) == ['report.md']
+    assert index.search(parse_query(['draft', 'OR', 'weekend'])) == ['Inbox/chores.md', 'report.md']
+    assert index.search(parse_query(['draft', 'weekend'], match_any=True)) == ['Inbox/chores.md', 'report.md']
+    assert index.search(parse_query(['report']), ['name']) == ['report.md']
+    assert index.search(parse_query(['work']), ['tags']) == ['report.md']
+    assert index.search(parse_query(['home*']), ['tags']) == ['Inbox/chores.md']
+
+
+def test_search_index_is_incremental(root, write_task):
+    load_search_index()
+    write_task(root / 'report.md', name='Annual summary', description='Numbers', tags='work')
+    (root / 'Inbox' / 'chores.md').unlink()
+    index = SearchIndex.load(str(root))
+    assert index.paths() == ['Inbox/chores.md', 'report.md']
+    index.refresh()
+    assert index.paths() == ['report.md']
+    assert index.search(parse_query(['report'])) == []
+    assert index.search(parse_query(['annual'])) == ['report.md']
+
+
+def test_search_command_nested_and_tag_scope(root):
+    runner = CliRunner()
+    res = runner.invoke(search, ['folders'])
+    assert res.exit_code == 0
+    assert 'Found in: Inbox/chores.md' in res.output
+    res = runner.invoke(search, ['work', '--tag'])
+    assert 'Found in: report.md' in res.output
+    assert 'chores' not in res.output
+    assert os.path.exists(search_index_path(CONFIG['directories']['tasks_dir']))
+
+
+def test_refresh_follows_the_scan_snapshot_without_listing_folders(root, write_task, monkeypatch):
+    helpers.files_to_tasks(recursive=True)  # records the folder snapshot
+    load_search_index()
+    monkeypatch.setattr(search_index_module, 'walk_files', lambda base_dir: (_ for _ in ()).throw(AssertionError(base_dir)))
+    write_task(root / 'Inbox' / 'chores.md', name='Weekend chores', description='Mow the lawn', tags='homework')
+    index = load_search_index()
+    assert index.search(parse_query(['lawn'])) == ['Inbox/chores.md']
+    assert index.search(parse_query(['report'])) == ['report.md']
+
+    # A new file moves its folder's mtime, so the next refresh lists the folders again
+    monkeypatch.undo()
+    write_task(root / 'Inbox' / 'lawn.md', name='Lawn')
+    os.utime(root / 'Inbox', ns=(1, 1))
+    assert load_search_index().search(parse_query(['lawn'])) == ['Inbox/chores.md', 'Inbox/lawn.md']
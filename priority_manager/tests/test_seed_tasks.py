@@ -0,0 +1,46 @@
+import os
+import random
+from collections import Counter
+from click.testing import CliRunner
+from priority_manager.scripts.seed_tasks import generate_tasks, seed_tasks
+from priority_manager.utils.config import CONFIG
+from priority_manager.utils.helpers import files_to_tasks
+from priority_manager.utils.tags import normalize_tags
+
+ARGS = ['--count', '60', '--seed', '3', '--start-date', '2025-06-01', '--folders', '4',
+        '--tag-vocab', '20', '--added-days', '30', '--body-lines', '3']
+
+
+def _snapshot(root):
+    files = {}
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, encoding='utf-8') as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+def test_seed_is_reproducible_and_nested(tmp_path):
+    runs = []
+    for run in ('a', 'b'):
+        CONFIG['directories']['tasks_dir'] = str(tmp_path / run)
+        result = CliRunner().invoke(seed_tasks, ARGS)
+        assert result.exit_code == 0, result.output
+        assert 'Created 60 task file(s).' in result.output
+        runs.append(_snapshot(tmp_path / run))
+    assert runs[0] == runs[1]
+    assert {os.path.dirname(p) for p in runs[0]} == {f'Seed_List_{k:02d}' for k in range(1, 5)}
+
+    tasks = files_to_tasks(recursive=True)
+    assert len(tasks) == 60
+    assert all(t['List'].startswith('Seed List ') for t in tasks)
+    assert all('2025-05-02' <= t['Start Date'] <= '2025-06-01' for t in tasks)
+
+
+def test_zipf_tags_favour_low_ranks():
+    counts = Counter()
+    for _, content in generate_tasks(2000, random.Random(1), tag_vocab=20, max_tags=3):
+        line = next(l for l in content.splitlines() if l.startswith('**Tags:**'))
+        counts.update(normalize_tags(line[len('**Tags:**'):]))
+    assert counts['tag001'] > counts['tag005'] > counts['tag020']
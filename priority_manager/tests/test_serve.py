@@ -0,0 +1,120 @@
+import io
+import os
+import socket
+import threading
+import time
+from click.testing import CliRunner
+from priority_manager.main import cli
+from priority_manager.utils import resident
+from priority_manager.utils.daemon import TaskDaemon, forward, socket_path
+
+def _start(tasks_dir):
+    daemon = TaskDaemon(str(tasks_dir))
+    path = socket_path(str(tasks_dir))
+    thread = threading.Thread(target=daemon.serve, args=(path,), daemon=True)
+    thread.start()
+    for _ in range(200):
+        if os.path.exists(path):
+            break
+        time.sleep(0.01)
+    return daemon, thread, path
+
+
+def test_cli_forwards_to_daemon_and_sees_changes(tasks_root, write_task, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_task(tasks_root / 'a.md', name='Alpha report', priority=3, tags='work')
+    daemon, thread, path = _start(tasks_root)
+    try:
+        # Served from memory: scanning the directory would fail the request
+        monkeypatch.setattr('priority_manager.utils.helpers.load_tree', None)
+        out = io.BytesIO()
+        assert forward(['filter', '--tag', 'work'], out) == 0
+        assert out.getvalue().decode() == '1. a.md - Priority Score: 3 - Tags: work\n'
+
+        write_task(tasks_root / 'b.md', name='Beta report', priority=9, tags='work')
+        daemon.refresh()  # what the background poller does every POLL_INTERVAL
+        result = CliRunner().invoke(cli, ['search', 'report'])
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines() == ['Found in: a.md', 'Found in: b.md']
+
+        result = CliRunner().invoke(cli, ['export', 'ndjson', '--output', 'out'])
+        assert 'Tasks exported successfully to out.ndjson (2 tasks).' in result.output
+        assert (tmp_path / 'out.ndjson').exists()  # written in the client's working directory
+
+        # Requests from another configuration are refused, so the client runs locally
+        header, _ = daemon.answer({'version': 1, 'argv': ['ls'], 'cwd': str(tmp_path),
+                                   'tasks_dir': str(tmp_path / 'other'), 'config_mtime': daemon.config_mtime})
+        assert 'error' in header
+        assert forward(['ls', '--status'], io.BytesIO()) is None
+    finally:
+        daemon.stop()
+        thread.join(5)
+        daemon.close()
+    assert not os.path.exists(path)
+    assert resident.watcher is None
+
+
+def test_stale_socket_falls_back_to_direct_mode(tasks_root, write_task):
+    (tasks_root / '.pm_index').mkdir()
+    write_task(tasks_root / 'a.md', name='Alpha', priority=1, tags='work')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path(str(tasks_root)))
+    stale.close()
+    assert forward(['ls'], io.BytesIO()) is None
+    result = CliRunner().invoke(cli, ['filter'])
+    assert result.exit_code == 0
+    assert '1. a.md - Priority Score: 1' in result.output
+
+
+def test_requests_are_answered_from_the_ranking(tasks_root, write_task, monkeypatch):
+    for n in range(30):
+        write_task(tasks_root / ('Sub' if n % 2 else '') / f't{n:02d}.md', name=f'Task {n}', priority=n % 10,
+                   tags='work' if n % 3 == 0 else 'home')
+    daemon = TaskDaemon(str(tasks_root))
+    try:
+        request = {'version': 1, 'argv': ['filter', '--tag', 'work', '--limit', '3'], 'cwd': str(tasks_root),
+                   'tasks_dir': str(tasks_root), 'config_mtime': daemon.config_mtime}
+        # The top N comes from the ranking, not from the ordered index copy
+        monkeypatch.setattr('priority_manager.utils.helpers.read_top', None)
+        header, output = daemon.answer(request)
+        assert header == {'exit_code': 0}
+        assert output.decode().splitlines() == [
+            '1. Sub/t09.md - Priority Score: 9 - Tags: work',
+            '2. t18.md - Priority Score: 8 - Tags: work',
+            '3. Sub/t27.md - Priority Score: 7 - Tags: work',
+        ]
+        monkeypatch.undo()
+
+        # refresh() moves an edited task and drops a deleted one
+        daemon.watcher.sweep_interval = 0
+        write_task(tasks_root / 't00.md', name='Task 0', priority=50, tags='work')
+        (tasks_root / 'Sub' / 't09.md').unlink()
+        assert daemon.refresh() is True
+        assert [t['Path'] for t in daemon.ranking.top(3)] == ['t00.md', 'Sub/t19.md', 'Sub/t29.md']
+        assert 'Sub/t09.md' not in daemon.search_index.paths()
+        assert daemon.refresh() is False
+    finally:
+        daemon.close()
+
+
+def test_in_place_edit_is_seen_before_the_next_sweep(tasks_root, write_task):
+    for n in range(3):
+        write_task(tasks_root / f'T{n}.md', name=f'T{n}', priority=5 - n)
+    daemon = TaskDaemon(str(tasks_root))
+    try:
+        daemon.watcher.sweep_interval = 3600
+        daemon.refresh()  # settles the folder mtime moved by creating .pm_index
+        # Rewriting the file in place leaves the folder's mtime alone
+        folder_mtime = os.stat(tasks_root).st_mtime_ns
+        write_task(tasks_root / 'T2.md', name='T2', priority=99)
+        assert os.stat(tasks_root).st_mtime_ns == folder_mtime
+        assert daemon.refresh() is False  # the background poll only stats folders
+
+        request = {'version': 1, 'argv': ['ls', '--limit', '1'], 'cwd': str(tasks_root),
+                   'tasks_dir': str(tasks_root), 'config_mtime': daemon.config_mtime}
+        header, output = daemon.answer(request)
+        assert header == {'exit_code': 0}
+        row = output.decode().splitlines()[2]
+        assert [cell.strip() for cell in row.split('|')[2:4]] == ['T2', '99']
+    finally:
+        daemon.close()
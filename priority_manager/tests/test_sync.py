@@ -43,7 +43,7 @@ def test_sync_pull_creates_files(monkeypatch, tmp_path):
         {'title': 'Remote Task B', 'dueDateTime': {'dateTime': '2030-01-01', 'timeZone': 'UTC'}},
     ]
 
-    def fake_get_tasks(session, token, list_id):
+    def fake_get_tasks(session, token, list_id, *a, **k):
         return remote_sample
 
     # Monkeypatch imports inside command
@@ -51,7 +51,7 @@ def test_sync_pull_creates_files(monkeypatch, tmp_path):
     monkeypatch.setenv('PYTHONHASHSEED', '0')
     from priority_manager.commands import todo as todo_module
     monkeypatch.setattr(todo_module, 'get_or_create_list', fake_get_or_create_list)
-    monkeypatch.setattr(todo_module, 'get_tasks', fake_get_tasks)
+    monkeypatch.setattr(todo_module, 'get_task_delta', fake_get_tasks)
     monkeypatch.setattr(todo_module, 'create_task', lambda *a, **k: None)
 
     runner = CliRunner()
@@ -84,7 +84,7 @@ def test_sync_unauthorized(monkeypatch, tmp_path):
 
     from priority_manager.commands import todo as todo_module
     monkeypatch.setattr(todo_module, 'get_or_create_list', fake_get_or_create_list)
-    monkeypatch.setattr(todo_module, 'get_tasks', fake_get_tasks)
+    monkeypatch.setattr(todo_module, 'get_task_delta', fake_get_tasks)
     monkeypatch.setattr(todo_module, 'create_task', lambda *a, **k: None)
     runner = CliRunner()
     res = runner.invoke(sync_tasks, ['--pull', '--verbose'])
@@ -110,9 +110,9 @@ def test_sync_pull_all_lists(monkeypatch, tmp_path):
 
     from priority_manager.commands import todo as todo_module
     monkeypatch.setattr(todo_module, 'get_lists', lambda *a, **k: lists)
-    def fake_get_tasks(session, token, list_id):
+    def fake_get_tasks(session, token, list_id, *a, **k):
         return tasks_alpha if list_id == 'L1' else tasks_beta
-    monkeypatch.setattr(todo_module, 'get_tasks', fake_get_tasks)
+    monkeypatch.setattr(todo_module, 'get_task_delta', fake_get_tasks)
     # create_task unused in pull-only test
     monkeypatch.setattr(todo_module, 'create_task', lambda *a, **k: None)
     # get_or_create_list for push path still needed
@@ -121,7 +121,8 @@ def test_sync_pull_all_lists(monkeypatch, tmp_path):
     runner = CliRunner()
     res = runner.invoke(sync_tasks, ['--pull', '--all-lists'])
     assert res.exit_code == 0
-    files = os.listdir(test_dir)
+    # Ignore hidden sidecars such as the metadata index
+    files = [f for f in os.listdir(test_dir) if not f.startswith('.')]
     # Should create 4 files, but duplicate Shared Title appears twice with different lists
     assert len(files) == 4
     content = "\n".join(open(os.path.join(test_dir, f), encoding='utf-8').read() for f in files)
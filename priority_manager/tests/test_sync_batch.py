@@ -0,0 +1,22 @@
+from click.testing import CliRunner
+from priority_manager.commands.todo import sync_tasks
+
+
+def test_push_creates_tasks_in_batches_of_20(graph, tasks_root, write_task):
+    for n in range(45):
+        due = '2030-01-01' if n == 7 else 'No due date'
+        write_task(tasks_root / f'task{n:02d}.md', name=f'Task {n:02d}', due=due)
+    list_id = graph.add_list('Priority Manager')
+    graph.add_task(list_id, 'Task 00')
+    graph.fail_titles = {'Task 05', 'Task 30'}
+
+    result = CliRunner().invoke(sync_tasks, ['--push'])
+    assert result.exit_code == 0, result.output
+    assert [c for c in graph.calls if c[0] == 'POST'] == [('POST', '/$batch')] * 3
+    assert 'Pushing tasks: 20/44' in result.output and 'Pushing tasks: 44/44' in result.output
+    assert "Failed to push 'Task 05': 400 Invalid title" in result.output
+    assert 'Pushed: 42' in result.output and 'Failed: 2' in result.output
+    titles = {t['title'] for t in graph.tasks[list_id]}
+    assert len(titles) == 43 and 'Task 30' not in titles
+    task7 = next(t for t in graph.tasks[list_id] if t['title'] == 'Task 07')
+    assert task7['dueDateTime'] == {'dateTime': '2030-01-01', 'timeZone': 'UTC'}
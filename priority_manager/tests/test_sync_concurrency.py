@@ -0,0 +1,26 @@
+import os
+from click.testing import CliRunner
+from priority_manager.commands import todo as todo_module
+from priority_manager.commands.todo import sync_tasks
+
+
+def test_all_lists_are_fetched_concurrently_with_one_local_scan(graph, tasks_root, monkeypatch):
+    for n in range(6):
+        list_id = graph.add_list(f'List {n}')
+        graph.add_task(list_id, f'Task {n}')
+        graph.add_task(list_id, 'Shared')
+    graph.delay = 0.05
+    scans = []
+    real_files_to_tasks = todo_module.files_to_tasks
+    monkeypatch.setattr(todo_module, 'files_to_tasks', lambda *a, **k: scans.append(1) or real_files_to_tasks(*a, **k))
+
+    result = CliRunner().invoke(sync_tasks, ['--pull', '--all-lists', '--folders', '--concurrency', '3'])
+    assert result.exit_code == 0, result.output
+    assert 'Pulled: 12' in result.output
+    assert graph.max_in_flight == 3
+    assert len(scans) == 1
+    assert sorted(os.listdir(tasks_root / 'List_5')) and len(os.listdir(tasks_root / 'List_5')) == 2
+
+    # A second run finds everything already present locally
+    result = CliRunner().invoke(sync_tasks, ['--pull', '--all-lists', '--folders'])
+    assert 'Pulled: 0' in result.output
@@ -0,0 +1,90 @@
+import json
+import os
+from click.testing import CliRunner
+from priority_manager.commands.todo import sync_tasks
+from priority_manager.utils.sync_state import state_path
+
+
+def _setup(graph, tasks_dir, count=3):
+    list_id = graph.add_list('Priority Manager')
+    tasks = [graph.add_task(list_id, f'Remote {n}') for n in range(count)]
+    return tasks_dir, list_id, tasks
+
+
+def _task_files(tasks_dir):
+    return sorted(f for f in os.listdir(tasks_dir) if f.endswith('.md'))
+
+
+def _names(tasks_dir):
+    return {open(tasks_dir / f, encoding='utf-8').readline().strip() for f in _task_files(tasks_dir)}
+
+
+def test_second_pull_only_processes_changes(graph, tasks_root):
+    tasks_dir, list_id, tasks = _setup(graph, tasks_root)
+    runner = CliRunner()
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert res.exit_code == 0, res.output
+    assert 'Pulled: 3' in res.output
+    saved = json.loads(state_path().read_text(encoding='utf-8'))
+    assert 'deltatoken=' in saved[list_id]['deltaLink']
+    assert {t['title'] for t in saved[list_id]['tasks'].values()} == {'Remote 0', 'Remote 1', 'Remote 2'}
+
+    graph.add_task(list_id, 'Remote 3')
+    graph.update_task(list_id, tasks[0]['id'], title='Remote 0 renamed')
+    graph.remove_task(list_id, tasks[1]['id'])
+    graph.calls.clear()
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert res.exit_code == 0, res.output
+    # The rename updates the file pulled for that task (see test_sync_ledger)
+    assert 'Pulled: 1' in res.output
+    assert 'Updated: 1' in res.output
+    assert 'Removed remotely: 1' in res.output
+    assert ('GET', f'/me/todo/lists/{list_id}/tasks/delta') in graph.calls
+    assert ('GET', f'/me/todo/lists/{list_id}/tasks') not in graph.calls
+    assert {'**Name:** Remote 3', '**Name:** Remote 0 renamed'} <= _names(tasks_dir)
+    saved = json.loads(state_path().read_text(encoding='utf-8'))
+    assert {t['title'] for t in saved[list_id]['tasks'].values()} == {'Remote 0 renamed', 'Remote 2', 'Remote 3'}
+
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert 'Pulled: 0' in res.output
+
+
+def test_full_ignores_the_saved_delta_link(graph, tasks_root):
+    tasks_dir, _, _ = _setup(graph, tasks_root)
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    for f in _task_files(tasks_dir):
+        os.remove(tasks_dir / f)
+    # Nothing changed remotely, so an incremental pull has nothing to do
+    assert 'Pulled: 0' in runner.invoke(sync_tasks, ['--pull']).output
+    res = runner.invoke(sync_tasks, ['--pull', '--full'])
+    assert res.exit_code == 0, res.output
+    assert 'Pulled: 3' in res.output
+
+
+def test_expired_delta_link_falls_back_to_a_full_round(graph, tasks_root):
+    tasks_dir, list_id, _ = _setup(graph, tasks_root)
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    graph.add_task(list_id, 'Remote 3')
+    graph.expired_before = 100
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert res.exit_code == 0, res.output
+    assert 'Pulled: 1' in res.output
+    assert len(_task_files(tasks_dir)) == 4
+    saved = json.loads(state_path().read_text(encoding='utf-8'))
+    assert len(saved[list_id]['tasks']) == 4
+
+
+def test_push_uses_saved_titles_and_keeps_changes_for_the_next_pull(graph, tasks_root):
+    tasks_dir, list_id, _ = _setup(graph, tasks_root)
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    graph.add_task(list_id, 'Remote 3')
+    res = runner.invoke(sync_tasks, ['--push'])
+    assert res.exit_code == 0, res.output
+    # Pulled files already exist remotely even though this run only saw one change
+    assert 'Pushed: 0' in res.output
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert 'Pulled: 1' in res.output
+    assert '**Name:** Remote 3' in _names(tasks_dir)
@@ -20,9 +20,9 @@ def test_sync_pull_all_lists_folders(monkeypatch, tmp_path):
 
     from priority_manager.commands import todo as todo_module
     monkeypatch.setattr(todo_module, 'get_lists', lambda *a, **k: lists)
-    def fake_get_tasks(session, token, list_id):
+    def fake_get_tasks(session, token, list_id, *a, **k):
         return tasks_alpha if list_id == 'L1' else tasks_beta
-    monkeypatch.setattr(todo_module, 'get_tasks', fake_get_tasks)
+    monkeypatch.setattr(todo_module, 'get_task_delta', fake_get_tasks)
     monkeypatch.setattr(todo_module, 'create_task', lambda *a, **k: None)
     monkeypatch.setattr(todo_module, 'get_or_create_list', lambda *a, **k: 'L1')
 
@@ -30,7 +30,8 @@ def test_sync_pull_all_lists_folders(monkeypatch, tmp_path):
     res = runner.invoke(sync_tasks, ['--pull', '--all-lists', '--folders'])
     assert res.exit_code == 0
     # Expect two subdirectories
-    dirs = sorted([d for d in os.listdir(base) if os.path.isdir(os.path.join(base, d))])
+    # Ignore hidden sidecars such as the metadata index
+    dirs = sorted([d for d in os.listdir(base) if os.path.isdir(os.path.join(base, d)) and not d.startswith('.')])
     assert len(dirs) == 2
     # Each directory should have 2 files
     for d in dirs:
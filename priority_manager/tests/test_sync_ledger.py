@@ -0,0 +1,104 @@
+import json
+import os
+from click.testing import CliRunner
+from priority_manager.commands import todo as todo_module
+from priority_manager.commands.todo import sync_tasks
+from priority_manager.utils.header_patch import patch_header
+from priority_manager.utils.parser import parse_task_file
+from priority_manager.utils.sync_state import state_path
+
+
+def _setup(graph, tasks_dir):
+    list_id = graph.add_list('Priority Manager')
+    return tasks_dir, list_id
+
+
+def _task_files(tasks_dir):
+    return sorted(f for f in os.listdir(tasks_dir) if f.endswith('.md'))
+
+
+def _ledger(list_id):
+    return json.loads(state_path().read_text(encoding='utf-8'))[list_id]['tasks']
+
+
+def test_pulled_file_carries_remote_id_and_is_in_the_ledger(graph, tasks_root):
+    tasks_dir, list_id = _setup(graph, tasks_root)
+    task = graph.add_task(list_id, 'Remote A')
+    res = CliRunner().invoke(sync_tasks, ['--pull'])
+    assert res.exit_code == 0, res.output
+    [name] = _task_files(tasks_dir)
+    lines = (tasks_dir / name).read_text(encoding='utf-8').split('\n\n')
+    assert lines[1:3] == ['**List:** Priority Manager', f"**Remote ID:** {task['id']}"]
+    entry = _ledger(list_id)[task['id']]
+    assert entry['path'] == name
+    assert entry['etag'] == task['@odata.etag']
+    assert entry['modified'] == task['lastModifiedDateTime']
+    # The id line is part of the header, not the start of the body
+    assert parse_task_file(str(tasks_dir / name))['Description'] == 'Pulled from Microsoft To Do'
+
+
+def test_remote_rename_updates_the_paired_file(graph, tasks_root):
+    tasks_dir, list_id = _setup(graph, tasks_root)
+    task = graph.add_task(list_id, 'Old title')
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    graph.update_task(list_id, task['id'], title='New title',
+                      dueDateTime={'dateTime': '2030-01-01', 'timeZone': 'UTC'})
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert res.exit_code == 0, res.output
+    assert 'Pulled: 0' in res.output and 'Updated: 1' in res.output
+    [name] = _task_files(tasks_dir)
+    parsed = parse_task_file(str(tasks_dir / name))
+    assert parsed['Task Name'] == 'New title'
+    assert parsed['Due Date'] == '2030-01-01'
+    assert '**Date Edited:**' in (tasks_dir / name).read_text(encoding='utf-8')
+
+
+def test_local_rename_of_a_pushed_task_is_not_pushed_again(graph, tasks_root):
+    tasks_dir, list_id = _setup(graph, tasks_root)
+    (tasks_dir / 'local.md').write_text(
+        '**Name:** Local A\n\n**Priority Score:** 1\n\n**Due Date:** No due date\n\n**Status:** To Do\n',
+        encoding='utf-8')
+    runner = CliRunner()
+    res = runner.invoke(sync_tasks, ['--push'])
+    assert 'Pushed: 1' in res.output
+    [remote] = graph.tasks[list_id]
+    assert _ledger(list_id)[remote['id']]['path'] == 'local.md'
+
+    patch_header(str(tasks_dir / 'local.md'), {'Name': 'Local A renamed'})
+    res = runner.invoke(sync_tasks, ['--push'])
+    assert res.exit_code == 0, res.output
+    assert 'Pushed: 0' in res.output
+    assert len(graph.tasks[list_id]) == 1
+    # The pushed task comes back in the next delta without creating a copy
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert 'Pulled: 0' in res.output
+    assert _task_files(tasks_dir) == ['local.md']
+
+
+def test_incremental_pull_does_not_scan_local_files(graph, tasks_root, monkeypatch):
+    tasks_dir, list_id = _setup(graph, tasks_root)
+    (tasks_dir / 'local.md').write_text('**Name:** Local\n\n**Status:** To Do\n', encoding='utf-8')
+    for n in range(5):
+        graph.add_task(list_id, f'Remote {n}')
+    scans = []
+    real_files_to_tasks = todo_module.files_to_tasks
+    monkeypatch.setattr(todo_module, 'files_to_tasks', lambda *a, **k: scans.append(1) or real_files_to_tasks(*a, **k))
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    assert len(scans) == 1
+    graph.add_task(list_id, 'Remote 5')
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert 'Pulled: 1' in res.output
+    assert len(scans) == 1
+
+
+def test_lost_ledger_is_rebuilt_by_title_on_a_full_round(graph, tasks_root):
+    tasks_dir, list_id = _setup(graph, tasks_root)
+    task = graph.add_task(list_id, 'Remote A')
+    runner = CliRunner()
+    runner.invoke(sync_tasks, ['--pull'])
+    state_path().unlink()
+    res = runner.invoke(sync_tasks, ['--pull'])
+    assert 'Pulled: 0' in res.output
+    assert _ledger(list_id)[task['id']]['path'] == _task_files(tasks_dir)[0]
@@ -0,0 +1,44 @@
+import pytest
+from click.testing import CliRunner
+from priority_manager.commands.search_filter import filter_tasks
+from priority_manager.commands.tags import list_tags
+from priority_manager.utils.index import TaskIndex
+from priority_manager.utils.tags import normalize_tags
+
+
+@pytest.fixture
+def root(tasks_root, write_task):
+    write_task(tasks_root / 'report.md', name='Report', priority=9, tags='Work, urgent')
+    write_task(tasks_root / 'deploy.md', name='Deploy', priority=5, tags='work')
+    write_task(tasks_root / 'Home' / 'study.md', name='Study', priority=3, tags='homework, urgent')
+    return tasks_root
+
+
+def test_normalize_tags():
+    assert normalize_tags(' Work , urgent,,') == {'work', 'urgent'}
+    assert normalize_tags('No tags') == frozenset()
+
+
+def test_filter_exact_tag_set_queries(root):
+    runner = CliRunner()
+    res = runner.invoke(filter_tasks, ['--tag', 'work'])
+    assert 'report.md' in res.output and 'deploy.md' in res.output
+    assert 'study.md' not in res.output
+    res = runner.invoke(filter_tasks, ['--tag', 'work', '--tag', 'urgent'])
+    assert 'report.md' in res.output and 'deploy.md' not in res.output
+    res = runner.invoke(filter_tasks, ['--any-tag', 'homework', '--any-tag', 'urgent'])
+    assert 'report.md' in res.output and 'Home/study.md' in res.output and 'deploy.md' not in res.output
+    res = runner.invoke(filter_tasks, ['--tag', 'urgent', '--not-tag', 'work'])
+    assert 'Home/study.md' in res.output and 'report.md' not in res.output
+
+
+def test_tag_index_tracks_changes_and_tags_command(root, write_task):
+    runner = CliRunner()
+    res = runner.invoke(list_tags)
+    assert res.exit_code == 0
+    assert '| work     |       2 |' in res.output
+    write_task(root / 'deploy.md', name='Deploy', priority=5, tags='ops')
+    (root / 'report.md').unlink()
+    runner.invoke(list_tags)
+    index = TaskIndex.load(str(root))
+    assert index.tag_counts() == {'ops': 1, 'homework': 1, 'urgent': 1}
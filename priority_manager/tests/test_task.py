@@ -0,0 +1,32 @@
+import pytest
+from priority_manager.utils.task import Task, NO_STATUS
+
+ROW = ["Name", 5, "file", "2025-01-01", "2025-02-01", "To Do", "Desc", "a, b", "2025-01-01T09:00:00", ""]
+
+
+def test_task_mapping_access():
+    task = Task.from_row(ROW)
+    assert task["Task Name"] == "Name"
+    assert task.get("Priority Score") == 5
+    assert task.get("Unknown", "fallback") == "fallback"
+    assert "Path" not in task
+    assert len(task) == 10
+    task["Path"] = "sub/file.md"
+    assert task["Path"] == "sub/file.md"
+    assert dict(task)["Path"] == "sub/file.md"
+    with pytest.raises(KeyError):
+        task["Unknown"] = 1
+
+
+def test_task_row_roundtrip_and_equality():
+    task = Task.from_row(ROW, path="file.md")
+    assert task.to_row() == ROW
+    assert Task.from_row(task.to_row(), path="file.md") == task
+    assert task == dict(task)
+
+
+def test_task_interns_repeated_values():
+    a = Task.from_row(ROW[:5] + ["".join(["No ", "status"])] + ROW[6:])
+    b = Task.from_row(ROW[:5] + ["".join(["No st", "atus"])] + ROW[6:])
+    assert a["Status"] is b["Status"] is NO_STATUS
+    assert not hasattr(a, "__dict__")
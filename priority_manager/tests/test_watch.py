@@ -0,0 +1,85 @@
+import os
+from click.testing import CliRunner
+from priority_manager.commands import ls as ls_module
+from priority_manager.commands import search_filter
+from priority_manager.utils import watch as watch_module
+from priority_manager.utils.watch import TaskWatcher, watch
+
+def _bump(path, seconds=5):
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+
+def test_watcher_reparses_only_changed_files(tmp_path, write_task, monkeypatch):
+    write_task(tmp_path / 'a.md', name='Alpha', priority=1)
+    write_task(tmp_path / 'Work' / 'b.md', name='Beta', priority=2)
+    now = [0.0]
+    watcher = TaskWatcher(str(tmp_path), recursive=True, notify=False, clock=lambda: now[0])
+    assert sorted(t['Path'] for t in watcher.tasks()) == ['Work/b.md', 'a.md']
+
+    parsed = []
+    real_parse = watch_module.parse_task_file
+    monkeypatch.setattr(watch_module, 'parse_task_file', lambda p: parsed.append(p) or real_parse(p))
+    assert watcher.poll() is False
+    assert parsed == []
+
+    write_task(tmp_path / 'a.md', name='Alpha', priority=9)
+    _bump(tmp_path / 'a.md')
+    write_task(tmp_path / 'Work' / 'c.md', name='Gamma', priority=3)
+    _bump(tmp_path / 'Work')
+    os.remove(tmp_path / 'Work' / 'b.md')
+    # Ticks only stat folders: the new and removed files show up, the in-place edit waits for the sweep
+    assert watcher.poll() is True
+    assert [os.path.basename(p) for p in parsed] == ['c.md']
+    assert {t['Path']: t['Priority Score'] for t in watcher.tasks()} == {'a.md': 1, 'Work/c.md': 3}
+    now[0] += watch_module.SWEEP_INTERVAL
+    assert watcher.poll() is True
+    assert sorted(os.path.basename(p) for p in parsed) == ['a.md', 'c.md']
+    assert {t['Path']: t['Priority Score'] for t in watcher.tasks()} == {'a.md': 9, 'Work/c.md': 3}
+    assert watcher.poll() is False
+
+    # Saving through a temporary file renames over the task, which moves the folder mtime
+    write_task(tmp_path / 'Work' / 'c.md.tmp', name='Gamma', priority=4)
+    os.replace(tmp_path / 'Work' / 'c.md.tmp', tmp_path / 'Work' / 'c.md')
+    _bump(tmp_path / 'Work', 10)
+    assert watcher.poll() is True
+    assert watcher.files[str(tmp_path / 'Work' / 'c.md')][1]['Priority Score'] == 4
+
+
+def test_watch_redraws_only_when_output_changes(tmp_path, write_task):
+    write_task(tmp_path / 'a.md', name='Alpha', priority=1)
+    watcher = TaskWatcher(str(tmp_path), notify=False, sweep_interval=0)
+    renders = []
+    edits = iter([
+        lambda: None,
+        lambda: (write_task(tmp_path / 'a.md', name='Alpha', priority=1, tags='x'), _bump(tmp_path / 'a.md')),  # not rendered
+        lambda: (write_task(tmp_path / 'a.md', name='Alpha', priority=7), _bump(tmp_path / 'a.md', 10)),
+    ])
+    runner = CliRunner()
+    with runner.isolation() as (out, _):
+        watch(watcher, lambda tasks: renders.append(1) or str([t['Priority Score'] for t in tasks]),
+              rounds=4, sleep=lambda _: next(edits)())
+        output = out.getvalue().decode()
+    assert output.splitlines() == ['[1]', '[7]']
+    assert len(renders) == 3
+
+
+def test_ls_and_filter_watch(tasks_root, write_task, monkeypatch):
+    write_task(tasks_root / 'a.md', name='Alpha', priority=1, tags='work')
+    write_task(tasks_root / 'b.md', name='Beta', priority=5, tags='home')
+
+    def once(watcher, render, interval):
+        assert interval == 0.5
+        watch(watcher, render, rounds=1)
+
+    monkeypatch.setattr(ls_module, 'watch', once)
+    monkeypatch.setattr(search_filter, 'watch', once)
+    runner = CliRunner()
+    result = runner.invoke(ls_module.list_tasks, ['--watch', '--interval', '0.5', '--limit', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'Beta' in result.output and 'Alpha' not in result.output
+
+    result = runner.invoke(search_filter.filter_tasks, ['--watch', '--interval', '0.5', '--tag', 'work'])
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == '1. a.md - Priority Score: 1 - Tags: work'
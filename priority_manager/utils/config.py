@@ -1,13 +1,16 @@
 import yaml
 import os
 import importlib.resources
+from pathlib import Path
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
+APP_DIR_ENV = "PRIORITY_MANAGER_HOME"
 
 def load_config():
     """Load configuration from config.yaml."""
     with importlib.resources.open_text("priority_manager", "config.yaml") as f:
-        return yaml.safe_load(f)
+        # The libyaml loader is much faster when PyYAML was built with it
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 # Load the configuration
 CONFIG = load_config()
@@ -18,3 +21,11 @@ TEST_MODE = os.getenv("TEST_MODE", "false").lower() == "true"
 if TEST_MODE:
     CONFIG["directories"]["tasks_dir"] = CONFIG["directories"]["test_tasks_dir"]
     CONFIG["directories"]["archive_dir"] = CONFIG["directories"]["test_archive_dir"]
+
+
+def app_storage_dir():
+    """Directory for per-user state (token cache, action log): $PRIORITY_MANAGER_HOME, else beside CONFIG_PATH."""
+    base = os.getenv(APP_DIR_ENV)
+    if base:
+        return Path(base)
+    return Path(CONFIG_PATH).parent
@@ -0,0 +1,217 @@
+"""Resident query daemon (`priority-manager serve`) and the client used by the CLI.
+
+The daemon keeps the parsed tasks (utils.watch.TaskWatcher), a priority-ordered
+ranking of them and the search index in memory and answers read-only commands
+over a Unix socket in the index folder of the tasks dir. A background thread
+polls the watcher and applies each changed file to the ranking and the search
+index. Between its sweeps that poll only stats folders, so before answering a
+request the daemon re-stats the files it holds (the watchdog notifier reports
+in-place edits itself) and applies what changed; a file is re-read only when its
+mtime or size moved. The client sends one JSON line
+``{"version", "argv", "cwd", "tasks_dir", "config_mtime", "color"}``; the reply
+is a JSON line ``{"exit_code": N}`` followed by the command's output bytes.
+Any other reply (or no daemon at all) makes the CLI run the command itself.
+"""
+import json
+import os
+import shutil
+import socket
+import threading
+from .config import CONFIG
+from .index import index_dir, relative_key
+
+PROTOCOL_VERSION = 1
+SOCKET_NAME = "serve.sock"
+# Read-only commands the daemon answers; everything else always runs locally
+SERVED_COMMANDS = {"ls", "search", "filter", "export"}
+# Options that prompt or never return, which only make sense in the caller's terminal
+LOCAL_ONLY_OPTIONS = {"--status", "--watch", "--help"}
+NO_DAEMON_ENV = "PRIORITY_MANAGER_NO_DAEMON"
+REPLY_TIMEOUT = 60.0
+# Seconds between background checks for changed task files
+POLL_INTERVAL = 0.5
+# The packaged config.yaml that load_config reads (requests are refused once it changes)
+_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+def socket_path(tasks_dir=None):
+    tasks_dir = os.path.abspath(tasks_dir or CONFIG["directories"]["tasks_dir"])
+    return os.path.join(index_dir(tasks_dir), SOCKET_NAME)
+
+
+def _config_mtime():
+    try:
+        return os.stat(_CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def daemon_running(path):
+    """True when something accepts connections on the socket at path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def forwardable(argv):
+    return (bool(argv) and argv[0] in SERVED_COMMANDS and not LOCAL_ONLY_OPTIONS.intersection(argv)
+            and not os.environ.get(NO_DAEMON_ENV) and hasattr(socket, "AF_UNIX"))
+
+
+def forward(argv, stdout):
+    """Run argv on a running daemon, copying its output to the binary stream stdout.
+
+    Returns the exit code, or None when the command should run in this process.
+    """
+    if not forwardable(argv):
+        return None
+    tasks_dir = os.path.abspath(CONFIG["directories"]["tasks_dir"])
+    path = socket_path(tasks_dir)
+    if not os.path.exists(path):
+        return None
+    request = {
+        "version": PROTOCOL_VERSION,
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "tasks_dir": tasks_dir,
+        "config_mtime": _config_mtime(),
+        "color": stdout.isatty() if hasattr(stdout, "isatty") else False,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(REPLY_TIMEOUT)
+        try:
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            reply = sock.makefile("rb")
+            header = json.loads(reply.readline() or b"{}")
+        except (OSError, ValueError):
+            # Stale socket or a daemon that is going away: nothing was printed yet
+            return None
+        if "exit_code" not in header:
+            return None
+        shutil.copyfileobj(reply, stdout)
+    stdout.flush()
+    return header["exit_code"]
+
+
+class TaskDaemon:
+    """In-memory task state plus the request handling of `serve`."""
+
+    def __init__(self, tasks_dir):
+        from . import resident
+        from .search_index import SearchIndex
+        from .watch import TaskWatcher
+
+        self.tasks_dir = os.path.abspath(tasks_dir)
+        self.config_mtime = _config_mtime()
+        self.watcher = TaskWatcher(self.tasks_dir, recursive=True)
+        self.ranking = resident.Ranking(self.watcher.tasks())
+        self.search_index = SearchIndex.load(self.tasks_dir).refresh()
+        self.server = None
+        # Held while changes are applied and while a request runs, so a request sees one state
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        resident.watcher, resident.ranking, resident.search_index = self.watcher, self.ranking, self.search_index
+
+    def close(self):
+        from . import resident
+
+        self._stopped.set()
+        resident.watcher = resident.ranking = resident.search_index = None
+        self.watcher.close()
+        self.search_index.close()
+
+    def refresh(self, sweep=None):
+        """Apply changed task files to the in-memory state; returns True when anything changed.
+
+        sweep is passed to TaskWatcher.poll: True re-stats every file, not just the folders.
+        """
+        with self._lock:
+            self.watcher.poll(sweep=sweep)
+            changed = self.watcher.take_changes()
+            if not changed:
+                return False
+            keys = []
+            for path in changed:
+                key = relative_key(self.tasks_dir, path)
+                known = self.watcher.files.get(path)
+                if known is None:
+                    self.ranking.remove(key)
+                else:
+                    self.ranking.put(known[1])
+                keys.append(key)
+            self.search_index.update(keys)
+            return True
+
+    def poll_forever(self, interval=POLL_INTERVAL):
+        """Run refresh() every interval seconds until close() or stop()."""
+        while not self._stopped.wait(interval):
+            self.refresh()
+
+    def answer(self, request):
+        """Return (reply header, output bytes) for one request."""
+        import click
+        from click.testing import CliRunner
+        from ..main import cli
+
+        if request.get("version") != PROTOCOL_VERSION:
+            return {"error": "unsupported protocol version"}, b""
+        if request.get("tasks_dir") != self.tasks_dir or request.get("config_mtime") != self.config_mtime:
+            return {"error": "configuration differs from the daemon's"}, b""
+        argv = request.get("argv") or []
+        if not forwardable(argv):
+            return {"error": "command is not served"}, b""
+        command = cli.get_command(click.Context(cli), argv[0])
+        previous = os.getcwd()
+        try:
+            os.chdir(request["cwd"])
+        except (KeyError, OSError):
+            return {"error": "cannot enter the client's working directory"}, b""
+        try:
+            with self._lock:
+                # Files edited in place leave their folder's mtime alone, so check each one
+                self.refresh(sweep=True)
+                result = CliRunner().invoke(command, argv[1:], prog_name=f"priority-manager {argv[0]}",
+                                            color=bool(request.get("color")))
+        finally:
+            os.chdir(previous)
+        output = result.stdout_bytes
+        if result.exception is not None and not isinstance(result.exception, SystemExit):
+            output += f"Error: {result.exception!r}\n".encode("utf-8")
+        return {"exit_code": result.exit_code}, output
+
+    def serve(self, path):
+        """Answer requests on the Unix socket at path until interrupted."""
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                except ValueError:
+                    return
+                header, output = daemon.answer(request)
+                self.wfile.write(json.dumps(header).encode("utf-8") + b"\n" + output)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.server = socketserver.UnixStreamServer(path, Handler)
+        poller = threading.Thread(target=self.poll_forever, name="pm-serve-poll", daemon=True)
+        poller.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self._stopped.set()
+            poller.join()
+            self.server.server_close()
+            if os.path.exists(path):
+                os.remove(path)
+
+    def stop(self):
+        """Make serve() return (call from another thread)."""
+        self._stopped.set()
+        self.server.shutdown()
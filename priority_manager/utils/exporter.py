@@ -0,0 +1,90 @@
+"""Streaming task exporters.
+
+Every exporter consumes an iterator of task records and writes each one as soon as
+it is parsed, so memory use does not grow with the number of tasks. JSON and YAML
+documents are emitted incrementally as well (one list item at a time).
+"""
+import csv
+import json
+import yaml
+from .parser import parse_task_file
+from .resident import resident_tasks
+from .index import relative_key
+from .scanner import iter_files
+
+# Columns written by the exporters, in output order
+EXPORT_FIELDS = [
+    "Task Name",
+    "Description",
+    "Priority Score",
+    "Due Date",
+    "Date Added",
+    "Status",
+    "Tags",
+    "List",
+    "Path",
+]
+
+
+def iter_export_records(base_dir, recursive=False):
+    """Yield {column: value} for each task file under base_dir, parsing one file at a time."""
+    tasks = resident_tasks(base_dir, recursive)
+    if tasks is not None:
+        for task in tasks:
+            yield {field: task[field] for field in EXPORT_FIELDS}
+        return
+    for entry in iter_files(base_dir, recursive=recursive):
+        try:
+            task = parse_task_file(entry.path)
+        except OSError:
+            continue
+        task["Path"] = relative_key(base_dir, entry.path)
+        yield {field: task[field] for field in EXPORT_FIELDS}
+
+
+def write_csv(records, stream):
+    writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def write_ndjson(records, stream):
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_json(records, stream):
+    count = 0
+    stream.write("[")
+    for record in records:
+        stream.write(",\n" if count else "\n")
+        stream.write(json.dumps(record, ensure_ascii=False, indent=4))
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
+def write_yaml(records, stream):
+    count = 0
+    for record in records:
+        # A one-item list dumps as "- key: value" lines; concatenated they form one YAML list
+        yaml.safe_dump([record], stream, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        count += 1
+    if not count:
+        stream.write("[]\n")
+    return count
+
+
+WRITERS = {
+    "csv": write_csv,
+    "ndjson": write_ndjson,
+    "json": write_json,
+    "yaml": write_yaml,
+}
@@ -0,0 +1,205 @@
+"""Shared request layer for Microsoft Graph: retries and client-side throttling.
+
+Every Graph call goes through ``graph_request``. Responses with a status in
+RETRY_STATUSES are retried with exponential backoff (tenacity), waiting at least
+as long as the ``Retry-After`` header asks. Connection errors are not retried:
+offline, sync should fail at once rather than back off for half a minute. All
+requests first take a token from one process-wide bucket. A throttling response
+halves its rate and holds every caller until Retry-After has passed; successes
+raise the rate again step by step. ``STATS`` counts requests, retries,
+throttling responses and seconds spent waiting.
+
+Settings live under ``ms_todo.http`` in config.yaml (see DEFAULT_SETTINGS).
+"""
+import email.utils
+import threading
+import time
+from tenacity import RetryCallState, Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from .config import CONFIG
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+DEFAULT_SETTINGS = {
+    "attempts": 6,
+    "backoff_base": 0.5,
+    "backoff_max": 30,
+    "rate": 10,
+    "burst": 10,
+    "min_rate": 0.5,
+}
+
+# Every wait goes through here so tests can record waits instead of sleeping
+_sleep = time.sleep
+
+
+def http_settings():
+    section = CONFIG.get("ms_todo")
+    section = section.get("http") if isinstance(section, dict) else None
+    return {**DEFAULT_SETTINGS, **(section if isinstance(section, dict) else {})}
+
+
+def retry_after(headers):
+    """Seconds asked for by a Retry-After header (delta seconds or HTTP date), else None."""
+    value = (headers or {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class GraphStats:
+    """Thread-safe counters for the Graph calls of this process."""
+
+    FIELDS = ("requests", "retries", "throttled", "wait_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.retries = self.throttled = 0
+            self.wait_seconds = 0.0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class TokenBucket:
+    """Request rate limiter that backs off on throttling and recovers on success.
+
+    Tokens are reserved up front (the balance may go negative), so each caller
+    sleeps once for its own slot instead of polling.
+    """
+
+    def __init__(self, rate, burst, min_rate):
+        self.max_rate = self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.burst = float(burst)
+        self.tokens = self.burst
+        self.paused_until = 0.0
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self):
+        """Wait for a request slot and return the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(self.paused_until - now, -self.tokens / self.rate if self.tokens < 0 else 0.0)
+        if wait > 0:
+            _sleep(wait)
+        return max(wait, 0.0)
+
+    def throttled(self, delay=None):
+        """Halve the rate and, if the server named a delay, hold every caller that long."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if delay:
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    def succeeded(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+STATS = GraphStats()
+_bucket = None
+_bucket_lock = threading.Lock()
+
+
+def bucket():
+    global _bucket
+    with _bucket_lock:
+        if _bucket is None:
+            settings = http_settings()
+            _bucket = TokenBucket(settings["rate"], settings["burst"], settings["min_rate"])
+        return _bucket
+
+
+def reset():
+    """Forget the adapted rate and zero the counters (settings are read again)."""
+    global _bucket
+    with _bucket_lock:
+        _bucket = None
+    STATS.reset()
+
+
+class RetryableResponse(Exception):
+    """A response worth retrying; carries it so the last one can be returned."""
+
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} from {response.url}")
+        self.response = response
+
+
+def _wait(settings):
+    backoff = wait_exponential(multiplier=settings["backoff_base"], max=settings["backoff_max"])
+
+    def wait(retry_state: RetryCallState):
+        seconds = backoff(retry_state)
+        error = retry_state.outcome.exception()
+        if isinstance(error, RetryableResponse):
+            asked = retry_after(error.response.headers)
+            if asked is not None:
+                seconds = max(seconds, asked)
+        return seconds
+    return wait
+
+
+def _before_sleep(retry_state: RetryCallState):
+    STATS.add(retries=1, wait_seconds=retry_state.next_action.sleep)
+
+
+def graph_request(session, method, url, **kwargs):
+    """Send one Graph request with throttling and retries; raise HTTPError like raise_for_status.
+
+    The response is returned when it succeeds, or when it is a retryable status
+    after the last attempt (raise_for_status then raises for it).
+    """
+    settings = http_settings()
+    throttle = bucket()
+
+    def attempt():
+        STATS.add(requests=1, wait_seconds=throttle.acquire())
+        resp = session.request(method, url, **kwargs)
+        if resp.status_code in RETRY_STATUSES:
+            STATS.add(throttled=1)
+            throttle.throttled(retry_after(resp.headers))
+            raise RetryableResponse(resp)
+        throttle.succeeded()
+        return resp
+
+    retrying = Retrying(
+        stop=stop_after_attempt(max(1, int(settings["attempts"]))),
+        wait=_wait(settings),
+        retry=retry_if_exception_type(RetryableResponse),
+        before_sleep=_before_sleep,
+        sleep=lambda seconds: _sleep(seconds),
+        reraise=True,
+    )
+    try:
+        resp = retrying(attempt)
+    except RetryableResponse as e:
+        resp = e.response
+    resp.raise_for_status()
+    return resp
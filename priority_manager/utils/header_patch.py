@@ -0,0 +1,90 @@
+"""Rewrite individual header lines of a task file, leaving every other line as is.
+
+Only the ``**Label:** value`` lines being changed are touched: the remaining header
+fields (Date Added, List, ...), blank lines, line endings and the free-form body
+are carried over byte for byte. Missing fields are inserted, Name at the top of
+the header block and everything else just before the Status line.
+"""
+import os
+from .parser import HEADER_FIELDS
+
+
+def _header_lines(lines):
+    """Return ({label bytes: line index}, index of first header line, index of last header line)."""
+    positions = {}
+    first = last = None
+    status_seen = False
+    for i, line in enumerate(lines):
+        stripped = line.rstrip(b"\r")
+        if stripped.startswith(b"**"):
+            end = stripped.find(b":**", 2)
+            label = stripped[2:end] if end > 2 else None
+            if label in HEADER_FIELDS:
+                positions.setdefault(label, i)
+                first = i if first is None else first
+                last = i
+                if label == b"Status":
+                    status_seen = True
+                continue
+        if status_seen and stripped.strip():
+            break
+    return positions, first, last
+
+
+def _line_value(line):
+    stripped = line.rstrip(b"\r")
+    return stripped[stripped.find(b":**", 2) + 3:].strip().decode("utf-8", "replace")
+
+
+def patch_header(filepath, updates, dry_run=False, edited=None):
+    """Apply {label: value} to the header of filepath and return {label: (old, new)} for changed fields.
+
+    A value may be a callable taking the current value (None when the field is
+    missing) and returning the new one. When something changes and edited is
+    given, the Date Edited line is set to it as well (not reported in the result).
+    With dry_run the file is left untouched.
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+    lines = data.split(b"\n")
+    positions, first, last = _header_lines(lines)
+    eol = b"\r" if first is not None and lines[first].endswith(b"\r") else b""
+    changes = {}
+    inserts = []
+
+    def apply(label, value):
+        key = label.encode("utf-8")
+        index = positions.get(key)
+        old = _line_value(lines[index]) if index is not None else None
+        new = value(old) if callable(value) else value
+        if new is None or new == old:
+            return False
+        line = b"**" + key + b":** " + new.encode("utf-8") + eol
+        if index is not None:
+            lines[index] = line
+        elif label == "Name" or first is None:
+            inserts.append((first or 0, [line, eol]))
+        elif b"Status" in positions:
+            inserts.append((positions[b"Status"], [line, eol]))
+        else:
+            inserts.append((last + 1, [eol, line]))
+        changes[label] = (old, new)
+        return True
+
+    for label, value in updates.items():
+        apply(label, value)
+    if not changes or dry_run:
+        return changes
+    if edited is not None:
+        apply("Date Edited", edited)
+        changes.pop("Date Edited", None)
+
+    # Insert back to front (later additions first at equal positions) so indexes stay valid
+    # and new fields keep the order they were applied in
+    for index, _, new_lines in sorted(((index, n, new) for n, (index, new) in enumerate(inserts)), reverse=True):
+        lines[index:index] = new_lines
+    tmp_path = os.path.join(os.path.dirname(filepath), "." + os.path.basename(filepath) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(b"\n".join(lines))
+    os.replace(tmp_path, filepath)
+    return changes
@@ -1,9 +1,16 @@
+import errno
+import heapq
 import os
-import re
+import stat
+from datetime import datetime
 from ..utils.config import CONFIG
-from tabulate import tabulate
+from .index import TaskIndex, index_enabled, index_path, read_top, relative_key
+from .pack import PackArchive, packed_enabled
+from . import resident
+from .parser import parse_task_file
+from .scanner import is_task_file, load_tree, scan_dir
+from .tags import build_tag_index
 import click
-from rich.pretty import pprint
 import shutil
 
 TASKS_DIR = CONFIG["directories"]["tasks_dir"]
@@ -30,32 +37,81 @@ def calculate_priority():
     effort = click.prompt("Enter effort (1-5, 5 = most effort required)", type=int, default=3)
     return urgency * 2 + importance * 3 - effort
 
-def files_to_tasks(files=None, selected_status=None, recursive=False, suppress_empty_message=False):
-    """Return a list of task detail dicts for provided filenames or by scanning tasks dir.
+def list_task_files(dir=None):
+    """Return names of the task files directly inside dir (defaults to tasks dir)."""
+    if dir is None:
+        dir = CONFIG["directories"]["tasks_dir"]
+    files, _ = scan_dir(dir)
+    return [entry.name for entry in files]
 
-    If recursive=True, walk subdirectories under tasks_dir.
+def _load_task(base_dir, path, index, seen, st=None):
+    """Return the Task for path, served from the metadata index when unchanged.
+
+    The path relative to the tasks dir is attached under "Path".
     """
-    tasks = []
+    key = relative_key(base_dir, path)
+    if index is None:
+        task = get_task_details(path)
+    else:
+        if st is None:
+            st = os.stat(path)
+        seen.add(key)
+        task = index.lookup(key, st)
+        if task is None:
+            task = get_task_details(path)
+            index.store(key, st, task)
+    task["Path"] = key
+    return task
+
+def _collect_tasks(files=None, recursive=False):
+    """Load tasks (all, or only the given filenames) and return (tasks, refreshed index or None)."""
     base_dir = CONFIG["directories"]["tasks_dir"]
-    if recursive and files is None:
-        for root, _, filenames in os.walk(base_dir):
-            for fname in filenames:
-                path = os.path.join(root, fname)
-                if not os.path.isfile(path):
-                    continue
-                task_details = get_task_details(path)
-                if selected_status is None or task_details["Status"].lower() == selected_status.lower():
-                    tasks.append(task_details)
+    if files is None:
+        tasks = resident.resident_tasks(base_dir, recursive)
+        if tasks is not None:
+            return tasks, None
+    index = TaskIndex.load(base_dir) if index_enabled() and os.path.isdir(base_dir) else None
+    seen = set()
+    if files is None:
+        # DirEntry.stat() is cached and free on Windows; only the index needs it
+        def load(entry):
+            return _load_task(base_dir, entry.path, index, seen, entry.stat() if index is not None else None)
+        on_dir = None
+        if index is not None:
+            index.begin_scan(recursive)
+            on_dir = index.record_dir
+        tasks = load_tree(base_dir, load, recursive=recursive, on_dir=on_dir)
     else:
-        if files is None:
-            files = os.listdir(base_dir) if os.path.isdir(base_dir) else []
+        tasks = []
         for file in files:
             filepath = os.path.join(base_dir, file)
-            if not os.path.isfile(filepath):
+            if not is_task_file(os.path.basename(file)):
+                continue
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
                 continue
-            task_details = get_task_details(filepath)
-            if selected_status is None or task_details["Status"].lower() == selected_status.lower():
-                tasks.append(task_details)
+            tasks.append(_load_task(base_dir, filepath, index, seen, st))
+
+    if index is not None:
+        if files is None:
+            index.finish_scan(seen)
+        index.save()
+    return tasks, index
+
+def files_to_tasks(files=None, selected_status=None, recursive=False, suppress_empty_message=False):
+    """Return a list of Task records for provided filenames or by scanning tasks dir.
+
+    If recursive=True, subdirectories under tasks_dir are scanned as well (in parallel,
+    see utils.scanner). Parsed details are cached in the metadata index so only new or
+    modified files are read again.
+    """
+    tasks, _ = _collect_tasks(files, recursive)
+    if selected_status is not None:
+        wanted = selected_status.lower()
+        tasks = [t for t in tasks if t["Status"].lower() == wanted]
 
     if not tasks and not suppress_empty_message:
         click.secho(
@@ -64,12 +120,108 @@ def files_to_tasks(files=None, selected_status=None, recursive=False, suppress_e
         )
     return tasks
 
-def show_tasks(tasks):
-    """Display tasks in a table sorted by priority."""
-    tasks.sort(key=lambda x: x["Priority Score"], reverse=True)
+def tasks_with_tag_index(recursive=True):
+    """Return (tasks, {tag: set of paths}) using the tag map kept in the metadata index."""
+    tasks, index = _collect_tasks(recursive=recursive)
+    if index is None:
+        return tasks, build_tag_index(tasks)
+    if not recursive:
+        top_level = {t["Path"] for t in tasks}
+        return tasks, {tag: keys & top_level for tag, keys in index.tags.items()}
+    return tasks, index.tags
+
+def refresh_index_entries(paths):
+    """Re-read the given task paths (relative to tasks dir) into the metadata index.
+
+    Used after commands write task files so the index does not serve stale details.
+    Without an index on disk there is nothing to keep in step; the next scan builds it.
+    """
+    base_dir = CONFIG["directories"]["tasks_dir"]
+    if not paths or not index_enabled() or not os.path.exists(index_path(base_dir)):
+        return
+    index = TaskIndex.load(base_dir)
+    for rel_path in paths:
+        key = rel_path.replace(os.sep, "/")
+        filepath = os.path.join(base_dir, rel_path)
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            index.discard(key)
+            continue
+        index.store(key, st, get_task_details(filepath))
+    index.save()
+
+def rebuild_index(base_dir=None):
+    """Discard the metadata index and rebuild it from a full recursive scan."""
+    if base_dir is None:
+        base_dir = CONFIG["directories"]["tasks_dir"]
+    index = TaskIndex(base_dir)
+    index.clear()
+    seen = set()
+    index.begin_scan(recursive=True)
+    load_tree(base_dir, lambda entry: _load_task(base_dir, entry.path, index, seen, entry.stat()), on_dir=index.record_dir)
+    index.save()
+    return len(index.entries)
+
+def priority_sort_key(task):
+    """Sort key for descending priority; ties are broken by path so ordering is stable."""
+    return (-task["Priority Score"], task.get("Path", ""))
+
+def load_sorted_tasks(selected_status=None, recursive=False, suppress_empty_message=True):
+    """Parse every task once and return the records ordered by descending priority.
+
+    Each record carries its path relative to the tasks dir under "Path", so the
+    row number shown by show_tasks maps straight back to the file.
+    """
+    tasks = files_to_tasks(
+        selected_status=selected_status,
+        recursive=recursive,
+        suppress_empty_message=suppress_empty_message,
+    )
+    tasks.sort(key=priority_sort_key)
+    return tasks
+
+def select_top(tasks, limit=None, offset=0):
+    """Return tasks ranked offset+1 .. offset+limit by priority.
+
+    With a limit only offset+limit items are kept on a bounded heap instead of
+    sorting the whole list.
+    """
+    if limit is None:
+        return sorted(tasks, key=priority_sort_key)[offset:]
+    return heapq.nsmallest(offset + limit, tasks, key=priority_sort_key)[offset:]
+
+def load_top_tasks(limit=None, offset=0, selected_status=None, recursive=False, predicate=None):
+    """Return the matching tasks ranked offset+1 .. offset+limit, in priority order.
+
+    Under the serve daemon the tasks come from its in-memory ranking. Otherwise,
+    when the metadata index's priority-ordered copy is fresh, only the first
+    matching entries are read; failing both every task is loaded and the top
+    ones are picked with select_top.
+    """
+    base_dir = CONFIG["directories"]["tasks_dir"]
+    if selected_status:
+        wanted = selected_status.lower()
+        extra = predicate
+        predicate = lambda t: t["Status"].lower() == wanted and (extra is None or extra(t))
+    if limit is not None:
+        top = resident.resident_top(base_dir, offset + limit, recursive, predicate)
+        if top is None and index_enabled():
+            top = read_top(base_dir, offset + limit, recursive=recursive, predicate=predicate)
+        if top is not None:
+            return top[offset:]
+    tasks = files_to_tasks(recursive=recursive, suppress_empty_message=True)
+    if predicate is not None:
+        tasks = [t for t in tasks if predicate(t)]
+    return select_top(tasks, limit, offset)
+
+def format_tasks(tasks, start=1):
+    """Render tasks (in the given order) as the table printed by show_tasks."""
+    from tabulate import tabulate
+
     headers = [col["name"] for col in TABLE_CONFIG]
     table_rows = []
-    for idx, task in enumerate(tasks, 1):
+    for idx, task in enumerate(tasks, start):
         row: list = [idx]
         for col in TABLE_CONFIG:
             column_name = col["name"]
@@ -78,77 +230,78 @@ def show_tasks(tasks):
             row.append(truncate(str(cell_value), max_length))
         table_rows.append(row)
     headers.insert(0, "#")
-    click.echo(tabulate(table_rows, headers=headers, tablefmt="github"))
+    return tabulate(table_rows, headers=headers, tablefmt="github")
+
+def show_tasks(tasks, presorted=False, start=1):
+    """Display tasks in a table sorted by priority; rows are numbered from start."""
+    if not presorted:
+        tasks.sort(key=lambda x: x["Priority Score"], reverse=True)
+    click.echo(format_tasks(tasks, start))
     return tasks
 
 def get_sorted_files(dir=None, by="Priority Score"):
     """Return list of files in directory sorted descending by given field parsed from task details."""
     if dir is None:
         dir = CONFIG["directories"]["tasks_dir"]
-    files = os.listdir(dir)
+    files = list_task_files(dir)
     files.sort(key=lambda x: get_task_details(os.path.join(dir, x))[by], reverse=True)
     return files
 
-def move_to_archive(files, choice):
-    """Move the chosen file index from tasks to archive directory."""
+def archive_paths(rel_paths):
+    """Move tasks (paths relative to the tasks dir) under the archive dir in one pass.
+
+    Each task keeps its path relative to the archive root; an existing file of the
+    same name gets a numeric suffix instead of being overwritten. os.replace renames
+    within a filesystem, shutil.move is only used when the archive is on another
+    device. The metadata index is updated once at the end. Returns the archived
+    relative paths in input order.
+
+    With ``archive: format: packed`` the files are appended to the packed archive
+    (see utils.pack) instead and the results read "path (pack id N)".
+    """
     current_tasks_dir = CONFIG["directories"]["tasks_dir"]
     current_archive_dir = CONFIG["directories"]["archive_dir"]
-    src = os.path.join(current_tasks_dir, files[choice - 1])
-    dest = os.path.join(current_archive_dir, files[choice - 1])
-    shutil.move(src, dest)
-    return files[choice - 1]
+    if packed_enabled():
+        pack = PackArchive.open(current_archive_dir)
+        ids = pack.add_files([(rel, os.path.join(current_tasks_dir, rel)) for rel in rel_paths],
+                             datetime.now().isoformat(timespec="seconds"))
+        for rel_path in rel_paths:
+            os.remove(os.path.join(current_tasks_dir, rel_path))
+        refresh_index_entries(rel_paths)
+        return [f"{rel} (pack id {task_id})" for rel, task_id in zip(rel_paths, ids)]
+    made = set()
+    archived = []
+    for rel_path in rel_paths:
+        src = os.path.join(current_tasks_dir, rel_path)
+        dest = os.path.join(current_archive_dir, rel_path)
+        folder = os.path.dirname(dest)
+        if folder not in made:
+            os.makedirs(folder, exist_ok=True)
+            made.add(folder)
+        stem, ext = os.path.splitext(dest)
+        counter = 1
+        while os.path.exists(dest):
+            dest = f"{stem}-{counter}{ext}"
+            counter += 1
+        try:
+            os.replace(src, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dest)
+        archived.append(os.path.relpath(dest, current_archive_dir))
+    refresh_index_entries(rel_paths)
+    return archived
+
+def move_to_archive(tasks, choice):
+    """Move the chosen task (1-based index into load_sorted_tasks records) to the archive directory.
+
+    The task's path relative to the tasks dir is preserved under the archive dir.
+    """
+    return archive_paths([tasks[choice - 1]["Path"]])[0]
 
 
 
 def get_task_details(filepath):
-    priority = -999
-    task_status = "No status"
-    description = "No description"
-    tags = "No tags"
-    list_name = ""  # optional List origin
-    name = os.path.splitext(os.path.basename(filepath))[0]
-    due_date = "No due date"
-    date_added = None
-    file_name = os.path.splitext(os.path.basename(filepath))[0]
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        for line in f:
-            if line.startswith("**Name:**"):
-                name = line.strip().split("**Name:**")[1].strip()
-            elif line.startswith("**List:**"):
-                list_name = line.strip().split("**List:**")[1].strip()
-            elif line.startswith("**Priority Score:**"):
-                try:
-                    priority = int(line.strip().split("**Priority Score:**")[1].strip())
-                except ValueError:
-                    pass
-            elif line.startswith("**Status:**"):
-                task_status = line.strip().split("**Status:**")[1].strip()
-            elif line.startswith("**Description:**"):
-                description = line.strip().split("**Description:**")[1].strip()
-            elif line.startswith("**Tags:**"):
-                tags = line.strip().split("**Tags:**")[1].strip()
-            elif line.startswith("**Due Date:**"):
-                due_date = line.strip().split("**Due Date:**")[1].strip() or "No due date"
-            elif line.startswith("**Date Added:**"):
-                date_added = line.strip().split("**Date Added:**")[1].strip()
-
-    match = re.search(r"\d{4}-\d{2}-\d{2}", file_name)
-    if match:
-        start_date = match.group()
-    else:
-        if date_added and len(date_added) >= 10:
-            start_date = date_added[:10]
-        else:
-            start_date = "N/A"
-    return {
-        "Task Name": name,
-        "Priority Score": priority,
-        "File Name": file_name,
-        "Start Date": start_date,
-        "Due Date": due_date,
-        "Status": task_status,
-        "Description": description,
-        "Tags": tags,
-        "Date Added": date_added or "",
-        "List": list_name,
-    }
\ No newline at end of file
+    """Return the Task record for a task file (header fields only, see utils.parser)."""
+    return parse_task_file(filepath)
@@ -0,0 +1,322 @@
+"""Persistent metadata index for the tasks directory.
+
+The index lives in a hidden folder inside the tasks directory (``.pm_index`` by
+default), so writing it never changes the mtime of the tasks directory itself.
+Entries are keyed by the task path relative to the tasks directory and remember
+the file's mtime and size next to the task's compact row (see Task.to_row), so
+unchanged files are never reopened. A tag -> task paths map is maintained
+alongside the entries so tag filters are answered with set operations.
+
+Next to the main JSON file an NDJSON copy of the entries is kept in priority
+order. Its header records the mtime of every folder seen by the last full scan
+and the next line the mtime and size of every file, grouped by folder. While the
+folders are unchanged no task file was added or removed; while the files are
+unchanged none was edited in place. changed_keys() checks both without parsing
+a single row, and read_top() then returns the N highest-priority tasks by
+reading only the first N rows.
+"""
+import json
+import os
+import threading
+import time
+from .config import CONFIG
+from .task import Task
+from .tags import normalize_tags
+
+TAGS_COLUMN = 7  # position of the Tags value in Task.to_row()
+
+INDEX_VERSION = 4
+DEFAULT_INDEX_DIR = ".pm_index"
+METADATA_FILENAME = "metadata.json"
+ORDER_FILENAME = "order.ndjson"
+PRIORITY_COLUMN = 1  # position of the Priority Score value in Task.to_row()
+
+
+def index_settings():
+    section = CONFIG.get("index")
+    return section if isinstance(section, dict) else {}
+
+
+def index_enabled():
+    return bool(index_settings().get("enabled", True))
+
+
+def index_dir(base_dir):
+    """Hidden folder inside the tasks dir holding every index file."""
+    return os.path.join(base_dir, index_settings().get("dir") or DEFAULT_INDEX_DIR)
+
+
+def index_path(base_dir):
+    return os.path.join(index_dir(base_dir), METADATA_FILENAME)
+
+
+def order_path(base_dir):
+    return os.path.join(index_dir(base_dir), ORDER_FILENAME)
+
+
+def relative_key(base_dir, path):
+    """Return the index key (relative path using '/' separators) for a task path."""
+    prefix = base_dir if base_dir.endswith(os.sep) else base_dir + os.sep
+    # Paths built from base_dir (scandir, os.path.join) take the cheap slicing route
+    rel = path[len(prefix):] if path.startswith(prefix) else os.path.relpath(path, base_dir)
+    return rel.replace(os.sep, "/") if os.sep != "/" else rel
+
+
+class TaskIndex:
+    """In-memory view of the on-disk index for a single tasks directory."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.path = index_path(base_dir)
+        self.entries = {}
+        self.tags = {}  # normalised tag -> set of entry keys
+        # store()/discard() run on the scanner's worker threads and edit entries and tags together
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.order_stale = False
+        # {relative dir: mtime_ns} captured before each folder was listed by a full scan
+        self.snapshot = None
+        self.snapshot_recursive = False
+
+    @classmethod
+    def load(cls, base_dir):
+        index = cls(base_dir)
+        try:
+            with open(index.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            index.entries = data.get("entries", {})
+            index.tags = {tag: set(keys) for tag, keys in data.get("tags", {}).items()}
+        else:
+            # Unknown layout: start from scratch and overwrite on save
+            index.dirty = True
+        return index
+
+    def lookup(self, key, stat):
+        """Return the cached Task for key if the file's mtime and size are unchanged."""
+        entry = self.entries.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return Task.from_row(entry[2], path=key)
+        return None
+
+    def store(self, key, stat, task):
+        row = task.to_row()
+        tags = normalize_tags(row[TAGS_COLUMN])
+        with self._lock:
+            self._untag(key)
+            self.entries[key] = [stat.st_mtime_ns, stat.st_size, row]
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+            self.dirty = True
+
+    def _untag(self, key):
+        # Caller holds self._lock
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        for tag in normalize_tags(entry[2][TAGS_COLUMN]):
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def discard(self, key):
+        with self._lock:
+            self._untag(key)
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+
+    def prune(self, seen, recursive=True):
+        """Drop entries for files that were not seen during a full scan.
+
+        A non-recursive scan only covers top-level files, so nested entries are kept.
+        """
+        stale = [k for k in self.entries if k not in seen and (recursive or "/" not in k)]
+        for key in stale:
+            self.discard(key)
+
+    def begin_scan(self, recursive):
+        """Prepare a full scan: make sure the index folder exists and start a folder snapshot.
+
+        The folder is created up front so creating it does not invalidate the snapshot.
+        """
+        try:
+            os.makedirs(index_dir(self.base_dir), exist_ok=True)
+        except OSError:
+            pass
+        self.snapshot = {}
+        self.snapshot_recursive = recursive
+
+    def record_dir(self, path):
+        """Scanner callback: remember a folder's mtime before it is listed."""
+        key = "" if path == self.base_dir else relative_key(self.base_dir, path)
+        try:
+            self.snapshot[key] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+
+    def finish_scan(self, seen):
+        """Prune entries missing from the scan and refresh the ordered copy if its snapshot is outdated."""
+        self.prune(seen, recursive=self.snapshot_recursive)
+        if not self.dirty:
+            header = read_order_header(self.base_dir)
+            if header is None or header.get("dirs") != self.snapshot or header.get("recursive") != self.snapshot_recursive:
+                self.order_stale = True
+
+    def tag_counts(self):
+        """Return {tag: number of tasks} straight from the tag map."""
+        return {tag: len(keys) for tag, keys in self.tags.items()}
+
+    def clear(self):
+        self.entries = {}
+        self.tags = {}
+        self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            self._write(self.path, lambda f: json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "entries": self.entries,
+                    "tags": {tag: sorted(keys) for tag, keys in self.tags.items()},
+                },
+                f,
+                separators=(",", ":"),
+            ))
+            self.order_stale = True
+            self.dirty = False
+        if self.order_stale:
+            self._write(order_path(self.base_dir), self._dump_order)
+            self.order_stale = False
+
+    def _dump_order(self, f):
+        # Without a fresh folder snapshot (partial updates) read_top() falls back to a full scan
+        # scan identifies this snapshot to other caches that follow it (the search index)
+        header = {"version": INDEX_VERSION, "recursive": self.snapshot_recursive, "dirs": self.snapshot,
+                  "scan": time.time_ns()}
+        f.write(json.dumps(header) + "\n")
+        entries = self.entries
+        files = {}
+        for key, (mtime, size, _) in entries.items():
+            folder, _, name = key.rpartition("/")
+            files.setdefault(folder, []).append([name, mtime, size])
+        f.write(json.dumps(files, separators=(",", ":")) + "\n")
+        for key in sorted(entries, key=lambda k: (-entries[k][2][PRIORITY_COLUMN], k)):
+            f.write(json.dumps([key, entries[key][2]], separators=(",", ":")) + "\n")
+
+    def _write(self, path, dump):
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                dump(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only or vanished tasks dir: the index is only a cache, carry on without it
+            pass
+
+
+def read_order_header(base_dir):
+    try:
+        with open(order_path(base_dir), "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if isinstance(header, dict) and header.get("version") == INDEX_VERSION else None
+
+
+def _open_snapshot(base_dir, recursive):
+    """Open the ordered copy and return (file, header, stat table) if no folder changed since its full scan, else None.
+
+    The file is left positioned at the first priority-ordered row.
+    """
+    try:
+        f = open(order_path(base_dir), "r", encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        header = json.loads(f.readline())
+        dirs = header.get("dirs") if isinstance(header, dict) and header.get("version") == INDEX_VERSION else None
+        if not dirs or (recursive and not header.get("recursive")):
+            raise ValueError("no usable folder snapshot")
+        for rel, mtime in dirs.items():
+            if not recursive and rel:
+                continue
+            if os.stat(os.path.join(base_dir, rel)).st_mtime_ns != mtime:
+                raise ValueError("folder changed")
+        files = json.loads(f.readline())
+    except (OSError, ValueError, AttributeError):
+        f.close()
+        return None
+    return f, header, files
+
+
+def _changed(base_dir, files, recursive):
+    changed = []
+    for folder, rows in files.items():
+        if not recursive and folder:
+            continue
+        prefix = os.path.join(base_dir, folder, "")
+        key_prefix = folder + "/" if folder else ""
+        for name, mtime, size in rows:
+            try:
+                st = os.stat(prefix + name)
+            except OSError:
+                changed.append(key_prefix + name)
+                continue
+            if st.st_mtime_ns != mtime or st.st_size != size:
+                changed.append(key_prefix + name)
+    return changed
+
+
+def changes_since_scan(base_dir, recursive=True):
+    """Return (scan id, keys of files edited in place) for the last full scan, or None if it cannot vouch for the tree.
+
+    None means a folder changed (a file was added, removed or renamed), the scan
+    did not cover the requested scope, or there is no ordered copy. Every file is
+    stat'ed, but no row is parsed.
+    """
+    snapshot = _open_snapshot(base_dir, recursive)
+    if snapshot is None:
+        return None
+    f, header, files = snapshot
+    f.close()
+    return header.get("scan"), _changed(base_dir, files, recursive)
+
+
+def changed_keys(base_dir, recursive=True):
+    """Keys of the files edited in place since the last full scan (see changes_since_scan), or None."""
+    changes = changes_since_scan(base_dir, recursive)
+    return None if changes is None else changes[1]
+
+
+def read_top(base_dir, count, recursive=True, predicate=None):
+    """Return up to count Tasks in priority order from the ordered index, or None if it may be stale.
+
+    The folder snapshot and the size and mtime of every file are checked first,
+    so an in-place edit anywhere in the tree sends the caller to a full scan;
+    only the returned rows are parsed.
+    """
+    snapshot = _open_snapshot(base_dir, recursive)
+    if snapshot is None:
+        return None
+    f, _, files = snapshot
+    with f:
+        if _changed(base_dir, files, recursive):
+            return None
+        tasks = []
+        if count <= 0:
+            return tasks
+        for line in f:
+            key, row = json.loads(line)
+            if not recursive and "/" in key:
+                continue
+            task = Task.from_row(row, path=key)
+            if predicate is None or predicate(task):
+                tasks.append(task)
+                if len(tasks) == count:
+                    break
+        return tasks
@@ -1,8 +1,146 @@
+"""Action log: buffered JSON lines with size-based rotation.
+
+Each record is one JSON object per line::
+
+    {"ts": "2025-01-31T10:00:00", "action": "edit", "path": "Work/a.md",
+     "old": {"Status": "To Do"}, "new": {"Status": "Complete"}}
+
+Records are kept in memory and appended in one write once ``logging.buffer_records``
+are pending, once the oldest is ``logging.flush_seconds`` old (a background timer
+covers processes that go quiet, such as ``serve``), or when the process exits.
+Before a write would take the file past ``logging.max_bytes`` it is rotated to
+``<file>.1`` .. ``<file>.<backups>``. The file lives in ``logging.dir`` (default: the
+app storage dir, see utils.config.app_storage_dir). Failing to write the log never
+fails the command.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from .config import CONFIG, app_storage_dir
+
+DEFAULT_SETTINGS = {
+    "dir": "",
+    "file": "actions.jsonl",
+    "max_bytes": 1048576,
+    "backups": 3,
+    "buffer_records": 100,
+    "flush_seconds": 5,
+}
+
+
+def log_settings():
+    section = CONFIG.get("logging")
+    return {**DEFAULT_SETTINGS, **(section if isinstance(section, dict) else {})}
+
+
+def log_path(settings=None):
+    settings = settings or log_settings()
+    return os.path.join(settings["dir"] or str(app_storage_dir()), settings["file"])
+
+
+class ActionLog:
+    """Buffer of pending records, written out by flush()."""
+
+    def __init__(self):
+        self.pending = []
+        self.oldest = None
+        self._timer = None
+        # record() and the flush timer run on different threads
+        self._lock = threading.Lock()
+
+    def record(self, action, path=None, old=None, new=None, duration=None, **fields):
+        entry = {"ts": datetime.now().isoformat(timespec="seconds"), "action": action}
+        if path is not None:
+            entry["path"] = path
+        if old is not None:
+            entry["old"] = old
+        if new is not None:
+            entry["new"] = new
+        if duration is not None:
+            entry["duration_ms"] = round(duration * 1000, 1)
+        entry.update(fields)
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        settings = log_settings()
+        with self._lock:
+            self.pending.append(line)
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+                self._schedule(settings["flush_seconds"])
+            due = len(self.pending) >= settings["buffer_records"] or time.monotonic() - self.oldest >= settings["flush_seconds"]
+        if due:
+            self.flush()
+
+    def _schedule(self, delay):
+        """Flush after delay seconds even if no further record arrives."""
+        timer = threading.Timer(delay, self.flush)
+        timer.daemon = True
+        timer.start()
+        self._timer = timer
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending:
+                return
+            settings = log_settings()
+            data = "".join(self.pending).encode("utf-8")
+            self.pending = []
+            self.oldest = None
+            path = log_path(settings)
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+                if size and size + len(data) > settings["max_bytes"]:
+                    self._rotate(path, settings["backups"])
+                with open(path, "ab") as f:
+                    f.write(data)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _rotate(path, backups):
+        if backups < 1:
+            os.remove(path)
+            return
+        for n in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{n}"):
+                os.replace(f"{path}.{n}", f"{path}.{n + 1}")
+        os.replace(path, f"{path}.1")
+
+
+_LOG = ActionLog()
+atexit.register(_LOG.flush)
+
+
+def log_event(action, path=None, old=None, new=None, duration=None, **fields):
+    """Queue a structured record (see the module docstring for the format)."""
+    _LOG.record(action, path=path, old=old, new=new, duration=duration, **fields)
+
+
+def flush_log():
+    _LOG.flush()
+
+
+@contextmanager
+def timed(action, **fields):
+    """Log action with its duration when the block ends; the yielded dict adds fields."""
+    extra = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        log_event(action, duration=time.perf_counter() - start, **extra)
 
-LOG_FILE = "log.txt"
 
 def log_action(action):
-    # Ensure UTF-8 to support non-ASCII task names
-    with open(LOG_FILE, "a", encoding="utf-8") as log:
-        log.write(f"{datetime.now().isoformat()} - {action}\n")
+    """Log a free-form message (kept for older call sites)."""
+    log_event("message", message=action)
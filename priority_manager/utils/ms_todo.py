@@ -1,19 +1,24 @@
 import os
 import json
 import click
-import requests
-from pathlib import Path
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 # msgraph-sdk is installed optionally, but its fluent client surfaces many async patterns.
 # For now we retain stable REST calls; future enhancement can add an async path.
-try:  # presence flag only
-    import msgraph  # noqa: F401
-    _MSGRAPH_AVAILABLE = True
-except Exception:
-    _MSGRAPH_AVAILABLE = False
-from .config import CONFIG
+# Presence flag only: find_spec locates the package without paying for its import.
+_MSGRAPH_AVAILABLE = importlib.util.find_spec("msgraph") is not None
+from .config import CONFIG, app_storage_dir
+from . import graph_http
+from .graph_http import RETRY_STATUSES, graph_request, http_settings, retry_after
 
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
 LIST_NAME = "Priority Manager"
+# Graph accepts at most 20 requests per JSON batch
+BATCH_SIZE = 20
+# Page size and the only fields sync reads ($select keeps task bodies out of the response)
+PAGE_SIZE = 100
+TASK_FIELDS = "id,title,dueDateTime,status,lastModifiedDateTime"
+LIST_FIELDS = "id,displayName"
 
 # MSAL constants / defaults
 DEFAULT_SCOPES = ["Tasks.ReadWrite"]
@@ -22,19 +27,8 @@ DEFAULT_CLIENT_ID = "04f0c124-f2bc-4f59-8241-bf6df9866bbd"  # Microsoft Graph Ex
 
 # Token cache path (user config dir). Do not commit this file.
 CACHE_FILENAME = ".msal_token_cache.json"
-APP_DIR_ENV = "PRIORITY_MANAGER_HOME"
-
-def _app_storage_dir():
-    base = os.getenv(APP_DIR_ENV)
-    if base:
-        return Path(base)
-    # default: project root directory (CONFIG already loaded) -> place beside config.yaml
-    # Try to locate config.yaml directory
-    try:
-        from .config import CONFIG_PATH  # optional if defined
-        return Path(CONFIG_PATH).parent
-    except Exception:
-        return Path.cwd()
+# Kept under the old private name for callers that imported it from here
+_app_storage_dir = app_storage_dir
 
 def _cache_path():
     return _app_storage_dir() / CACHE_FILENAME
@@ -183,41 +177,163 @@ def get_or_create_list(session, token):
     Currently uses raw REST. Placeholder left for future msgraph-sdk async integration.
     """
     url = f"{GRAPH_API_BASE}/me/todo/lists"
-    resp = session.get(url, headers=_headers(token))
-    click.echo(f"GET {url} - {resp.status_code}")
-    resp.raise_for_status()
-    lists = resp.json().get("value", [])
-    for lst in lists:
+    for lst in get_lists(session, token):
         if lst.get("displayName") == LIST_NAME:
             return lst["id"]
-    resp = session.post(url, headers=_headers(token), json={"displayName": LIST_NAME})
-    resp.raise_for_status()
+    resp = graph_request(session, "POST", url, headers=_headers(token), json={"displayName": LIST_NAME})
     return resp.json()["id"]
 
-def get_tasks(session, token, list_id):
-    """Return list of tasks in given list.
+def _get_page(session, token, url, params=None):
+    return graph_request(session, "GET", url, headers=_headers(token), params=params).json()
+
+def _iter_pages(session, token, url, params, on_delta=None):
+    """Yield the items of every page of a collection, following @odata.nextLink.
 
-    Raw REST call only for now.
+    The next page is requested in the background while the caller works through
+    the current one. Errors surface when iteration reaches the failing page.
+    on_delta(link) receives the @odata.deltaLink of a delta query after the last item.
     """
-    url = f"{GRAPH_API_BASE}/me/todo/lists/{list_id}/tasks"
-    resp = session.get(url, headers=_headers(token))
-    resp.raise_for_status()
-    return resp.json().get("value", [])
+    with ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending = prefetch.submit(_get_page, session, token, url, params)
+        while pending is not None:
+            data = pending.result()
+            next_link = data.get("@odata.nextLink")
+            # nextLink already carries $select/$top and the skip token
+            pending = prefetch.submit(_get_page, session, token, next_link) if next_link else None
+            yield from data.get("value", [])
+            # Only once the caller has taken every item is the delta round complete
+            if data.get("@odata.deltaLink") and on_delta is not None:
+                on_delta(data["@odata.deltaLink"])
 
-def create_task(session, token, list_id, title, due_date=None):
-    """Create a task via REST (SDK path reserved for future)."""
+def get_tasks(session, token, list_id):
+    """Yield every task in the given list (only the TASK_FIELDS), page by page."""
     url = f"{GRAPH_API_BASE}/me/todo/lists/{list_id}/tasks"
+    return _iter_pages(session, token, url, {"$select": TASK_FIELDS, "$top": PAGE_SIZE})
+
+def get_task_delta(session, token, list_id, delta_link=None, on_delta=None, on_reset=None):
+    """Yield the tasks created, updated or removed since delta_link (every task when None).
+
+    Removed tasks come back as {"id": ..., "@removed": {...}}. on_delta(link) receives
+    the link to pass next time once the last page is read. If Graph no longer knows
+    delta_link (410 Gone) on_reset() is called and every task is fetched again.
+    """
+    url = f"{GRAPH_API_BASE}/me/todo/lists/{list_id}/tasks/delta"
+    if delta_link:
+        changes = _iter_pages(session, token, delta_link, None, on_delta)
+        try:
+            first = next(changes)
+        except StopIteration:
+            return
+        except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) != 410:
+                raise
+            if on_reset is not None:
+                on_reset()
+        else:
+            yield first
+            yield from changes
+            return
+    # Delta queries take no $top; Graph picks the page size
+    yield from _iter_pages(session, token, url, {"$select": TASK_FIELDS}, on_delta)
+
+def _task_payload(title, due_date=None):
     payload = {"title": title}
     if due_date:
         payload["dueDateTime"] = {"dateTime": due_date, "timeZone": "UTC"}
-    resp = session.post(url, headers=_headers(token), json=payload)
-    resp.raise_for_status()
+    return payload
+
+def create_task(session, token, list_id, title, due_date=None):
+    """Create a task via REST (SDK path reserved for future)."""
+    url = f"{GRAPH_API_BASE}/me/todo/lists/{list_id}/tasks"
+    resp = graph_request(session, "POST", url, headers=_headers(token), json=_task_payload(title, due_date))
     return resp.json()
 
+def _batch_error(response):
+    body = response.get("body")
+    if isinstance(body, dict) and isinstance(body.get("error"), dict):
+        return f"{response.get('status')} {body['error'].get('message') or body['error'].get('code', '')}".strip()
+    return str(response.get("status"))
+
+def create_tasks_batch(session, token, list_id, items, on_progress=None):
+    """Create tasks for (title, due_date) items using JSON batching, BATCH_SIZE per request.
+
+    One failing item (or one failing batch request) does not stop the others.
+    Items the service throttles inside a batch (429/503 sub-responses) are sent
+    again after the longest Retry-After, up to the configured attempts.
+    Returns a list with one (created task JSON or None, error message or None)
+    entry per item, in input order. on_progress(done, total) is called after
+    each batch.
+    """
+    url = f"{GRAPH_API_BASE}/$batch"
+    settings = http_settings()
+    attempts = max(1, int(settings["attempts"]))
+    results = [None] * len(items)
+    finished = 0
+    pending = list(range(len(items)))
+    for attempt in range(attempts):
+        retry = []
+        delay = 0.0
+        for start in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[start:start + BATCH_SIZE]
+            requests_ = [
+                {
+                    "id": str(i),
+                    "method": "POST",
+                    "url": f"/me/todo/lists/{list_id}/tasks",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": _task_payload(*items[i]),
+                }
+                for i in chunk
+            ]
+            try:
+                resp = graph_request(session, "POST", url, headers=_headers(token), json={"requests": requests_})
+                responses = resp.json().get("responses", [])
+            except Exception as e:  # network or HTTP error for the whole batch
+                if getattr(getattr(e, "response", None), "status_code", None) == 401:
+                    raise
+                for i in chunk:
+                    results[i] = (None, str(e))
+                responses = []
+            in_chunk = set(chunk)
+            for response in responses:
+                try:
+                    index = int(response.get("id"))
+                except (TypeError, ValueError):
+                    continue
+                if index not in in_chunk or results[index] is not None:
+                    continue
+                status = int(response.get("status", 0))
+                if 200 <= status < 300:
+                    results[index] = (response.get("body"), None)
+                elif status in RETRY_STATUSES and attempt + 1 < attempts:
+                    retry.append(index)
+                    delay = max(delay, retry_after(response.get("headers")) or 0.0)
+                else:
+                    results[index] = (None, _batch_error(response))
+            retrying = set(retry)
+            for i in chunk:
+                if results[i] is None and i not in retrying:
+                    results[i] = (None, "no response in batch")
+            finished += len(chunk) - len(retrying & in_chunk)
+            if on_progress is not None:
+                on_progress(finished, len(items))
+        if not retry:
+            break
+        wait = max(delay, min(settings["backoff_max"], settings["backoff_base"] * 2 ** attempt))
+        graph_http.bucket().throttled(delay)
+        graph_http.STATS.add(retries=len(retry), throttled=len(retry), wait_seconds=wait)
+        graph_http._sleep(wait)
+        pending = sorted(retry)
+    return results
+
+def create_list(session, token, name):
+    """Create a To Do list and return its ID."""
+    url = f"{GRAPH_API_BASE}/me/todo/lists"
+    resp = graph_request(session, "POST", url, headers=_headers(token), json={"displayName": name})
+    return resp.json()["id"]
+
 
 def get_lists(session, token):
-    """Return all To Do lists (raw JSON value array)."""
+    """Yield every To Do list (only the LIST_FIELDS), page by page."""
     url = f"{GRAPH_API_BASE}/me/todo/lists"
-    resp = session.get(url, headers=_headers(token))
-    resp.raise_for_status()
-    return resp.json().get("value", [])
+    return _iter_pages(session, token, url, {"$select": LIST_FIELDS, "$top": PAGE_SIZE})
@@ -0,0 +1,188 @@
+"""Packed archive: archived tasks appended to one compressed container.
+
+``archive.pack`` is a sequence of frames. Each frame has a fixed header (magic,
+metadata length, payload length), a small uncompressed JSON metadata block
+({"id", "path", "archived"}) and the task file compressed on its own with zlib.
+Reading one task therefore costs one seek and one small decompression.
+Restoring a task appends a tombstone frame ({"id", "deleted": true}), so the
+pack is only ever appended to; ``compact`` rewrites it without dead frames.
+Task ids are never reused: compaction keeps each task's id and, when the newest
+id was restored, keeps its tombstone so the next archived task does not take it.
+
+``archive.pack.idx`` is an append-only NDJSON offset index (one line per
+frame). It is a cache: frames written after the last indexed offset (e.g. after
+a crash between the two appends) are recovered by scanning the frame headers.
+"""
+import json
+import os
+import struct
+import zlib
+from .config import CONFIG
+
+PACK_FILENAME = "archive.pack"
+INDEX_SUFFIX = ".idx"
+MAGIC = b"PMT1"
+_FRAME = struct.Struct("<4sII")  # magic, metadata length, payload length
+
+
+def pack_settings():
+    section = CONFIG.get("archive")
+    return section if isinstance(section, dict) else {}
+
+
+def packed_enabled():
+    return pack_settings().get("format", "files") == "packed"
+
+
+def pack_path(archive_dir=None):
+    archive_dir = archive_dir or CONFIG["directories"]["archive_dir"]
+    return os.path.join(archive_dir, pack_settings().get("pack_name") or PACK_FILENAME)
+
+
+class PackArchive:
+    """Append-only store of archived task files with an id -> offset index."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.entries = {}  # id -> {"offset", "path", "archived"}
+        self.dead = 0  # frames (records and tombstones) that compact would drop
+        self.next_id = 1
+        self.indexed_end = 0  # pack size covered by the offset index
+
+    @classmethod
+    def open(cls, archive_dir=None):
+        pack = cls(pack_path(archive_dir))
+        pack._load_index()
+        return pack
+
+    def _apply(self, meta, offset):
+        if meta.get("deleted"):
+            if self.entries.pop(meta["id"], None) is not None:
+                self.dead += 2
+        else:
+            self.entries[meta["id"]] = {"offset": offset, "path": meta["path"], "archived": meta.get("archived", "")}
+        self.next_id = max(self.next_id, meta["id"] + 1)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        meta = json.loads(line)
+                    except ValueError:
+                        break  # torn last line; recovered from the pack below
+                    self._apply(meta, meta.get("offset"))
+                    self.indexed_end = max(self.indexed_end, meta["end"])
+        except OSError:
+            pass
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size > self.indexed_end:
+            self._recover(size)
+
+    def _recover(self, size):
+        """Index frames past indexed_end by reading their headers only."""
+        recovered = []
+        with open(self.path, "rb") as f:
+            offset = self.indexed_end
+            while offset + _FRAME.size <= size:
+                f.seek(offset)
+                magic, meta_len, data_len = _FRAME.unpack(f.read(_FRAME.size))
+                end = offset + _FRAME.size + meta_len + data_len
+                if magic != MAGIC or end > size:
+                    break  # torn frame at the tail
+                meta = json.loads(f.read(meta_len))
+                self._apply(meta, offset)
+                recovered.append(dict(meta, offset=offset, end=end))
+                offset = end
+        self.indexed_end = offset
+        self._append_index(recovered)
+
+    def _append_index(self, lines):
+        if not lines:
+            return
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines))
+
+    def _append_frames(self, frames):
+        """Append (meta, payload bytes) frames to the pack in one write and index them."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lines = []
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset != self.indexed_end:
+                # Another writer appended since we opened; pick its frames up first
+                self._recover(offset)
+            chunks = []
+            for meta, payload in frames:
+                meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+                chunk = _FRAME.pack(MAGIC, len(meta_bytes), len(payload)) + meta_bytes + payload
+                chunks.append(chunk)
+                self._apply(meta, offset)
+                lines.append(dict(meta, offset=offset, end=offset + len(chunk)))
+                offset += len(chunk)
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        self.indexed_end = offset
+        self._append_index(lines)
+
+    def add_files(self, items, archived):
+        """Append (relative path, file path) items and return their ids; source files are not touched."""
+        frames = []
+        ids = []
+        for rel_path, filepath in items:
+            with open(filepath, "rb") as f:
+                payload = zlib.compress(f.read())
+            meta = {"id": self.next_id + len(ids), "path": rel_path.replace(os.sep, "/"), "archived": archived}
+            ids.append(meta["id"])
+            frames.append((meta, payload))
+        self._append_frames(frames)
+        return ids
+
+    def read(self, task_id):
+        """Return the original bytes of an archived task."""
+        entry = self.entries.get(task_id)
+        if entry is None:
+            raise KeyError(task_id)
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            _, meta_len, data_len = _FRAME.unpack(f.read(_FRAME.size))
+            f.seek(meta_len, os.SEEK_CUR)
+            return zlib.decompress(f.read(data_len))
+
+    def remove(self, task_ids):
+        """Mark tasks as no longer archived (after a restore)."""
+        self._append_frames([({"id": task_id, "deleted": True}, b"") for task_id in task_ids if task_id in self.entries])
+
+    def compact(self):
+        """Rewrite the pack without restored tasks and tombstones. Returns the bytes reclaimed."""
+        if not self.dead:
+            return 0
+        old_size = os.path.getsize(self.path)
+        tmp = PackArchive(self.path + ".tmp")
+        for suffix in ("", INDEX_SUFFIX):
+            if os.path.exists(tmp.path + suffix):
+                os.remove(tmp.path + suffix)
+        with open(self.path, "rb") as f:
+            frames = []
+            for task_id, entry in sorted(self.entries.items()):
+                f.seek(entry["offset"])
+                _, meta_len, data_len = _FRAME.unpack(f.read(_FRAME.size))
+                meta = json.loads(f.read(meta_len))
+                frames.append((meta, f.read(data_len)))
+        if self.next_id - 1 not in self.entries:
+            frames.insert(0, ({"id": self.next_id - 1, "deleted": True}, b""))
+        tmp._append_frames(frames)
+        # Drop the old index before swapping packs so it never describes the new one;
+        # a crash in between leaves a pack without index, which is rebuilt from its frames
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        os.replace(tmp.path, self.path)
+        os.replace(tmp.index_path, self.index_path)
+        self.entries, self.dead, self.indexed_end = tmp.entries, 0, tmp.indexed_end
+        self.next_id = max(self.next_id, tmp.next_id)
+        return old_size - self.indexed_end
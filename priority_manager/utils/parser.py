@@ -0,0 +1,110 @@
+"""Fast header-only parser for task Markdown files.
+
+Task files start with a block of ``**Field:** value`` lines followed by an optional
+free-form body. The parser reads the file in binary chunks, dispatches each header
+line with a single dict lookup on the field label and stops as soon as the header
+block is complete, so long descriptions or notes below it are never read.
+"""
+import os
+import re
+from .task import Task, NO_DESCRIPTION, NO_DUE_DATE, NO_START_DATE, NO_STATUS, NO_TAGS
+
+CHUNK_SIZE = 4096
+
+# Field label (as bytes) -> Task column name.
+# None marks header lines that are recognised but not reported.
+HEADER_FIELDS = {
+    b"Name": "Task Name",
+    b"List": "List",
+    b"Remote ID": None,
+    b"Priority Score": "Priority Score",
+    b"Status": "Status",
+    b"Description": "Description",
+    b"Tags": "Tags",
+    b"Due Date": "Due Date",
+    b"Date Added": "Date Added",
+    b"Date Edited": None,
+}
+_REPORTED_FIELDS = sum(1 for key in HEADER_FIELDS.values() if key)
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _read_lines(f, max_bytes):
+    """Yield complete lines (without newline) from a binary file, reading at most max_bytes."""
+    pending = b""
+    remaining = max_bytes
+    while True:
+        size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+        chunk = f.read(size) if size > 0 else b""
+        if remaining is not None:
+            remaining -= len(chunk)
+        if not chunk:
+            # EOF (or budget spent): the trailing line is complete only at real EOF
+            if pending and (max_bytes is None or not f.read(1)):
+                yield pending
+            return
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+
+
+def parse_header(f, max_bytes=None):
+    """Return {column name: raw value} for the header fields found in binary file f.
+
+    Scanning stops once every reported field is known, or when the body starts
+    (the first non-field line after the Status line).
+    """
+    found = {}
+    status_seen = False
+    for line in _read_lines(f, max_bytes):
+        if line.startswith(b"**"):
+            end = line.find(b":**", 2)
+            label = line[2:end] if end > 2 else None
+            if label in HEADER_FIELDS:
+                key = HEADER_FIELDS[label]
+                if key:
+                    found[key] = line[end + 3:].strip().decode("utf-8", "replace")
+                    if len(found) == _REPORTED_FIELDS:
+                        break
+                    if key == "Status":
+                        status_seen = True
+                continue
+        if status_seen and line.strip():
+            break
+    return found
+
+
+def parse_task_file(filepath, max_bytes=None):
+    """Parse the header of a task file into a Task record."""
+    with open(filepath, "rb") as f:
+        found = parse_header(f, max_bytes)
+
+    file_name = os.path.splitext(os.path.basename(filepath))[0]
+    priority = -999
+    raw_priority = found.get("Priority Score")
+    if raw_priority is not None:
+        try:
+            priority = int(raw_priority)
+        except ValueError:
+            pass
+    date_added = found.get("Date Added")
+
+    match = _DATE_RE.search(file_name)
+    if match:
+        start_date = match.group()
+    elif date_added and len(date_added) >= 10:
+        start_date = date_added[:10]
+    else:
+        start_date = NO_START_DATE
+    return Task(
+        name=found.get("Task Name", file_name),
+        priority=priority,
+        file_name=file_name,
+        start_date=start_date,
+        due_date=found.get("Due Date") or NO_DUE_DATE,
+        status=found.get("Status", NO_STATUS),
+        description=found.get("Description", NO_DESCRIPTION),
+        tags=found.get("Tags", NO_TAGS),
+        date_added=date_added or "",
+        list_name=found.get("List", ""),
+    )
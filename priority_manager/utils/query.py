@@ -0,0 +1,99 @@
+"""Tiny condition language shared by the non-interactive bulk commands.
+
+Each condition is ``field OP value``; several conditions are ANDed::
+
+    status=To Do        tag=work        tag!=blocked       priority>=10
+    due<2025-01-01      name~report     list=Inbox         path=Work/*
+
+``=``/``!=`` compare case-insensitively (whole tags for ``tag``, a glob for
+``path``), ``~`` is a case-insensitive substring match and ``< <= > >=`` compare
+numbers for priority and ISO strings for dates. Tasks without a date never
+satisfy a date comparison.
+"""
+import fnmatch
+import re
+from .tags import normalize_tags
+from .task import NO_DUE_DATE, NO_START_DATE
+
+# Query field -> Task column
+FIELDS = {
+    "name": "Task Name",
+    "description": "Description",
+    "priority": "Priority Score",
+    "due": "Due Date",
+    "due_date": "Due Date",
+    "start": "Start Date",
+    "added": "Date Added",
+    "status": "Status",
+    "tag": "Tags",
+    "tags": "Tags",
+    "list": "List",
+    "path": "Path",
+}
+DATE_COLUMNS = {"Due Date", "Start Date", "Date Added"}
+_MISSING_DATES = {NO_DUE_DATE, NO_START_DATE, ""}
+_CONDITION_RE = re.compile(r"^\s*([A-Za-z_]+)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$")
+_ORDERING = {
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+
+
+def parse_condition(text):
+    """Return a predicate over Task records for one condition. Raises ValueError if malformed."""
+    match = _CONDITION_RE.match(text)
+    if not match:
+        raise ValueError(f"cannot parse condition {text!r} (expected field OP value)")
+    field, op, value = match.groups()
+    column = FIELDS.get(field.lower())
+    if column is None:
+        raise ValueError(f"unknown field {field!r}; choose from {', '.join(sorted(FIELDS))}")
+    wanted = value.lower()
+
+    if column == "Tags":
+        if op == "~":
+            return lambda t: wanted in t["Tags"].lower()
+        if op not in ("=", "!="):
+            raise ValueError(f"tags support =, != and ~, not {op}")
+        tags = normalize_tags(value)
+        if op == "=":
+            return lambda t: tags <= normalize_tags(t["Tags"])
+        return lambda t: tags.isdisjoint(normalize_tags(t["Tags"]))
+
+    if column == "Priority Score":
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValueError(f"priority must be an integer, got {value!r}")
+        if op == "~":
+            raise ValueError("priority does not support ~")
+        if op == "=":
+            return lambda t: t["Priority Score"] == number
+        if op == "!=":
+            return lambda t: t["Priority Score"] != number
+        compare = _ORDERING[op]
+        return lambda t: compare(t["Priority Score"], number)
+
+    def text_of(task):
+        return (task.get(column) or "").lower()
+
+    if op == "~":
+        return lambda t: wanted in text_of(t)
+    if op in ("=", "!="):
+        if column == "Path":
+            matches = lambda t: fnmatch.fnmatchcase(text_of(t), wanted)
+        else:
+            matches = lambda t: text_of(t) == wanted
+        return matches if op == "=" else (lambda t: not matches(t))
+    compare = _ORDERING[op]
+    if column in DATE_COLUMNS:
+        return lambda t: t.get(column) not in _MISSING_DATES and compare(text_of(t), wanted)
+    return lambda t: compare(text_of(t), wanted)
+
+
+def parse_where(conditions):
+    """Return a predicate that is true when every condition holds."""
+    predicates = [parse_condition(c) for c in conditions]
+    return lambda task: all(p(task) for p in predicates)
@@ -0,0 +1,71 @@
+"""Task state held in memory by `priority-manager serve`; the slots stay None in a normal run.
+
+watcher is a utils.watch.TaskWatcher over the (absolute) tasks dir, ranking a
+Ranking of its tasks and search_index the matching SearchIndex. The daemon keeps
+them up to date from a background thread, so readers can use them instead of
+scanning the directory.
+"""
+import bisect
+
+watcher = None
+ranking = None
+search_index = None
+
+
+class Ranking:
+    """Tasks kept in priority order (as helpers.priority_sort_key sorts them), updated one task at a time."""
+
+    def __init__(self, tasks=()):
+        self._tasks = {task["Path"]: task for task in tasks}
+        self._keys = sorted(self._key(task) for task in self._tasks.values())
+
+    @staticmethod
+    def _key(task):
+        return (-task["Priority Score"], task["Path"])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def put(self, task):
+        """Insert task, or move it to its new place if its path is already ranked."""
+        self.remove(task["Path"])
+        self._tasks[task["Path"]] = task
+        bisect.insort(self._keys, self._key(task))
+
+    def remove(self, path):
+        task = self._tasks.pop(path, None)
+        if task is not None:
+            key = self._key(task)
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def top(self, count, recursive=True, predicate=None):
+        """Return up to count tasks in priority order, skipping nested ones unless recursive."""
+        tasks = []
+        if count <= 0:
+            return tasks
+        for _, path in self._keys:
+            if not recursive and "/" in path:
+                continue
+            task = self._tasks[path]
+            if predicate is None or predicate(task):
+                tasks.append(task)
+                if len(tasks) == count:
+                    break
+        return tasks
+
+
+def resident_tasks(base_dir, recursive):
+    """Return the in-memory tasks for base_dir, or None when no daemon state covers it."""
+    if watcher is None or watcher.base_dir != base_dir:
+        return None
+    tasks = watcher.tasks()
+    if not recursive:
+        tasks = [t for t in tasks if "/" not in t["Path"]]
+    return tasks
+
+
+def resident_top(base_dir, count, recursive, predicate=None):
+    """Return the top count tasks for base_dir from the ranking, or None when no daemon state covers it."""
+    if ranking is None or watcher is None or watcher.base_dir != base_dir:
+        return None
+    return ranking.top(count, recursive, predicate)
@@ -0,0 +1,124 @@
+"""os.scandir based discovery of task files.
+
+DirEntry caches the file type reported by the directory listing, so telling files
+from folders costs no extra stat call. Like the os.walk it replaced, symlinked
+files are listed but symlinked folders are not descended into, so a link loop
+cannot recurse forever or list a folder twice. Subfolders (e.g. the per-list folders created
+by ``sync --folders``) are loaded on a bounded thread pool; results are always
+returned in name order so listings stay deterministic.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .config import CONFIG
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def is_task_file(name):
+    """Hidden entries (the metadata index, editor swap files) are never tasks."""
+    return not name.startswith(".")
+
+
+def scan_workers():
+    section = CONFIG.get("scan")
+    workers = section.get("workers") if isinstance(section, dict) else None
+    return workers or DEFAULT_WORKERS
+
+
+def scan_dir(path):
+    """Return (files, subdirs) DirEntry lists for one directory, each sorted by name."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not is_task_file(entry.name):
+                    continue
+                if entry.is_file():
+                    files.append(entry)
+                elif entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    files.sort(key=lambda e: e.name)
+    dirs.sort(key=lambda e: e.name)
+    return files, dirs
+
+
+def probe_dir(path):
+    """Return (has_files, has_subdirs) for path, stopping at the first task file found.
+
+    has_subdirs is only meaningful when has_files is False.
+    """
+    has_dirs = False
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not is_task_file(entry.name):
+                    continue
+                if entry.is_file():
+                    return True, has_dirs
+                if entry.is_dir(follow_symlinks=False):
+                    has_dirs = True
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return False, has_dirs
+
+
+def walk_files(path, on_dir=None):
+    """Yield file DirEntries under path depth-first, in name order.
+
+    on_dir(folder_path) is called for every folder before it is listed.
+    """
+    if on_dir is not None:
+        on_dir(path)
+    files, dirs = scan_dir(path)
+    yield from files
+    for d in dirs:
+        yield from walk_files(d.path, on_dir)
+
+
+def iter_files(path, recursive=True):
+    """Yield file DirEntries under path in directory order, without buffering listings.
+
+    Unlike walk_files nothing is sorted, so memory stays flat however many files a
+    folder holds; use it for one-pass streaming where order does not matter.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not is_task_file(entry.name):
+                    continue
+                if entry.is_file():
+                    yield entry
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from iter_files(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+
+def load_tree(base_dir, load, recursive=True, max_workers=None, on_dir=None):
+    """Apply load(entry) to every task file under base_dir and return the results in order.
+
+    Top-level files are loaded inline; each top-level subfolder is walked and loaded
+    as one unit of work on a thread pool of at most max_workers threads. on_dir is
+    passed through to walk_files.
+    """
+    if on_dir is not None:
+        on_dir(base_dir)
+    files, dirs = scan_dir(base_dir)
+    results = [load(entry) for entry in files]
+    if not recursive or not dirs:
+        return results
+
+    def load_subtree(d):
+        return [load(entry) for entry in walk_files(d.path, on_dir)]
+
+    workers = min(max_workers or scan_workers(), len(dirs))
+    if workers <= 1:
+        for d in dirs:
+            results.extend(load_subtree(d))
+        return results
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(load_subtree, dirs):
+            results.extend(chunk)
+    return results
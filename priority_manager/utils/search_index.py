@@ -0,0 +1,265 @@
+"""Persistent inverted index (token -> task postings) backing the search command.
+
+The postings live in a SQLite database in the hidden index folder of the tasks
+directory, one row per (field, token, document), so a query reads only the rows
+of its own terms instead of loading the whole index. Postings are stored per field
+so a query can be scoped to names, descriptions or tags, while the "content" field
+covers the whole file.
+
+refresh() re-tokenizes only files whose mtime or size changed and drops files that
+disappeared. It follows the metadata index's full-scan snapshot (see
+index.changes_since_scan): once the database has caught up with a scan, later
+refreshes only look at the files that scan reports as edited, without listing a
+single folder. update() re-checks given paths, for callers that already know
+what changed (the serve daemon).
+"""
+import io
+import os
+import re
+import sqlite3
+import threading
+from .config import CONFIG
+from .index import changes_since_scan, index_dir, index_enabled, relative_key
+from .parser import parse_header
+from . import resident
+from .scanner import walk_files
+
+SEARCH_INDEX_VERSION = 3
+SEARCH_FILENAME = "search.db"
+# JSON index written by earlier versions, removed on first use
+LEGACY_FILENAME = "search.json"
+# Field name -> header column whose value is indexed (content = the whole file)
+SEARCH_FIELDS = {
+    "name": "Task Name",
+    "description": "Description",
+    "tags": "Tags",
+    "content": None,
+}
+FIELD_IDS = {field: n for n, field in enumerate(SEARCH_FIELDS)}
+_TOKEN_RE = re.compile(r"\w+")
+# Bound of the doc ids in one "IN (...)" query (SQLite caps bound parameters)
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS postings (field INTEGER, token TEXT, doc INTEGER,
+                                     PRIMARY KEY (field, token, doc)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+
+def tokenize(text):
+    """Return the sorted set of lowercase word tokens in text."""
+    return sorted(set(_TOKEN_RE.findall(text.lower())))
+
+
+def search_index_path(base_dir):
+    return os.path.join(index_dir(base_dir), SEARCH_FILENAME)
+
+
+def remove_search_index(base_dir):
+    """Delete the search database (and a leftover rollback journal)."""
+    path = search_index_path(base_dir)
+    for name in (path, path + "-journal"):
+        if os.path.exists(name):
+            os.remove(name)
+
+
+def index_document(data, file_name):
+    """Return {field: tokens} for the raw bytes of a task file."""
+    header = parse_header(io.BytesIO(data))
+    header.setdefault("Task Name", file_name)
+    fields = {}
+    for field, column in SEARCH_FIELDS.items():
+        text = data.decode("utf-8", "replace") if column is None else header.get(column, "")
+        fields[field] = tokenize(text)
+    return fields
+
+
+def _connect(path):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        db.execute("PRAGMA user_version").fetchone()
+    except (OSError, sqlite3.Error):
+        # Read-only or vanished tasks dir: the index is only a cache, keep it in memory
+        db = sqlite3.connect(":memory:", check_same_thread=False)
+    if db.execute("PRAGMA user_version").fetchone()[0] != SEARCH_INDEX_VERSION:
+        db.executescript("DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS meta;")
+        db.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION}")
+    db.executescript(_SCHEMA)
+    db.commit()
+    return db
+
+
+class SearchIndex:
+    """Token postings for every task file under one tasks directory."""
+
+    def __init__(self, base_dir, db):
+        self.base_dir = base_dir
+        self.path = search_index_path(base_dir)
+        self.db = db
+        # The serve daemon refreshes from a background thread while requests query
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, base_dir):
+        legacy = os.path.join(index_dir(base_dir), LEGACY_FILENAME)
+        if os.path.exists(legacy):
+            try:
+                os.remove(legacy)
+            except OSError:
+                pass
+        return cls(base_dir, _connect(search_index_path(base_dir)))
+
+    def __len__(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def paths(self):
+        """Relative paths of the indexed tasks, sorted."""
+        with self._lock:
+            return [path for path, in self.db.execute("SELECT path FROM docs ORDER BY path")]
+
+    def refresh(self):
+        """Bring the postings up to date with the files on disk."""
+        changes = changes_since_scan(self.base_dir) if index_enabled() else None
+        with self._lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'scan'").fetchone()
+            if changes is not None and changes[0] is not None and row is not None and row[0] == changes[0]:
+                self.update(changes[1])
+                return self
+            self._sweep()
+            if changes is not None and changes[0] is not None:
+                # Every file now matches disk, which is at least as recent as that scan
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('scan', ?)", (changes[0],))
+            else:
+                self.db.execute("DELETE FROM meta WHERE key = 'scan'")
+            self.db.commit()
+        return self
+
+    def _sweep(self):
+        known = {path: (doc_id, mtime, size) for doc_id, path, mtime, size in self.db.execute("SELECT * FROM docs")}
+        seen = set()
+        for entry in walk_files(self.base_dir):
+            key = relative_key(self.base_dir, entry.path)
+            seen.add(key)
+            doc = known.get(key)
+            st = entry.stat()
+            if doc and doc[1] == st.st_mtime_ns and doc[2] == st.st_size:
+                continue
+            self._index_file(key, entry.path, st, doc[0] if doc else None)
+        for key in known.keys() - seen:
+            self._drop(known[key][0])
+
+    def update(self, keys):
+        """Re-check the files at the given relative paths (added, edited or removed)."""
+        with self._lock:
+            for key in keys:
+                path = os.path.join(self.base_dir, key)
+                row = self.db.execute("SELECT id, mtime, size FROM docs WHERE path = ?", (key,)).fetchone()
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    if row is not None:
+                        self._drop(row[0])
+                    continue
+                if row is None or row[1] != st.st_mtime_ns or row[2] != st.st_size:
+                    self._index_file(key, path, st, row[0] if row else None)
+            self.db.commit()
+
+    def _index_file(self, key, path, st, doc_id):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        fields = index_document(data, os.path.splitext(os.path.basename(path))[0])
+        if doc_id is None:
+            doc_id = self.db.execute("INSERT INTO docs (path, mtime, size) VALUES (?, ?, ?)",
+                                     (key, st.st_mtime_ns, st.st_size)).lastrowid
+        else:
+            self.db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+            self.db.execute("UPDATE docs SET mtime = ?, size = ? WHERE id = ?", (st.st_mtime_ns, st.st_size, doc_id))
+        self.db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                            ((FIELD_IDS[field], token, doc_id) for field, tokens in fields.items() for token in tokens))
+
+    def _drop(self, doc_id):
+        self.db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+        self.db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def _term_docs(self, term, fields):
+        """Return the doc ids matching one term (a trailing '*' makes it a prefix match)."""
+        term = term.lower()
+        ids = [FIELD_IDS[field] for field in fields]
+        marks = ",".join("?" * len(ids))
+        if term.endswith("*"):
+            prefix = term[:-1]
+            rows = self.db.execute(f"SELECT doc FROM postings WHERE field IN ({marks}) AND token >= ? AND token < ?",
+                                   ids + [prefix, prefix + "\U0010ffff"])
+        else:
+            rows = self.db.execute(f"SELECT doc FROM postings WHERE field IN ({marks}) AND token = ?", ids + [term])
+        return {doc for doc, in rows}
+
+    def search(self, groups, fields=None):
+        """Return sorted relative paths matching any group, where each group is a list of ANDed terms."""
+        fields = list(fields or ["content"])
+        found = set()
+        with self._lock:
+            for terms in groups:
+                per_term = sorted((self._term_docs(t, fields) for t in terms), key=len)
+                if not per_term:
+                    continue
+                docs = per_term[0]
+                for other in per_term[1:]:
+                    docs &= other
+                    if not docs:
+                        break
+                found |= docs
+            found = sorted(found)
+            paths = []
+            for start in range(0, len(found), _CHUNK):
+                chunk = found[start:start + _CHUNK]
+                paths.extend(path for path, in self.db.execute(
+                    f"SELECT path FROM docs WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        return sorted(paths)
+
+    def save(self):
+        with self._lock:
+            self.db.commit()
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+def parse_query(terms, match_any=False):
+    """Split CLI terms into OR-groups of ANDed tokens.
+
+    ``a b`` matches tasks with both terms, ``a OR b`` either; match_any ORs every term.
+    Terms are tokenized like the indexed text, so ``foo-bar`` requires foo and bar.
+    """
+    groups = [[]]
+    for term in terms:
+        if term == "OR":
+            groups.append([])
+            continue
+        prefix = term.endswith("*")
+        tokens = _TOKEN_RE.findall(term.lower())
+        if prefix and tokens:
+            tokens[-1] += "*"
+        if match_any:
+            groups.extend([t] for t in tokens)
+        else:
+            groups[-1].extend(tokens)
+    return [g for g in groups if g]
+
+
+def load_search_index(base_dir=None):
+    """Load the search index for base_dir (tasks dir by default) and refresh it."""
+    if base_dir is None:
+        base_dir = CONFIG["directories"]["tasks_dir"]
+    if resident.search_index is not None and resident.search_index.base_dir == base_dir:
+        return resident.search_index
+    return SearchIndex.load(base_dir).refresh()
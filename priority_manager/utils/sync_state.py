@@ -0,0 +1,141 @@
+"""Per-list state kept between sync runs so pulls can use Graph delta queries.
+
+Stored as JSON in the app storage dir, next to the MSAL token cache::
+
+    {"<list id>": {"deltaLink": "https://graph.microsoft.com/v1.0/...",
+                   "tasks": {"<task id>": {"title": "...", "modified": "<lastModifiedDateTime>",
+                                           "etag": "...", "path": "Work/task.md"}}}}
+
+``tasks`` mirrors the remote list as of ``deltaLink`` and doubles as the ledger
+pairing remote tasks with local files. A run that only downloads the changes still
+knows every remote task, which push needs to avoid duplicates. Losing the file
+costs one full download, matched to local files by title as before.
+"""
+import json
+import os
+from .config import app_storage_dir
+
+STATE_FILENAME = "sync_state.json"
+
+
+def state_path():
+    return app_storage_dir() / STATE_FILENAME
+
+
+def load_state():
+    try:
+        with open(state_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_state(state):
+    path = state_path()
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _entry(value):
+    # sync_state.json files written before the ledger kept just the title
+    return dict(value) if isinstance(value, dict) else {"title": value}
+
+
+class ListMirror:
+    """Remote tasks of one list, brought up to date by applying a delta query.
+
+    Also the sync ledger: each remote id maps to its title, the
+    lastModifiedDateTime and ETag last seen and, once paired, the local task file
+    (path relative to the tasks dir), so reconciling is a lookup by id.
+    """
+
+    def __init__(self, entry=None, full=False):
+        entry = entry if isinstance(entry, dict) else {}
+        self.saved = {tid: _entry(v) for tid, v in (entry.get("tasks") or {}).items()}
+        self.start_link = None if full else entry.get("deltaLink")
+        self.delta_link = self.start_link
+        self.tasks = {tid: dict(v) for tid, v in self.saved.items()}
+        self.removed = 0
+        # Set once the last delta page (and with it the next link) has been read
+        self.complete = False
+        self._seen = None if self.delta_link else set()
+
+    def set_link(self, link):
+        if self._seen is not None:
+            # A full round lists every task: ids it did not return are gone
+            for task_id in set(self.tasks) - self._seen:
+                del self.tasks[task_id]
+                self.removed += 1
+        self.delta_link = link
+        self.complete = True
+
+    def reset(self):
+        """Start over with a full round (the delta link expired); the ledger is kept."""
+        self.delta_link = None
+        self._seen = set()
+
+    @property
+    def full_round(self):
+        return self._seen is not None
+
+    def apply(self, changes):
+        """Yield (task, previous ledger entry or None) for the created and updated tasks of changes."""
+        for item in changes:
+            task_id = item.get("id")
+            if "@removed" in item:
+                if self.tasks.pop(task_id, None) is not None:
+                    self.removed += 1
+                continue
+            previous = None
+            if task_id is not None:
+                if self._seen is not None:
+                    self._seen.add(task_id)
+                previous = self.tasks.get(task_id)
+                self.tasks[task_id] = {
+                    "title": item.get("title"),
+                    "modified": item.get("lastModifiedDateTime"),
+                    "etag": item.get("@odata.etag"),
+                    "path": previous.get("path") if previous else None,
+                }
+            yield item, previous
+
+    def link(self, task_id, path):
+        """Pair a remote task with a local file (relative path)."""
+        if task_id in self.tasks:
+            self.tasks[task_id]["path"] = path
+
+    def record(self, task, path):
+        """Add a task this run created remotely from the local file at path."""
+        entry = {"title": task.get("title"), "modified": task.get("lastModifiedDateTime"),
+                 "etag": task.get("@odata.etag"), "path": path}
+        self.tasks[task["id"]] = entry
+        self.saved[task["id"]] = dict(entry)
+
+    def titles(self):
+        return {entry.get("title") for entry in self.tasks.values()}
+
+    def paths(self):
+        return {entry["path"] for entry in self.tasks.values() if entry.get("path")}
+
+    def to_json(self, advance=True):
+        """State to save. Without advance only tasks created by record() are added to
+        what was loaded, so the changes read in this run are seen again next time."""
+        if advance and self.complete:
+            return {"deltaLink": self.delta_link, "tasks": self.tasks}
+        return {"deltaLink": self.start_link, "tasks": self.saved}
+
+
+def unchanged(task, entry):
+    """True when the ledger entry already saw this version of the remote task."""
+    if not entry:
+        return False
+    if task.get("@odata.etag") and entry.get("etag"):
+        return task["@odata.etag"] == entry["etag"]
+    return bool(task.get("lastModifiedDateTime")) and task.get("lastModifiedDateTime") == entry.get("modified")
@@ -0,0 +1,54 @@
+"""Tag normalisation and set-based tag queries.
+
+Task files store tags as a free-form comma separated string. Tags are normalised
+once (trimmed, lowercased, empty and "No tags" dropped) so that filters compare
+whole tags instead of substrings: ``work`` no longer matches ``homework``.
+"""
+from .task import NO_TAGS
+
+
+def normalize_tags(raw):
+    """Return the frozenset of normalised tags in a raw Tags value."""
+    if not raw or raw == NO_TAGS:
+        return frozenset()
+    return frozenset(t for t in (part.strip().lower() for part in raw.split(",")) if t)
+
+
+def tags_match(raw, all_of=(), any_of=(), none_of=()):
+    """Per-task form of select_by_tags for a single raw Tags value."""
+    tags = normalize_tags(raw)
+    if not normalize_tags(",".join(all_of)) <= tags:
+        return False
+    if any_of and tags.isdisjoint(normalize_tags(",".join(any_of))):
+        return False
+    return tags.isdisjoint(normalize_tags(",".join(none_of)))
+
+
+def build_tag_index(tasks):
+    """Return {tag: set of task paths} for tasks carrying a "Path"."""
+    tag_index = {}
+    for task in tasks:
+        for tag in normalize_tags(task["Tags"]):
+            tag_index.setdefault(tag, set()).add(task["Path"])
+    return tag_index
+
+
+def select_by_tags(tag_index, paths, all_of=(), any_of=(), none_of=()):
+    """Answer a tag query with set operations over tag_index.
+
+    Returns the subset of paths that carry every tag in all_of, at least one tag in
+    any_of (when given) and none of the tags in none_of.
+    """
+    empty = frozenset()
+    selected = set(paths)
+    # Intersect smallest postings first so the working set shrinks quickly
+    for tag in sorted(normalize_tags(",".join(all_of)), key=lambda t: len(tag_index.get(t, empty))):
+        selected &= tag_index.get(tag, empty)
+    if any_of:
+        union = set()
+        for tag in normalize_tags(",".join(any_of)):
+            union |= tag_index.get(tag, empty)
+        selected &= union
+    for tag in normalize_tags(",".join(none_of)):
+        selected -= tag_index.get(tag, empty)
+    return selected
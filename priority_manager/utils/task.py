@@ -0,0 +1,85 @@
+"""Compact task record.
+
+Task replaces the per-task details dict. It keeps one slot per column instead of a
+hash table, interns the low-cardinality values (status, tags, dates, list names) so
+100k tasks share a handful of strings, and still behaves like a read-only mapping
+keyed by the familiar column names ("Task Name", "Priority Score", ...), so
+TABLE_CONFIG lookups and ``task.get(...)`` keep working.
+"""
+import sys
+from collections.abc import Mapping
+
+NO_STATUS = sys.intern("No status")
+NO_DESCRIPTION = sys.intern("No description")
+NO_TAGS = sys.intern("No tags")
+NO_DUE_DATE = sys.intern("No due date")
+NO_START_DATE = sys.intern("N/A")
+
+# Column name -> slot, in the order the legacy details dict used.
+COLUMNS = {
+    "Task Name": "name",
+    "Priority Score": "priority",
+    "File Name": "file_name",
+    "Start Date": "start_date",
+    "Due Date": "due_date",
+    "Status": "status",
+    "Description": "description",
+    "Tags": "tags",
+    "Date Added": "date_added",
+    "List": "list_name",
+    "Path": "path",
+}
+_ROW_SLOTS = tuple(slot for slot in COLUMNS.values() if slot != "path")
+_intern = sys.intern
+
+
+class Task(Mapping):
+    """Slotted task record with mapping-style access by column name."""
+
+    __slots__ = tuple(COLUMNS.values())
+
+    def __init__(self, name, priority, file_name, start_date, due_date, status,
+                 description, tags, date_added, list_name, path=None):
+        self.name = name
+        self.priority = priority
+        self.file_name = file_name
+        self.start_date = _intern(start_date)
+        self.due_date = _intern(due_date)
+        self.status = _intern(status)
+        self.description = description
+        self.tags = _intern(tags)
+        self.date_added = date_added
+        self.list_name = _intern(list_name)
+        self.path = path
+
+    @classmethod
+    def from_row(cls, row, path=None):
+        """Build a Task from the positional row produced by to_row()."""
+        return cls(*row, path=path)
+
+    def to_row(self):
+        """Return the task as a compact list (without path) for serialisation."""
+        return [getattr(self, slot) for slot in _ROW_SLOTS]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        value = getattr(self, COLUMNS[key])
+        if value is None and key == "Path":
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        setattr(self, COLUMNS[key], value)
+
+    def __iter__(self):
+        for key in COLUMNS:
+            if key != "Path" or self.path is not None:
+                yield key
+
+    def __len__(self):
+        return len(COLUMNS) - (self.path is None)
+
+    def __repr__(self):
+        return f"Task({self.to_dict()!r})"
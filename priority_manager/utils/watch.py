@@ -0,0 +1,226 @@
+"""Keep the parsed tasks of a folder in memory and refresh only what changed.
+
+Used by ``ls --watch`` and ``filter --watch``. Changes are found either through
+watchdog's platform notifier (inotify, FSEvents, ReadDirectoryChangesW) when the
+package is installed (``pip install priority_manager[watch]``), or by polling.
+With the notifier an idle poll does no filesystem calls at all.
+
+Polling stats only the folders on each tick: a folder whose mtime moved is
+re-listed, which catches added, removed and renamed files, including editors that
+save through a temporary file. Files written in place leave their folder alone,
+so every file is stat'ed too, but only once per sweep_interval seconds. A file is
+re-parsed only when its (mtime, size) changes.
+"""
+import os
+import threading
+import time
+import click
+from .index import TaskIndex, index_enabled, relative_key
+from .parser import parse_task_file
+from .scanner import is_task_file, scan_dir
+
+
+SWEEP_INTERVAL = 30.0  # seconds between per-file sweeps when polling
+
+
+def _signature(st):
+    return (st.st_mtime_ns, st.st_size)
+
+
+class TaskWatcher:
+    """In-memory view of the task files under base_dir."""
+
+    def __init__(self, base_dir, recursive=False, notify=True, sweep_interval=SWEEP_INTERVAL, clock=time.monotonic):
+        self.base_dir = base_dir
+        self.recursive = recursive
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._last_sweep = clock()
+        self.files = {}  # path -> (signature, Task)
+        self.dirs = {}  # path -> mtime_ns
+        self._changed = set()  # paths loaded or dropped since take_changes()
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._observer = self._start_notifier() if notify else None
+        # The metadata index only seeds the first load; watch mode never writes it
+        self._index = TaskIndex.load(base_dir) if index_enabled() and os.path.isdir(base_dir) else None
+        self._add_dir(base_dir)
+        self._index = None
+        self._changed.clear()
+
+    def _start_notifier(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                with watcher._lock:
+                    watcher._dirty.add(event.src_path)
+                    if getattr(event, "dest_path", ""):
+                        watcher._dirty.add(event.dest_path)
+
+        observer = Observer()
+        try:
+            observer.schedule(Handler(), self.base_dir, recursive=self.recursive)
+            observer.start()
+        except OSError:
+            return None
+        return observer
+
+    @property
+    def notifying(self):
+        return self._observer is not None
+
+    def close(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def tasks(self):
+        return [task for _, task in self.files.values()]
+
+    def take_changes(self):
+        """Return the paths whose task was added, re-parsed or removed since the last call."""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def _load(self, path, st):
+        key = relative_key(self.base_dir, path)
+        task = self._index.lookup(key, st) if self._index is not None else None
+        if task is None:
+            try:
+                task = parse_task_file(path)
+            except OSError:
+                return
+        task["Path"] = key
+        self.files[path] = (_signature(st), task)
+        self._changed.add(path)
+
+    def _add_dir(self, path):
+        try:
+            self.dirs[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        files, subdirs = scan_dir(path)
+        for entry in files:
+            self._load(entry.path, entry.stat())
+        if self.recursive:
+            for entry in subdirs:
+                self._add_dir(entry.path)
+
+    def _drop_dir(self, path):
+        prefix = path + os.sep
+        for d in [d for d in self.dirs if d == path or d.startswith(prefix)]:
+            del self.dirs[d]
+        for f in [f for f in self.files if f.startswith(prefix)]:
+            del self.files[f]
+            self._changed.add(f)
+
+    def _check_file(self, path):
+        """Re-parse path if its signature moved; returns True when the view changed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self.files.pop(path, None) is None:
+                return False
+            self._changed.add(path)
+            return True
+        known = self.files.get(path)
+        if known is not None and known[0] == _signature(st):
+            return False
+        self._load(path, st)
+        return True
+
+    def _sync_dir(self, path, relist=True):
+        """Pick up added/removed entries of one folder and re-parse its changed files."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._drop_dir(path)
+            return True
+        changed = False
+        if relist or mtime != self.dirs.get(path):
+            self.dirs[path] = mtime
+            files, subdirs = scan_dir(path)
+            listed = {entry.path for entry in files}
+            for f in [f for f in self.files if os.path.dirname(f) == path and f not in listed]:
+                del self.files[f]
+                self._changed.add(f)
+                changed = True
+            for entry in files:
+                # The listing's stat also catches files replaced by a rename
+                known = self.files.get(entry.path)
+                st = entry.stat()
+                if known is None or known[0] != _signature(st):
+                    self._load(entry.path, st)
+                    changed = True
+            if self.recursive:
+                present = {entry.path for entry in subdirs}
+                for d in [d for d in self.dirs if os.path.dirname(d) == path and d not in present]:
+                    self._drop_dir(d)
+                    changed = True
+                for entry in subdirs:
+                    if entry.path not in self.dirs:
+                        self._add_dir(entry.path)
+                        changed = True
+        return changed
+
+    def poll(self, sweep=None):
+        """Bring the view up to date; returns True when any task was added, removed or changed.
+
+        When polling, sweep forces (True) or skips (False) the per-file stat pass;
+        by default it runs once sweep_interval seconds have passed since the last.
+        """
+        if self._observer is not None:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            folders = set()
+            changed = False
+            for path in dirty:
+                if path in self.dirs:
+                    folders.add(path)
+                parent = os.path.dirname(path)
+                if parent in self.dirs:
+                    folders.add(parent)
+                    if path in self.files or (is_task_file(os.path.basename(path)) and os.path.isfile(path)):
+                        changed |= self._check_file(path)
+            for folder in sorted(folders):
+                changed |= self._sync_dir(folder)
+            return changed
+        changed = False
+        for folder in list(self.dirs):
+            if folder in self.dirs:
+                changed |= self._sync_dir(folder, relist=False)
+        now = self._clock()
+        if sweep or (sweep is None and now - self._last_sweep >= self.sweep_interval):
+            self._last_sweep = now
+            for path in list(self.files):
+                changed |= self._check_file(path)
+        return changed
+
+
+def watch(watcher, render, interval=2.0, rounds=None, sleep=time.sleep):
+    """Redraw render(tasks) whenever its output changes, until Ctrl+C (or after rounds polls)."""
+    last = None
+    done = 0
+    try:
+        while True:
+            if last is None or watcher.poll():
+                output = render(watcher.tasks())
+                if output != last:
+                    click.clear()
+                    click.echo(output)
+                    last = output
+            done += 1
+            if rounds is not None and done >= rounds:
+                break
+            sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
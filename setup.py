@@ -24,6 +24,9 @@ setup(
     },
     include_package_data=True,
     install_requires=install_requires,
+    extras_require={
+        "watch": ["watchdog"],
+    },
     entry_points={
         "console_scripts": [
             "priority-manager=priority_manager.main:cli"